@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for check_translations.py
+
+Generates a synthetic Flutter corpus modelled on lib/features/* (pages,
+widgets, providers and models with Text, SnackBar, AlertDialog,
+InputDecoration and l10n calls, plus a matching app_en.arb) at several
+scales, then times the checker's phases separately:
+
+    collect   collect_dart_files()
+    scan      scan_file() over every file
+    report    print_json_report() + print_text_report()
+
+and reports files/sec, lines/sec and peak RSS per scale. Each run of a
+scale is a fresh child process, so caches and peak RSS are not inherited;
+every scale is run --repeats times and the best value of each metric is
+kept, which is what --baseline compares.
+
+Usage:
+    python3 tools/bench_check_translations.py                       # 1x and 10x
+    python3 tools/bench_check_translations.py --scales 1,10,100
+    python3 tools/bench_check_translations.py --save-baseline bench_baseline.json
+    python3 tools/bench_check_translations.py --baseline bench_baseline.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import check_translations as ct  # noqa: E402
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Configuration
+# ──────────────────────────────────────────────────────────────────────
+
+# Generated under .dart_tool/ so it is git-ignored and never picked up by a
+# normal scan of lib/ (collect_dart_files prunes .dart_tool).
+CORPUS_ROOT = ct.PROJECT_ROOT / ".dart_tool" / "bench_corpus"
+CORPUS_VERSION = 1
+
+# One "1x" corpus roughly matches today's lib/: ~220 files, ~53k lines
+FEATURES_PER_SCALE = 12
+FILES_PER_FEATURE = {"pages": 5, "widgets": 7, "providers": 3, "models": 3}
+
+# Runs per scale; one sample swings by 25% and more on a busy machine
+REPEATS = 5
+
+WORDS = (
+    "save cancel delete entry note diary day mood score habit goal reminder "
+    "backup sync export import settings profile password theme category "
+    "template calendar weekly review summary details search filter today "
+    "error success failed loading empty please again your the this all new"
+).split()
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Synthetic corpus
+# ──────────────────────────────────────────────────────────────────────
+
+def _phrase(rng: random.Random, lo: int = 2, hi: int = 6) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(lo, hi))]
+    return " ".join(words).capitalize()
+
+
+class CorpusWriter:
+    """Builds Dart files plus the ARB entries their l10n calls refer to."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.arb: dict[str, str] = {"@@locale": "en"}
+        self.values: list[str] = []
+
+    def l10n(self) -> str:
+        phrase = _phrase(self.rng)
+        key = ct.suggest_key(phrase)
+        if key not in self.arb:
+            self.arb[key] = phrase
+            self.values.append(phrase)
+        return f"l10n.{key}"
+
+    def known_phrase(self) -> str:
+        """A hardcoded string that, half of the time, already has an ARB translation."""
+        if self.values and self.rng.random() < 0.5:
+            return self.rng.choice(self.values)
+        return _phrase(self.rng)
+
+    def _build_method(self, name: str) -> list[str]:
+        rng = self.rng
+        out = [f"  Widget _{name}(BuildContext context) {{",
+               "    final l10n = AppLocalizations.of(context);",
+               "    return Column(",
+               "      crossAxisAlignment: CrossAxisAlignment.start,",
+               "      children: ["]
+        for _ in range(rng.randint(4, 9)):
+            kind = rng.randrange(8)
+            if kind == 0:
+                out += [f"        Text('{self.known_phrase()}'),"]
+            elif kind == 1:
+                out += [f"        Text({self.l10n()}),",
+                        f"        Text({self.l10n()}, style: Theme.of(context).textTheme.titleMedium),"]
+            elif kind == 2:
+                out += ["        ElevatedButton(",
+                        "          onPressed: () {",
+                        "            ScaffoldMessenger.of(context).showSnackBar(",
+                        "              SnackBar(",
+                        "                behavior: SnackBarBehavior.floating,",
+                        "                duration: const Duration(seconds: 2),",
+                        f"                content: Text('{_phrase(rng)}'),",
+                        f"                action: SnackBarAction(label: '{_phrase(rng, 1, 2)}', onPressed: () {{}}),",
+                        "              ),",
+                        "            );",
+                        "          },",
+                        f"          child: Text({self.l10n()}),",
+                        "        ),"]
+            elif kind == 3:
+                out += ["        TextButton(",
+                        "          onPressed: () => showDialog<void>(",
+                        "            context: context,",
+                        "            builder: (context) => AlertDialog(",
+                        f"              title: const Text('{_phrase(rng)}'),",
+                        f"              content: Text('{_phrase(rng, 5, 12)}'),",
+                        "              actions: [",
+                        f"                TextButton(onPressed: () => Navigator.pop(context), child: Text({self.l10n()})),",
+                        "              ],",
+                        "            ),",
+                        "          ),",
+                        f"          child: const Text('{self.known_phrase()}'),",
+                        "        ),"]
+            elif kind == 4:
+                out += ["        TextFormField(",
+                        "          controller: _controller,",
+                        "          decoration: InputDecoration(",
+                        f"            labelText: '{_phrase(rng, 1, 3)}',",
+                        f"            hintText: {self.l10n()},",
+                        "            border: const OutlineInputBorder(),",
+                        "          ),",
+                        "          validator: (value) {",
+                        "            if (value == null || value.isEmpty) {",
+                        f"              return '{_phrase(rng)}';",
+                        "            }",
+                        "            return null;",
+                        "          },",
+                        "        ),"]
+            elif kind == 5:
+                out += ["        IconButton(",
+                        "          icon: const Icon(Icons.delete),",
+                        f"          tooltip: '{_phrase(rng, 1, 3)}',",
+                        "          onPressed: _onDelete,",
+                        "        ),"]
+            elif kind == 6:
+                out += ["        // TODO: localize this once the copy is final",
+                        f"        Text('${{_items.length}} {rng.choice(WORDS)}'),"]
+            else:
+                out += ["        Padding(",
+                        "          padding: const EdgeInsets.symmetric(horizontal: 16, vertical: 8),",
+                        f"          child: Text({self.l10n()}),",
+                        "        ),"]
+        out += ["      ],", "    );", "  }", ""]
+        return out
+
+    def widget_file(self, cls: str) -> str:
+        rng = self.rng
+        lines = ["import 'package:flutter/material.dart';",
+                 "import 'package:day_tracker/l10n/app_localizations.dart';",
+                 "import 'package:day_tracker/core/log/logger_instance.dart';",
+                 "",
+                 f"class {cls} extends StatefulWidget {{",
+                 f"  const {cls}({{super.key}});",
+                 "",
+                 "  @override",
+                 f"  State<{cls}> createState() => _{cls}State();",
+                 "}",
+                 "",
+                 f"class _{cls}State extends State<{cls}> {{",
+                 "  final _controller = TextEditingController();",
+                 "  final List<String> _items = [];",
+                 "",
+                 "  void _onDelete() {",
+                 f"    LogWrapper.logger.i('{cls}: deleting ${{_items.length}} items');",
+                 "    setState(() => _items.clear());",
+                 "  }",
+                 "",
+                 "  @override",
+                 "  Widget build(BuildContext context) {",
+                 "    final l10n = AppLocalizations.of(context);",
+                 "    return Scaffold(",
+                 f"      appBar: AppBar(title: Text({self.l10n()})),",
+                 "      body: ListView(",
+                 "        children: ["]
+        sections = [f"section{i}" for i in range(rng.randint(3, 7))]
+        lines += [f"          _{name}(context)," for name in sections]
+        lines += ["        ],", "      ),", "    );", "  }", ""]
+        for name in sections:
+            lines += self._build_method(name)
+        lines += ["}", ""]
+        return "\n".join(lines)
+
+    def provider_file(self, cls: str) -> str:
+        rng = self.rng
+        lines = ["import 'package:flutter_riverpod/flutter_riverpod.dart';",
+                 "import 'package:day_tracker/core/log/logger_instance.dart';",
+                 "",
+                 f"class {cls}Notifier extends StateNotifier<List<String>> {{",
+                 f"  {cls}Notifier() : super(const []);",
+                 ""]
+        for i in range(rng.randint(6, 14)):
+            lines += [f"  Future<void> action{i}(String value) async {{",
+                      f"    LogWrapper.logger.d('action{i}: $value');",
+                      "    try {",
+                      "      state = [...state, value];",
+                      "    } catch (e) {",
+                      f"      LogWrapper.logger.e('Error in action{i}: $e');",
+                      "      throw Exception('Failed to update state');",
+                      "    }",
+                      "  }",
+                      ""]
+        lines += ["}", "",
+                  f"final {cls[0].lower() + cls[1:]}Provider =",
+                  f"    StateNotifierProvider<{cls}Notifier, List<String>>((ref) => {cls}Notifier());",
+                  ""]
+        return "\n".join(lines)
+
+    def model_file(self, cls: str) -> str:
+        rng = self.rng
+        fields = [f"{rng.choice(WORDS)}{i}" for i in range(rng.randint(5, 12))]
+        lines = ["import 'package:day_tracker/core/database/db_entity.dart';", "",
+                 f"class {cls} implements DbEntity {{"]
+        lines += [f"  final String {f};" for f in fields]
+        lines += ["", f"  {cls}({{"] + [f"    required this.{f}," for f in fields] + ["  });", "",
+                  "  @override",
+                  "  Map<String, dynamic> toMap() {",
+                  "    return {"]
+        lines += [f"      '{f}': {f}," for f in fields]
+        lines += ["    };", "  }", "",
+                  f"  factory {cls}.fromMap(Map<String, dynamic> map) {{",
+                  f"    return {cls}("]
+        lines += [f"      {f}: map['{f}'] as String," for f in fields]
+        lines += ["    );", "  }", "",
+                  "  @override",
+                  f"  String toString() => '{cls}(" + ", ".join(f"{f}: ${f}" for f in fields[:3]) + ")';",
+                  "}", ""]
+        return "\n".join(lines)
+
+
+def generate_corpus(scale: int, seed: int = 1234) -> Path:
+    """Write (or reuse) the corpus for ``scale``; returns its lib/ directory."""
+    root = CORPUS_ROOT / f"x{scale}"
+    stamp = root / "corpus.json"
+    expected = {"version": CORPUS_VERSION, "scale": scale, "seed": seed}
+    try:
+        if json.loads(stamp.read_text(encoding="utf-8")) == expected:
+            return root / "lib"
+    except (OSError, ValueError):
+        pass
+
+    shutil.rmtree(root, ignore_errors=True)
+    rng = random.Random(seed)
+    writer = CorpusWriter(rng)
+    lib = root / "lib"
+    for feat in range(FEATURES_PER_SCALE * scale):
+        feature = lib / "features" / f"feature_{feat:04d}"
+        for layer, count in FILES_PER_FEATURE.items():
+            target = feature / ("presentation" if layer in ("pages", "widgets") else "data") / layer
+            target.mkdir(parents=True, exist_ok=True)
+            for i in range(count):
+                cls = f"F{feat}{layer.capitalize()}{i}"
+                if layer in ("pages", "widgets"):
+                    text = writer.widget_file(cls)
+                elif layer == "providers":
+                    text = writer.provider_file(cls)
+                else:
+                    text = writer.model_file(cls)
+                (target / f"{layer[:-1]}_{i}.dart").write_text(text, encoding="utf-8")
+    (root / "app_en.arb").write_text(json.dumps(writer.arb, indent=2, ensure_ascii=False),
+                                     encoding="utf-8")
+    stamp.write_text(json.dumps(expected), encoding="utf-8")
+    return lib
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Measurement
+# ──────────────────────────────────────────────────────────────────────
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scale(scale: int, jobs: int) -> dict:
+    """Time every phase for one scale (runs inside a child process)."""
+    lib = generate_corpus(scale)
+    arb_index = ct.build_arb_index(ct.load_arb_strings(lib.parent / "app_en.arb"))
+
+    t0 = time.perf_counter()
+    files = ct.collect_dart_files(lib)
+    t1 = time.perf_counter()
+    if jobs > 1:
+        reports = ct.scan_files(files, arb_index, jobs=jobs)
+    else:
+        reports = [ct.scan_file(f, arb_index) for f in files]
+    t2 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ct.print_json_report(reports)
+        ct.print_text_report(reports)
+    t3 = time.perf_counter()
+
+    lines = sum(f.read_bytes().count(b"\n") for f in files)
+    scan = max(t2 - t1, 1e-9)
+    return {
+        "scale": scale,
+        "files": len(files),
+        "lines": lines,
+        "findings": sum(len(r.hardcoded) for r in reports),
+        "collect_s": round(t1 - t0, 4),
+        "scan_s": round(t2 - t1, 4),
+        "report_s": round(t3 - t2, 4),
+        "files_per_s": round(len(files) / scan, 1),
+        "lines_per_s": round(lines / scan, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def run_scale_in_child(scale: int, jobs: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--child", str(scale), "--jobs", str(jobs)],
+        capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr, file=sys.stderr)
+        raise SystemExit(f"benchmark child for scale {scale}x failed")
+    return json.loads(proc.stdout)
+
+
+def best_of(runs: list[dict]) -> dict:
+    """Best value of every metric over repeated runs of one scale."""
+    best = dict(runs[0])
+    for key in ("collect_s", "scan_s", "report_s", "peak_rss_mb"):
+        best[key] = min(r[key] for r in runs)
+    for key in ("files_per_s", "lines_per_s"):
+        best[key] = max(r[key] for r in runs)
+    best["repeats"] = len(runs)
+    return best
+
+
+def compare_to_baseline(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Return regression messages for throughput drops / RSS growth > threshold."""
+    base = {r["scale"]: r for r in baseline.get("results", [])}
+    problems = []
+    for r in results:
+        b = base.get(r["scale"])
+        if b is None:
+            continue
+        for metric in ("files_per_s", "lines_per_s"):
+            if b[metric] and r[metric] < b[metric] * (1 - threshold):
+                problems.append(f"{r['scale']}x {metric}: {r[metric]} vs baseline {b[metric]} "
+                                f"({(r[metric] / b[metric] - 1) * 100:+.1f}%)")
+        if b["peak_rss_mb"] and r["peak_rss_mb"] > b["peak_rss_mb"] * (1 + threshold):
+            problems.append(f"{r['scale']}x peak_rss_mb: {r['peak_rss_mb']} vs baseline "
+                            f"{b['peak_rss_mb']} "
+                            f"({(r['peak_rss_mb'] / b['peak_rss_mb'] - 1) * 100:+.1f}%)")
+    return problems
+
+
+def print_table(results: list[dict]):
+    header = (f"{'scale':>6} {'files':>7} {'lines':>9} {'collect s':>10} {'scan s':>8} "
+              f"{'report s':>9} {'files/s':>9} {'lines/s':>10} {'RSS MB':>8}")
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        print(f"{str(r['scale']) + 'x':>6} {r['files']:>7} {r['lines']:>9} {r['collect_s']:>10.3f} "
+              f"{r['scan_s']:>8.3f} {r['report_s']:>9.3f} {r['files_per_s']:>9.1f} "
+              f"{r['lines_per_s']:>10.1f} {r['peak_rss_mb']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark check_translations.py "
+                                                 "on a synthetic Flutter corpus.")
+    parser.add_argument("--scales", default="1,10",
+                        help="Comma-separated corpus scales (default: 1,10; 100 is ~5M lines)")
+    parser.add_argument("--jobs", type=ct.parse_jobs, default=1, metavar="N",
+                        help="Scan with N worker processes")
+    parser.add_argument("--repeats", type=int, default=REPEATS, metavar="N",
+                        help=f"Runs per scale, keeping the best of each metric "
+                             f"(default: {REPEATS})")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--save-baseline", metavar="FILE",
+                        help="Write the results to FILE for later comparison")
+    parser.add_argument("--baseline", metavar="FILE",
+                        help="Compare against a baseline written by --save-baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed relative regression vs the baseline (default: 0.15)")
+    parser.add_argument("--regenerate", action="store_true",
+                        help="Rebuild the synthetic corpus even if it is up to date")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if ct.RULES is None:
+        print(f"ERROR: {ct.RULES_ERROR}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.child is not None:
+        print(json.dumps(run_scale(args.child, args.jobs)))
+        return
+
+    if args.repeats < 1:
+        print("ERROR: --repeats must be at least 1", file=sys.stderr)
+        sys.exit(2)
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    if args.regenerate:
+        shutil.rmtree(CORPUS_ROOT, ignore_errors=True)
+    for scale in scales:
+        # Generate up front so corpus creation is not part of any timing
+        generate_corpus(scale)
+    results = [best_of([run_scale_in_child(scale, args.jobs) for _ in range(args.repeats)])
+               for scale in scales]
+
+    if args.json:
+        print(json.dumps({"results": results}, indent=2))
+    else:
+        print_table(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare_to_baseline(results, json.load(f), args.threshold)
+        if problems:
+            print(f"\nREGRESSION (threshold {args.threshold:.0%}):", file=sys.stderr)
+            for p in problems:
+                print(f"  {p}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,18 +9,65 @@ and a summary table.
 Usage:
     python3 tools/check_translations.py
     python3 tools/check_translations.py --json          # machine-readable output
+    python3 tools/check_translations.py --format ndjson # streamed, one finding per line
+    python3 tools/check_translations.py --format sarif  # SARIF 2.1.0 for code scanning
     python3 tools/check_translations.py --severity HIGH # filter by severity
+    python3 tools/check_translations.py --jobs auto     # scan on all CPU cores
+    python3 tools/check_translations.py --no-cache      # ignore the scan cache
+    python3 tools/check_translations.py --rules my_rules.toml  # override rule tables
+    python3 tools/check_translations.py --changed-since origin/main --changed-lines-only
+    python3 tools/check_translations.py --files lib/main.dart lib/features/foo.dart
+    python3 tools/check_translations.py --profile --profile-json profile.json
+    python3 tools/check_translations.py --serve         # JSON-RPC on stdin/stdout
+    python3 tools/check_translations.py --watch --no-low
+    python3 tools/check_translations.py --history v1.0..HEAD  # coverage per commit
+    python3 tools/check_translations.py --shard 2/4 --json > shard2.json
+    python3 tools/check_translations.py --merge shard*.json
+    python3 tools/check_translations.py --write-baseline  # accept current findings
+    python3 tools/check_translations.py --baseline tools/check_translations.baseline.json
+    python3 tools/check_translations.py --emit-arb-patch new_keys.arb  # one key per string
+
+Besides the findings, every report lists ARB key usage and per-locale
+coverage of the translations named by l10n.yaml. The rule tables live in
+tools/check_translations.toml, which needs Python 3.11+ (tomllib) or the
+tomli package to be read.
 """
 
 import argparse
+import fnmatch
+import functools
+import hashlib
+import heapq
 import json
+import math
+import mmap
 import os
 import re
+import sqlite3
+import subprocess
 import sys
-from dataclasses import dataclass, field, asdict
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from dataclasses import dataclass, field, fields, asdict
 from enum import Enum
-from pathlib import Path
-from typing import Optional
+from pathlib import Path, PurePosixPath
+from time import perf_counter, sleep
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional: similarity scoring falls back to pure Python
+    np = None
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:  # only needed when the ruleset cache is cold
+        tomllib = None
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -30,6 +77,9 @@ from typing import Optional
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 LIB_DIR = PROJECT_ROOT / "lib"
 ARB_FILE = PROJECT_ROOT / "lib" / "l10n" / "app_en.arb"
+CACHE_FILE = PROJECT_ROOT / ".dart_tool" / "check_translations.cache"
+RULES_FILE = Path(__file__).resolve().with_suffix(".toml")
+RULES_CACHE_FILE = PROJECT_ROOT / ".dart_tool" / "check_translations.rules.cache"
 
 # Directories / files to skip entirely
 SKIP_DIRS = {
@@ -44,6 +94,35 @@ SKIP_FILES = {
     "app_localizations_fr.dart",
 }
 
+# Generated sources are skipped (and counted as such) wherever they are:
+# by file name, or by a "do not edit" comment in their first bytes
+GENERATED_FILE_GLOBS = (
+    "*.g.dart",                 # json_serializable, riverpod_generator, ...
+    "*.freezed.dart",
+    "*.mocks.dart",             # mockito
+    "*.gr.dart",                # auto_route
+    "*.gen.dart",               # flutter_gen
+    "*.pb.dart", "*.pbenum.dart", "*.pbjson.dart", "*.pbserver.dart",  # protoc
+)
+GENERATED_HEADER_RE = re.compile(
+    rb"^[ \t]*//.*(?:GENERATED CODE - DO NOT MODIFY|Generated file\. Do not edit"
+    rb"|Generated code\. Do not modify|@generated)",
+    re.MULTILINE | re.IGNORECASE)
+GENERATED_SNIFF_BYTES = 512
+
+# Seconds one file may take to scan before it is given up on and reported
+# as skipped (--file-budget; 0 = unlimited). Checked every
+# BUDGET_CHECK_TOKENS tokens.
+FILE_TIME_BUDGET = 10.0
+BUDGET_CHECK_TOKENS = 256
+SKIPPED_TOO_SLOW = "too slow"
+SKIPPED_EXCLUDED = "excluded"    # SKIP_DIRS / SKIP_FILES, or not a .dart file
+SKIPPED_GENERATED = "generated"
+
+# Most referenced ARB keys listed in the text report; 0 lists every key
+# with its reference count (--key-usage)
+KEY_USAGE_TOP = 10
+
 
 class Severity(str, Enum):
     CRITICAL = "CRITICAL"  # user-facing text in buttons, dialogs, snackbars
@@ -70,6 +149,25 @@ class StringContext(str, Enum):
     GENERIC = "Literal string"
 
 
+def slotted(cls):
+    """Rebuild dataclass ``cls`` with __slots__ for its fields.
+
+    What dataclass(slots=True) does, which needs Python 3.10; the
+    generated __init__ already holds the field defaults, so the class
+    attributes that would clash with the slots can be dropped.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {k: v for k, v in cls.__dict__.items()
+                 if k not in names and k not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+# Findings and reports are slotted: a large run keeps hundreds of thousands
+# of them alive until printing. Paths are shared with the FileReport,
+# contexts and severities are enum singletons, and repeated literal values
+# and keys are interned.
+@slotted
 @dataclass
 class HardcodedString:
     file: str           # relative path from project root
@@ -79,15 +177,21 @@ class HardcodedString:
     context: StringContext
     severity: Severity
     existing_key: Optional[str] = None     # if a matching ARB key exists
+    other_keys: list = field(default_factory=list)  # further ARB keys it matches as well
     suggested_key: Optional[str] = None    # proposed new key name
+    similar_keys: list = field(default_factory=list)  # [(key, score)] near-duplicate ARB values
+    anchor: str = ""                       # hash of the source line, see finding_fingerprint
 
 
+@slotted
 @dataclass
 class FileReport:
     path: str
     total_strings: int = 0
     localized_strings: int = 0
     hardcoded: list = field(default_factory=list)
+    key_usages: dict = field(default_factory=dict)  # l10n key -> references in this file
+    skipped: str = ""   # why the file was not scanned (e.g. SKIPPED_TOO_SLOW)
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -104,280 +208,1238 @@ def load_arb_strings(arb_path: Path) -> dict[str, str]:
     return {k: v for k, v in data.items() if not k.startswith("@")}
 
 
-def build_reverse_arb(arb: dict[str, str]) -> dict[str, str]:
-    """Map normalised english value -> arb key for quick matching."""
-    rev = {}
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Simple ARB placeholders like {error}; ICU plural/select blocks are skipped
+ARB_PLACEHOLDER_RE = re.compile(r"\{\s*\w+\s*\}")
+ARB_PLACEHOLDER_NAME_RE = re.compile(r"\{\s*(\w+)\s*\}")
+ARB_ICU_RE = re.compile(r"\{\s*\w+\s*,")
+
+# Start of a Dart interpolation: $name, or ${ up to its matching brace
+DART_INTERPOLATION_RE = re.compile(rb"\$\{|\$\w+")
+
+# Stand-in for a placeholder/interpolation in template index keys
+TEMPLATE_SLOT = "\x00"
+
+
+def replace_interpolations(raw: str, repl: str) -> str:
+    """``raw`` with every $name and ${expression} replaced by ``repl``.
+
+    The end of ``${`` is found by brace depth, like tokenize_dart() does,
+    so ``${f('}')}`` is one interpolation.
+    """
+    if "$" not in raw:
+        return raw
+    src = raw.encode("utf-8")
+    out = []
+    pos = 0
+    while True:
+        m = DART_INTERPOLATION_RE.search(src, pos)
+        if m is None:
+            break
+        end = m.end()
+        if m.group() == b"${":
+            end = _interpolation_end(src, end) + 1
+            if end == 0:  # never closed: keep the text as it is
+                out.append(src[pos:m.end()].decode("utf-8"))
+                pos = m.end()
+                continue
+        out.append(src[pos:m.start()].decode("utf-8"))
+        out.append(repl)
+        pos = end
+    out.append(src[pos:].decode("utf-8"))
+    return "".join(out)
+
+
+def normalize_value(s: str) -> str:
+    """Normalise: lowercase, strip outer whitespace, collapse inner ws."""
+    return _WHITESPACE_RE.sub(" ", s.strip().lower())
+
+
+def build_reverse_arb(arb: dict[str, str]) -> dict[str, list[str]]:
+    """Map normalised english value -> arb keys (in ARB order) for quick
+    matching; several keys may share a value."""
+    rev: dict[str, list[str]] = {}
     for k, v in arb.items():
         if k.startswith("@@"):
             continue
-        # Normalise: lowercase, strip outer whitespace, collapse inner ws
-        norm = re.sub(r"\s+", " ", v.strip().lower())
-        rev[norm] = k
+        rev.setdefault(normalize_value(v), []).append(k)
     return rev
 
 
+def build_template_arb(arb: dict[str, str]) -> dict[str, list[str]]:
+    """Map normalised value with placeholders replaced by slots -> arb keys.
+
+    'Error saving settings: {error}' is indexed as 'error saving settings: \\x00'
+    so that the Dart literal 'Error saving settings: $e' resolves to the same
+    entry. Values that differ only in their placeholders ('Week {number}',
+    'Week {weekNumber}') share a template; its keys are kept in ARB order.
+    """
+    templates: dict[str, list[str]] = {}
+    for k, v in arb.items():
+        if k.startswith("@@") or not ARB_PLACEHOLDER_RE.search(v) or ARB_ICU_RE.search(v):
+            continue
+        templates.setdefault(normalize_value(ARB_PLACEHOLDER_RE.sub(TEMPLATE_SLOT, v)),
+                             []).append(k)
+    return templates
+
+
+@dataclass
+class ArbIndex:
+    """Precomputed lookup tables over the ARB values, built once per run."""
+    exact: dict[str, list[str]]       # normalised value -> keys
+    templates: dict[str, list[str]]   # normalised placeholder template -> keys
+    keys: frozenset = frozenset()
+    placeholders: dict = field(default_factory=dict)  # template key -> its placeholder names
+
+    def matches(self, raw: str) -> list[str]:
+        """ARB keys whose english value matches the Dart literal, best first.
+
+        Exact matches win over template ones. ``raw`` is the literal's source
+        text, so a literal with escapes (``Don\\'t``) is also tried unescaped,
+        as an ARB value spells it. Of several keys sharing a template, those
+        whose placeholders are named like the literal's interpolations come
+        first ('Week $weekNumber' prefers 'Week {weekNumber}'); otherwise ARB
+        order decides.
+        """
+        keys = self.exact.get(normalize_value(raw))
+        if keys is None and "$" in raw:
+            template = normalize_value(replace_interpolations(raw, TEMPLATE_SLOT))
+            keys = self.templates.get(template)
+        if keys is None and "\\" in raw:
+            message = arb_message(raw)[0]
+            keys = (self.exact.get(normalize_value(message))
+                    or self.templates.get(arb_group_value(message)))
+        if not keys:
+            return []
+        if len(keys) > 1 and keys[0] in self.placeholders:
+            names = set(arb_message(raw)[1])
+            keys = sorted(keys, key=lambda k: -len(names & self.placeholders[k]))
+        return list(keys)
+
+    def lookup(self, raw: str) -> Optional[str]:
+        """The best ARB key for the Dart literal, if any."""
+        keys = self.matches(raw)
+        return keys[0] if keys else None
+
+
+def build_arb_index(arb: dict[str, str]) -> ArbIndex:
+    templates = build_template_arb(arb)
+    placeholders = {k: frozenset(ARB_PLACEHOLDER_NAME_RE.findall(arb[k]))
+                    for keys in templates.values() if len(keys) > 1 for k in keys}
+    return ArbIndex(exact=build_reverse_arb(arb), templates=templates,
+                    keys=frozenset(arb), placeholders=placeholders)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Locale coverage
+# ──────────────────────────────────────────────────────────────────────
+
+L10N_CONFIG = PROJECT_ROOT / "l10n.yaml"
+
+
+def read_l10n_config(path: Path) -> dict[str, str]:
+    """Top-level ``key: value`` pairs of l10n.yaml (the only form it uses)."""
+    config = {}
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return config
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        if ":" in line and not line[:1].isspace():
+            key, value = line.split(":", 1)
+            config[key.strip()] = value.strip().strip("'\"")
+    return config
+
+
+def locale_arb_files(config: dict[str, str]) -> dict[str, Path]:
+    """locale -> ARB file for every ``<prefix>_*.arb`` next to the template,
+    template locale first."""
+    arb_dir = PROJECT_ROOT / config.get("arb-dir", "lib/l10n")
+    template = config.get("template-arb-file", "app_en.arb")
+    prefix = template.rsplit("_", 1)[0] + "_"
+    files = {p.stem[len(prefix):]: p for p in sorted(arb_dir.glob(f"{prefix}*.arb"))}
+    template_locale = Path(template).stem[len(prefix):]
+    if template_locale not in files:
+        return {}
+    return {template_locale: files.pop(template_locale), **files}
+
+
+def arb_placeholders(message: str) -> frozenset[str]:
+    """Argument names of an ICU message: ``{name}`` and ``{name, plural, ...}``.
+
+    Braces alternate between arguments and nested sub-messages, so an
+    argument can only open at an even nesting depth.
+    """
+    names = set()
+    depth = 0
+    for m in re.finditer(r"\{\s*(\w*)|\}", message):
+        if m.group(0) == "}":
+            depth = max(depth - 1, 0)
+            continue
+        if depth % 2 == 0 and m.group(1):
+            names.add(m.group(1))
+        depth += 1
+    return frozenset(names)
+
+
+@dataclass
+class LocaleTable:
+    """Key x locale table of ARB values, one column per locale.
+
+    Rows are the template's keys; each column holds that locale's value for
+    the row or None. Keys only found in a translation go to ``extra``.
+    """
+    locales: list[str]
+    keys: list[str]
+    columns: dict[str, list[Optional[str]]]
+    extra: dict[str, list[str]]
+
+
+def build_locale_table(files: dict[str, Path]) -> LocaleTable:
+    locales = list(files)
+    arbs = {locale: load_arb_strings(path) for locale, path in files.items()}
+    keys = list(arbs[locales[0]]) if locales else []
+    row_keys = set(keys)
+    return LocaleTable(
+        locales=locales,
+        keys=keys,
+        columns={locale: [arb.get(k) for k in keys] for locale, arb in arbs.items()},
+        extra={locale: sorted(set(arb) - row_keys) for locale, arb in arbs.items()},
+    )
+
+
+def locale_coverage(table: LocaleTable) -> dict:
+    """Per-locale missing keys, values identical to the template and
+    placeholder-set mismatches."""
+    if not table.locales:
+        return {"template": None, "keys": 0, "locales": {}}
+    template = table.locales[0]
+    base = table.columns[template]
+    base_placeholders = [arb_placeholders(v) if isinstance(v, str) else frozenset()
+                         for v in base]
+    result = {}
+    for locale in table.locales[1:]:
+        missing, identical, mismatched = [], [], []
+        for key, en, expected, value in zip(table.keys, base, base_placeholders,
+                                            table.columns[locale]):
+            if value is None:
+                missing.append(key)
+                continue
+            if not isinstance(value, str):
+                continue
+            # Only text with letters can be left untranslated
+            if value == en and re.search(r"[^\W\d_]", value):
+                identical.append(key)
+            found = arb_placeholders(value)
+            if found != expected:
+                mismatched.append({"key": key, "expected": sorted(expected),
+                                   "found": sorted(found)})
+        result[locale] = {
+            "translated": len(table.keys) - len(missing),
+            "missing": missing,
+            "identical": identical,
+            "placeholder_mismatch": mismatched,
+            "extra": table.extra[locale],
+        }
+    return {"template": template, "keys": len(table.keys), "locales": result}
+
+
+def locale_files_digest(files: dict[str, Path]) -> str:
+    h = hashlib.sha256()
+    for locale, path in files.items():
+        h.update(f"{locale}\0{path.name}\0".encode("utf-8"))
+        try:
+            h.update(path.read_bytes())
+        except OSError:
+            h.update(b"<missing>")
+    return h.hexdigest()
+
+
+def load_locale_coverage(cache: Optional["ScanCache"] = None) -> dict:
+    """Coverage of every locale named by l10n.yaml, reused from the scan
+    cache while no ARB file has changed."""
+    files = locale_arb_files(read_l10n_config(L10N_CONFIG))
+    digest = locale_files_digest(files)
+    if cache is not None:
+        coverage = cache.lookup_locales(digest)
+        if coverage is not None:
+            return coverage
+    coverage = locale_coverage(build_locale_table(files))
+    if cache is not None:
+        cache.store_locales(digest, coverage)
+    return coverage
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Near-duplicate ARB suggestions
+# ──────────────────────────────────────────────────────────────────────
+
+NGRAM_SIZE = 3
+SIMILAR_TOP_K = 3
+SIMILARITY_THRESHOLD = 0.6
+SIMILARITY_BATCH = 512  # query rows per dense matrix product
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+
+def ngram_text(s: str) -> str:
+    """Lower-cased words of a Dart literal or ARB value, placeholders removed."""
+    s = ARB_PLACEHOLDER_RE.sub(" ", replace_interpolations(s, " "))
+    return _NON_WORD_RE.sub(" ", s.lower()).strip()
+
+
+def ngram_counts(s: str) -> dict[str, int]:
+    """Character n-grams and whole words (as "w:word") of a literal or value."""
+    text = ngram_text(s)
+    padded = f" {text} "
+    counts: dict[str, int] = {}
+    for i in range(len(padded) - NGRAM_SIZE + 1):
+        gram = padded[i:i + NGRAM_SIZE]
+        counts[gram] = counts.get(gram, 0) + 1
+    for word in text.split():
+        gram = "w:" + word
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class NgramIndex:
+    """IDF-weighted n-gram and word vectors of the ARB values.
+
+    Built once per run. A feature shared by many values ("settings") weighs
+    less than a rare one ("saved"). Scores are dot(q, a) / (|q| * sqrt(|q| |a|)):
+    1.0 for equal texts, and a value that contains the whole query loses
+    only the square root of its extra length, so 'Settings saved' still
+    finds 'Settings saved successfully'.
+
+    Queries are scored in batches: one matrix product with numpy when it is
+    installed, otherwise through an inverted index of feature -> (key row,
+    weight) postings.
+    """
+
+    def __init__(self, arb: dict[str, str]):
+        self.keys: list[str] = []
+        self.vocab: dict[str, int] = {}
+        rows = []
+        for key, value in arb.items():
+            counts = ngram_counts(value) if isinstance(value, str) else {}
+            if counts:
+                self.keys.append(key)
+                rows.append(counts)
+        df: dict[str, int] = {}
+        for counts in rows:
+            for gram in counts:
+                df[gram] = df.get(gram, 0) + 1
+        self.idf = {gram: math.log(1 + len(rows) / n) for gram, n in df.items()}
+        self.unseen_idf = math.log(1 + len(rows))
+        self.postings: dict[int, list[tuple[int, float]]] = {}
+        for row, counts in enumerate(rows):
+            weights = {gram: c * self.idf[gram] for gram, c in counts.items()}
+            norm = sum(w * w for w in weights.values()) ** 0.25
+            for gram, w in weights.items():
+                col = self.vocab.setdefault(gram, len(self.vocab))
+                self.postings.setdefault(col, []).append((row, w / norm))
+        self.matrix = None
+        if np is not None:
+            self.matrix = np.zeros((len(self.vocab), len(self.keys)))
+            for col, posting in self.postings.items():
+                for row, weight in posting:
+                    self.matrix[col, row] = weight
+
+    def _query_vector(self, s: str) -> dict[int, float]:
+        """Query weights over the ARB vocabulary, divided by |q|^1.5;
+        features outside it only count towards the norm."""
+        weights = {gram: c * self.idf.get(gram, self.unseen_idf)
+                   for gram, c in ngram_counts(s).items()}
+        norm = sum(w * w for w in weights.values()) ** 0.75
+        return {self.vocab[g]: w / norm for g, w in weights.items() if g in self.vocab}
+
+    def _scores(self, queries: list[dict[int, float]]) -> Iterator[list[tuple[int, float]]]:
+        """(row, score) pairs with a non-zero score, per query."""
+        if self.matrix is not None:
+            for start in range(0, len(queries), SIMILARITY_BATCH):
+                batch = queries[start:start + SIMILARITY_BATCH]
+                q = np.zeros((len(batch), len(self.vocab)))
+                for i, vec in enumerate(batch):
+                    if vec:
+                        q[i, list(vec)] = list(vec.values())
+                for row_scores in q @ self.matrix:
+                    rows = np.flatnonzero(row_scores)
+                    yield list(zip(rows.tolist(), row_scores[rows].tolist()))
+            return
+        for vec in queries:
+            scores: dict[int, float] = {}
+            for col, weight in vec.items():
+                for row, arb_weight in self.postings[col]:
+                    scores[row] = scores.get(row, 0.0) + weight * arb_weight
+            yield list(scores.items())
+
+    def top_k(self, texts: list[str], k: int = SIMILAR_TOP_K,
+              threshold: float = SIMILARITY_THRESHOLD) -> list[list[tuple[str, float]]]:
+        """For each text, up to ``k`` (key, score) pairs scoring >= ``threshold``."""
+        results = []
+        for scored in self._scores([self._query_vector(t) for t in texts]):
+            # Rounded first so numpy and pure-Python runs rank ties alike;
+            # a repetitive value can push the score a little past 1
+            ranked = sorted((-score, self.keys[row]) for row, score in
+                            ((row, round(min(score, 1.0), 3)) for row, score in scored)
+                            if score >= threshold)
+            results.append([(key, -neg) for neg, key in ranked[:k]])
+        return results
+
+    def attach(self, reports: list[FileReport], k: int = SIMILAR_TOP_K,
+               threshold: float = SIMILARITY_THRESHOLD) -> list[FileReport]:
+        """Fill ``similar_keys`` of every finding without an exact ARB match,
+        scoring all of them in one batch."""
+        entries = [e for r in reports for e in r.hardcoded if not e.existing_key]
+        for entry, similar in zip(entries, self.top_k([e.raw_string for e in entries],
+                                                      k, threshold)):
+            entry.similar_keys = similar
+        return reports
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Dart lexer
 # ──────────────────────────────────────────────────────────────────────
-# False-positive filters
-# ──────────────────────────────────────────────────────────────────────
-
-# Strings that are intentionally NOT translated
-FALSE_POSITIVE_PATTERNS = [
-    # Logging – LogWrapper / logger calls
-    r"LogWrapper\.logger\.\w+\(",
-    r"logger\.\w+\(",
-    r"debugPrint\(",
-    r"print\(",
-
-    # Keys, identifiers, technical strings
-    r"Key\(",
-    r"ValueKey\(",
-    r"tableName:",
-    r"primaryKey:",
-    r"columnName:",
-    r"SharedPreferences",
-
-    # Database / SQL
-    r"CREATE\s+TABLE",
-    r"INSERT\s+INTO",
-    r"SELECT\s+",
-    r"ALTER\s+TABLE",
-    r"DROP\s+TABLE",
-    r"database\!\.execute",
-
-    # Map keys, JSON keys
-    r"\[.+\]\s*=",
-    r"map\[",
-
-    # Assert messages (not user-facing)
-    r"assert\(",
-
-    # Import / export / package references
-    r"^import\s",
-    r"^export\s",
-    r"package:",
-
-    # Route names
-    r"MaterialPageRoute",
-    r"Navigator\.",
-
-    # dotenv / env keys
-    r"dotenv",
-    r"\.env",
-
-    # Font families, asset paths
-    r"assets/",
-    r"google_fonts",
-
-    # Test file strings
-    r"test\(",
-    r"expect\(",
-    r"group\(",
-
-    # Error/exception throws (not user-facing)
-    r"throw\s+",
-    r"Exception\(",
-    r"Error\(",
-    r"FormatException\(",
-    r"StateError\(",
-
-    # Status update strings in non-presentation code
-    r"setState\s*\(\s*\(\)\s*\{.*_status\s*=",
-]
-
-# Strings that are never user-facing
-IGNORED_STRING_VALUES = {
-    "",
-    " ",
-    "  ",
-    ".",
-    ",",
-    ":",
-    ";",
-    "-",
-    "/",
-    "|",
-    "\\n",
-    "\n",
-    "0",
-    "1",
-    "true",
-    "false",
-    "null",
-    "id",
-    "title",
-    "description",
-    "day",
-    "notes",
-    "ratings",
-    "color",
-    "tagList",
-    "fromDate",
-    "toDate",
-    "isAllDay",
-    "noteCategory",
-    "username",
-    "password",
-    "email",
-    "passwordHash",
-    "isLoggedIn",
-    "darkThemeMode",
-    "themeSeedColor",
+
+# The lexer works on the UTF-8 bytes of a file (usually an mmap), so only
+# token values are ever decoded: identifiers, numbers and strings each get a
+# str, punctuation comes from a table and comments stay bytes. Every
+# character with a meaning to it is ASCII, and UTF-8 never uses ASCII bytes
+# inside a multi-byte character.
+
+TOK_STRING = "string"
+TOK_IDENT = "ident"
+TOK_NUMBER = "number"
+TOK_PUNCT = "punct"
+TOK_COMMENT = "comment"
+
+
+class Token(NamedTuple):
+    kind: str      # one of the TOK_* constants
+    start: int     # byte offset of the first character (incl. an r prefix)
+    end: int       # byte offset just past the last character
+    value: str     # decoded source text; for strings the body between the
+                   # quotes, for comments empty
+
+
+# One token in code position; iterated with finditer(), which steps over
+# the whitespace between tokens. String and block-comment openers are only
+# recognised here; their bodies are consumed by the helpers below because
+# they nest. Braces have a group of their own since they can end a ${...}.
+# The common kinds come first (groups 1-3) so that the lexer can tell them
+# apart with one comparison; the alternatives are disjoint, so their order
+# does not change what matches.
+CODE_TOKEN_RE = re.compile(rb"""
+        (?P<ident>(?!r['"])[A-Za-z_$][A-Za-z0-9_$]*)
+      | (?P<number>0[xX][0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<punct>[^\s'"{}/A-Za-z0-9_$]|/(?![/*]))
+      | (?P<brace>[{}])
+      | (?P<string>r?(?:'''|\"\"\"|'|"))
+      | (?P<comment>//[^\n\r]*)
+      | (?P<block>/\*)
+    """, re.VERBOSE)
+_PLAIN_KINDS = (None, TOK_IDENT, TOK_NUMBER, TOK_PUNCT)  # by m.lastindex
+_GROUP_PUNCT = CODE_TOKEN_RE.groupindex[TOK_PUNCT]
+# Text of a (always one-byte) punctuation token, as decode("utf-8", "replace")
+# gives it
+_PUNCT_TEXT = tuple(bytes([b]).decode("utf-8", "replace") for b in range(256))
+
+# Token(...) goes through a Python-level __new__; this is the same tuple
+# built in C, for the one-per-token hot path
+_new_token = functools.partial(tuple.__new__, Token)
+
+BLOCK_COMMENT_RE = re.compile(rb"/\*|\*/")
+
+# Whitespace / line comments followed by another string opener: Dart joins
+# adjacent literals ('Hello ' 'world') into a single string.
+ADJACENT_STRING_RE = re.compile(rb"""(?:\s|//[^\n\r]*)*(r?(?:'''|\"\"\"|'|"))""")
+
+# Next character that can end or interrupt a string body, per string flavour
+_STRING_SPECIAL_RE = {
+    (b"'", False): re.compile(rb"[\\$'\n\r]"),
+    (b'"', False): re.compile(rb'[\\$"\n\r]'),
+    (b"'''", False): re.compile(rb"[\\$']"),
+    (b'"""', False): re.compile(rb'[\\$"]'),
+    (b"'", True): re.compile(rb"['\n\r]"),
+    (b'"', True): re.compile(rb'["\n\r]'),
+    (b"'''", True): re.compile(rb"'''"),
+    (b'"""', True): re.compile(rb'"""'),
 }
+_BACKSLASH, _DOLLAR, _LBRACE, _RBRACE, _R = b"\\${}r"
+
+
+def _skip_block_comment(src: bytes, pos: int) -> int:
+    """Return the offset just past the (nestable) block comment at ``pos``."""
+    depth = 0
+    for m in BLOCK_COMMENT_RE.finditer(src, pos):
+        depth += 1 if m.group() == b"/*" else -1
+        if depth == 0:
+            return m.end()
+    return len(src)
+
+
+def _scan_string_body(src: bytes, pos: int, quote: bytes, raw: bool) -> tuple[str, int]:
+    """Consume a string body from ``pos``.
+
+    Returns ("end", offset past the closing quote), ("interp", offset past an
+    opening ``${``) or ("unterminated", offset where scanning stopped).
+    """
+    special = _STRING_SPECIAL_RE[(quote, raw)]
+    while True:
+        m = special.search(src, pos)
+        if m is None:
+            return "unterminated", len(src)
+        i = m.start()
+        c = src[i]
+        if raw or c == quote[0]:
+            if len(quote) == 1 or src[i:i + 3] == quote:
+                return "end", i + len(quote)
+            pos = i + 1
+        elif c == _BACKSLASH:
+            pos = i + 2
+        elif c == _DOLLAR:
+            if src[i + 1:i + 2] == b"{":
+                return "interp", i + 2
+            pos = i + 1
+        else:
+            # A newline inside a single-line string
+            return "unterminated", i
+
+
+# What tokenize_dart() tracks inside an interpolated expression
+_INTERP_CODE_RE = re.compile(rb"""[{}]|r?(?:'''|\"\"\"|'|")|//[^\n\r]*|/\*""")
+
+
+def _interpolation_end(src: bytes, pos: int) -> int:
+    """Offset of the ``}`` closing the interpolation whose body starts at ``pos``.
+
+    Counts braces and skips nested literals and comments like tokenize_dart();
+    -1 if the expression is not closed.
+    """
+    depth = 0
+    while True:
+        m = _INTERP_CODE_RE.search(src, pos)
+        if m is None:
+            return -1
+        token = m.group()
+        pos = m.end()
+        if token == b"{":
+            depth += 1
+        elif token == b"}":
+            if depth == 0:
+                return m.start()
+            depth -= 1
+        elif token == b"/*":
+            pos = _skip_block_comment(src, m.start())
+        elif not token.startswith(b"//"):
+            quote = token.lstrip(b"r")
+            while True:
+                status, pos = _scan_string_body(src, pos, quote, token[0] == _R)
+                if status != "interp":
+                    break
+                pos = _interpolation_end(src, pos)
+                if pos < 0:
+                    return -1
+                pos += 1
+            if status == "unterminated":
+                return -1
+
+
+class _OpenString:
+    """A string literal the lexer is inside of (directly or via ``${``)."""
+    __slots__ = ("start", "quote", "raw", "body_start", "parts", "nested", "outer_depth")
+
+    def __init__(self, start: int, quote: bytes, raw: bool, body_start: int, outer_depth: int):
+        self.start = start
+        self.quote = quote
+        self.raw = raw
+        self.body_start = body_start
+        self.parts: list[bytes] = []
+        self.nested: list[Token] = []   # tokens inside ${...}, emitted after the string
+        self.outer_depth = outer_depth  # brace depth of the code around the literal
+
+
+def tokenize_dart(src: bytes) -> Iterator[Token]:
+    """Stream the tokens of a Dart source file in a single linear pass.
+
+    ``src`` is the UTF-8 encoded source, as bytes or any buffer the re
+    module accepts (e.g. an mmap).
+
+    Handles raw (r'...') and triple-quoted strings, ``${...}`` interpolation
+    nested to any depth, nestable block comments and adjacent-string
+    concatenation. Tokens are yielded in order of their start offset; the
+    tokens of an interpolated expression follow the string that contains them.
+    Unterminated single-line strings are dropped.
+
+    Code tokens come from one finditer() pass; it is only restarted after
+    a string literal or block comment, whose bodies are consumed separately.
+    """
+    pos = 0
+    depth = 0                         # '{' nesting in the current code context
+    open_strings: list[_OpenString] = []
+
+    while True:
+        s = None
+        for m in CODE_TOKEN_RE.finditer(src, pos):
+            group = m.lastindex
+            if group <= _GROUP_PUNCT:
+                start, end = m.span()
+                if group == _GROUP_PUNCT:
+                    value = _PUNCT_TEXT[src[start]]
+                else:
+                    value = src[start:end].decode("utf-8", "replace")
+                tok = _new_token((_PLAIN_KINDS[group], start, end, value))
+                if open_strings:
+                    open_strings[-1].nested.append(tok)
+                else:
+                    yield tok
+                continue
+            kind = m.lastgroup
+            if kind == "brace":
+                start = m.start()
+                if src[start] == _RBRACE:
+                    if open_strings and depth == 0:
+                        s = open_strings[-1]   # end of ${...}: resume the string body
+                        pos = m.end()
+                        break
+                    depth -= 1
+                    tok = _new_token((TOK_PUNCT, start, start + 1, "}"))
+                else:
+                    depth += 1
+                    tok = _new_token((TOK_PUNCT, start, start + 1, "{"))
+            elif kind == "string":
+                opener = m.group()
+                pos = m.end()
+                s = _OpenString(m.start(), opener.lstrip(b"r"), opener[0] == _R, pos, depth)
+                open_strings.append(s)
+                break
+            elif kind == "block":
+                start = m.start()
+                pos = _skip_block_comment(src, start)
+                tok = _new_token((TOK_COMMENT, start, pos, ""))
+                if open_strings:
+                    open_strings[-1].nested.append(tok)
+                else:
+                    yield tok
+                break
+            else:
+                tok = _new_token((TOK_COMMENT, m.start(), m.end(), ""))
+            if open_strings:
+                open_strings[-1].nested.append(tok)
+            else:
+                yield tok
+        else:
+            break
+        if s is None:
+            continue                  # after a block comment
+
+        # Inside a string body: scan until it ends or opens an interpolation
+        while True:
+            status, end = _scan_string_body(src, pos, s.quote, s.raw)
+            if status == "interp":
+                pos = end
+                depth = 0
+                break
+            open_strings.pop()
+            depth = s.outer_depth
+            pos = end
+            if status == "unterminated":
+                out = s.nested
+            else:
+                s.parts.append(src[s.body_start:end - len(s.quote)])
+                adjacent = ADJACENT_STRING_RE.match(src, end)
+                if adjacent:
+                    opener = adjacent.group(1)
+                    s.quote = opener.lstrip(b"r")
+                    s.raw = opener[0] == _R
+                    s.body_start = pos = adjacent.end()
+                    open_strings.append(s)
+                    continue
+                out = [Token(TOK_STRING, s.start, end,
+                             b"".join(s.parts).decode("utf-8", "replace"))]
+                out.extend(s.nested)
+            if open_strings:
+                open_strings[-1].nested.extend(out)
+            else:
+                yield from out
+            break
+
+    # Input ended inside an interpolation: flush what was buffered
+    for s in open_strings:
+        yield from s.nested
+
+
+# Token sequences that precede an already-localized key lookup; used for
+# the coverage estimate
+LOCALIZED_ACCESSORS = (
+    ("l10n", "."),
+    ("AppLocalizations", ".", "of", "(", "context", ")", "!", "."),
+    ("AppLocalizations", ".", "of", "(", "context", ")", "."),
+)
 
-# Regex for strings that look like identifiers or technical values
-TECHNICAL_PATTERNS = [
-    r"^[a-z][a-zA-Z0-9_]*[A-Z_][a-zA-Z0-9_]*$",  # camelCase identifier (must have uppercase/underscore)
-    r"^[A-Z][A-Z0-9_]+$",          # SCREAMING_SNAKE (constants)
-    r"^[a-z_]+\.[a-z_]+",          # dot.notation
-    r"^\$",                          # string interpolation start
-    r"^https?://",                   # URLs
-    r"^[\d\.\-\+:\/]+$",           # numbers, dates, times
-    r"^[^\w\s]+$",                  # pure punctuation/symbols
-    r"^\w+\.dart$",                 # file names
-    r"^%",                          # format patterns
-    r"^[dMyHhms\.\-/:, ]+$",       # date/time format patterns (dd.MM.yyyy etc.)
-    r"^\.\w{1,5}$",                # file extensions (.json, .ics, .env)
-    r"^[a-zA-Z]+_\$\{",            # template filenames (data_export_${...})
-    r"^[a-zA-Z0-9_]+\.[a-zA-Z]+$",  # filenames (settings.json)
-    r"^[a-z]+://",                  # URI schemes
-    r"^/storage/",                  # Android storage paths
-    r"^/data/",                     # Android data paths
-    r"^\w+/\w+",                    # path-like strings
-]
+# Members of the generated AppLocalizations class that are not messages
+APP_LOCALIZATIONS_MEMBERS = {"localeName"}
+LOCALIZED_ACCESSOR_WINDOW = max(len(a) for a in LOCALIZED_ACCESSORS)
+_ACCESSOR_ENDS = frozenset(a[-2] for a in LOCALIZED_ACCESSORS)  # token before the final '.'
+
+
+def follows_localized_accessor(recent: deque) -> bool:
+    """True if the tokens in ``recent`` end with one of LOCALIZED_ACCESSORS."""
+    if len(recent) < 2 or recent[-1].value != "." or recent[-2].value not in _ACCESSOR_ENDS:
+        return False
+    tail = tuple(t.value for t in list(recent)[-LOCALIZED_ACCESSOR_WINDOW:])
+    return any(tail[-len(a):] == a for a in LOCALIZED_ACCESSORS)
+
+
+# UTF-8 encodings of the characters str.splitlines() treats as line
+# boundaries (U+0085, U+2028 and U+2029 are multi-byte)
+LINE_BREAK_RE = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+# Bytes a file must contain to hold a string literal or a localized lookup
+# (see LOCALIZED_ACCESSORS); files without any of them are not decoded.
+SOURCE_MARKERS = (b"'", b'"', b"l10n", b"AppLocalizations")
+
+
+def may_contain_strings(src: bytes) -> bool:
+    return any(src.find(marker) >= 0 for marker in SOURCE_MARKERS)
+
+
+class LineCursor:
+    """Maps byte offsets to (line index, decoded line) for offsets visited in
+    increasing order, decoding only the lines asked for.
+
+    Lines are those of ``src.decode().splitlines()``.
+    """
+
+    def __init__(self, src: bytes):
+        self.src = src
+        self._rewind()
+
+    def _rewind(self):
+        self._breaks = LINE_BREAK_RE.finditer(self.src)
+        self._next = next(self._breaks, None)
+        self.index = 0    # line index of the last offset looked up
+        self.start = 0    # byte offset at which that line begins
+        self._text: Optional[str] = None
+        self._column = (0, 0)  # (byte offset, column) last computed on this line
+
+    def seek(self, offset: int) -> int:
+        """Move to the line containing ``offset``; return its index."""
+        if offset < self.start:
+            self._rewind()
+        while self._next is not None and self._next.end() <= offset:
+            self.index += 1
+            self.start = self._next.end()
+            self._next = next(self._breaks, None)
+            self._text = None
+            self._column = (self.start, 0)
+        return self.index
+
+    @property
+    def text(self) -> str:
+        """The current line, without its line break."""
+        if self._text is None:
+            end = len(self.src) if self._next is None else self._next.start()
+            self._text = self.src[self.start:end].decode("utf-8", "replace")
+        return self._text
+
+    def column(self, offset: int) -> int:
+        """0-based character column of ``offset`` on the current line.
+
+        Decodes only from the offset asked for before, when that is earlier
+        on the same line.
+        """
+        last, col = self._column
+        if last > offset:
+            last, col = self.start, 0
+        col += len(self.src[last:offset].decode("utf-8", "replace"))
+        self._column = (offset, col)
+        return col
 
 
 # ──────────────────────────────────────────────────────────────────────
 # Context detection — what kind of UI element contains this string?
 # ──────────────────────────────────────────────────────────────────────
 
-# Patterns that look backwards from the string to determine context.
-# Order matters — first match wins.
-CONTEXT_RULES: list[tuple[re.Pattern, StringContext, Severity]] = [
-    # SnackBar action labels  (SnackBarAction(label: '...'
-    (re.compile(r"SnackBarAction\s*\(\s*label:\s*$"), StringContext.SNACKBAR_ACTION, Severity.CRITICAL),
+@dataclass(frozen=True)
+class ContextRule:
+    """Structural description of where a literal sits in the widget tree.
+
+    Patterns are full-matched against callee names as written before the
+    opening parenthesis (``Text``, ``ElevatedButton.icon``, ``showSnackBar``),
+    optionally qualified by an import prefix (``pw.Text``).
+    A literal matches a rule when every given field matches:
+
+    call        the innermost enclosing call
+    arg         the literal is the direct value of this named argument of the
+                innermost call; when unset (and ``call`` is set) the literal
+                must be that call's first positional argument
+    outer_arg   the innermost call is the direct value of this named argument
+                of the call around it
+    outer_call  the call around the innermost call
+    ancestor    any enclosing call
+    keyword     the literal directly follows this keyword
+    """
+    context: StringContext
+    severity: Severity
+    call: Optional[str] = None
+    arg: Optional[str] = None
+    outer_arg: Optional[str] = None
+    outer_call: Optional[str] = None
+    ancestor: Optional[str] = None
+    keyword: Optional[str] = None
+
+
+class _CompiledRules:
+    """Context rules with their callee patterns folded into per-callee bitmasks."""
+
+    def __init__(self, rules: list[ContextRule]):
+        self.rules = rules
+
+        def table(attr: str) -> list[tuple[int, re.Pattern]]:
+            return [(1 << i, re.compile(rf"(?:\w+\.)*(?:{getattr(r, attr)})"))
+                    for i, r in enumerate(rules) if getattr(r, attr)]
+
+        self._call = table("call")
+        self._outer = table("outer_call")
+        self._ancestor = table("ancestor")
+        self.callee_bits = functools.lru_cache(maxsize=4096)(self._callee_bits)
+
+    def _callee_bits(self, callee: str) -> tuple[int, int, int]:
+        """Bitmasks of rules whose call / outer_call / ancestor match ``callee``."""
+        prof = PROFILER
+
+        def bits(table):
+            if prof is None:
+                return sum(bit for bit, pat in table if pat.fullmatch(callee))
+            # Callee pattern time is charged to the rule the pattern belongs to
+            mask = 0
+            for bit, pat in table:
+                t0 = perf_counter()
+                if pat.fullmatch(callee):
+                    mask |= bit
+                prof.charge("context", bit.bit_length() - 1, perf_counter() - t0)
+            return mask
+        return bits(self._call), bits(self._outer), bits(self._ancestor)
+
+
+class _Frame:
+    """One open bracket on the context stack."""
+    __slots__ = ("bracket", "arg", "calls", "outers", "ancestors", "outer_arg")
+
+    def __init__(self, bracket: str, calls: int = 0, outers: int = 0,
+                 ancestors: int = 0, outer_arg: Optional[str] = None):
+        self.bracket = bracket
+        self.arg: Optional[str] = None  # named argument currently being passed
+        self.calls = calls              # rules whose `call` matches this callee
+        self.outers = outers            # rules whose `outer_call` matches this callee
+        self.ancestors = ancestors      # rules whose `ancestor` matches this or an outer callee
+        self.outer_arg = outer_arg      # named argument of the outer call this call is the value of
+
+
+_CLOSING = {")": "(", "]": "[", "}": "{"}
+# Punctuation that changes the tracker state; feed() only records the rest
+TRACKED_PUNCT = frozenset("([{)]},:")
+_CALL_PREFIX_KEYWORDS = {"const", "new"}
+
+
+class ContextTracker:
+    """Incrementally maintained call / named-argument stack.
+
+    Fed every non-comment token of a file in order, it can classify the
+    literal about to be fed in O(1), however far away the enclosing
+    constructor was opened.
+    """
+
+    def __init__(self, rules: Optional[_CompiledRules] = None):
+        self.rules = rules if rules is not None else RULES.context_rules
+        self.frames = [_Frame("")]
+        self.open_counts = dict.fromkeys(_CLOSING.values(), 0)  # open frames per bracket
+        self.recent: deque[Token] = deque(maxlen=16)
+        self.arg_colon: Optional[Token] = None  # ':' that opened the current named argument
+
+    def _callee(self) -> tuple[Optional[str], int]:
+        """Dotted callee name before a '(' just seen, and its first token index."""
+        recent = self.recent
+        i = len(recent) - 1
+        if i >= 0 and recent[i].value == ">":
+            # Skip type arguments: showDialog<bool>(
+            depth = 0
+            while i >= 0:
+                v = recent[i].value
+                depth += (v == ">") - (v == "<")
+                i -= 1
+                if depth == 0:
+                    break
+        if i < 0 or recent[i].kind != TOK_IDENT:
+            return None, i
+        parts = [recent[i].value]
+        while i >= 2 and recent[i - 1].value == "." and recent[i - 2].kind == TOK_IDENT:
+            parts.append(recent[i - 2].value)
+            i -= 2
+        return ".".join(reversed(parts)), i
+
+    def _open_call(self):
+        parent = self.frames[-1]
+        callee, i = self._callee()
+        if callee is None:
+            self._push(_Frame("(", ancestors=parent.ancestors))
+            return
+        calls, outers, ancestors = self.rules.callee_bits(callee)
+        # Is the call the direct value of a named argument (`title: const Text(`)?
+        i -= 1
+        while i >= 0 and self.recent[i].value in _CALL_PREFIX_KEYWORDS:
+            i -= 1
+        outer_arg = parent.arg if i >= 0 and self.recent[i].value == ":" else None
+        self._push(_Frame("(", calls, outers, parent.ancestors | ancestors, outer_arg))
+
+    def _push(self, frame: _Frame):
+        self.frames.append(frame)
+        self.open_counts[frame.bracket] += 1
+
+    def feed(self, tok: Token):
+        """Advance past a non-comment token."""
+        if tok.kind == TOK_PUNCT:
+            v = tok.value
+            frame = self.frames[-1]
+            if v == "(":
+                self._open_call()
+            elif v in "[{":
+                self._push(_Frame(v, ancestors=frame.ancestors))
+            elif v in _CLOSING:
+                # Pop to the matching bracket; tolerate unbalanced input. A
+                # bracket with no open counterpart is ignored without
+                # searching the stack for it.
+                opener = _CLOSING[v]
+                if self.open_counts[opener]:
+                    depth = len(self.frames) - 1
+                    while self.frames[depth].bracket != opener:
+                        depth -= 1
+                    for closed in self.frames[depth:]:
+                        self.open_counts[closed.bracket] -= 1
+                    del self.frames[depth:]
+            elif v == "," and frame.bracket == "(":
+                frame.arg = None
+            elif (v == ":" and frame.bracket == "(" and len(self.recent) >= 2
+                  and self.recent[-1].kind == TOK_IDENT
+                  and self.recent[-2].value in ("(", ",")):
+                frame.arg = self.recent[-1].value
+                self.arg_colon = tok
+        self.recent.append(tok)
+
+    def _applies(self, i: int, rule: ContextRule, frame: _Frame, positional: bool,
+                 named: bool, keyword: Optional[str]) -> bool:
+        bit = 1 << i
+        if rule.keyword is not None:
+            if keyword != rule.keyword:
+                return False
+        elif rule.arg is not None:
+            if not named or frame.arg != rule.arg:
+                return False
+        elif not positional:
+            return False
+        if rule.call is not None and not frame.calls & bit:
+            return False
+        if rule.outer_arg is not None and frame.outer_arg != rule.outer_arg:
+            return False
+        if rule.outer_call is not None and (len(self.frames) < 2
+                                            or not self.frames[-2].outers & bit):
+            return False
+        if rule.ancestor is not None and not frame.ancestors & bit:
+            return False
+        return True
 
-    # SnackBar content  (content: Text('...'
-    (re.compile(r"SnackBar\b.*content:\s*(?:const\s+)?Text\s*\(\s*$", re.DOTALL),
-        StringContext.SNACKBAR, Severity.CRITICAL),
-    # Catch simpler SnackBar content patterns
-    (re.compile(r"showSnackBar\b.*?Text\s*\(\s*$", re.DOTALL),
-        StringContext.SNACKBAR, Severity.CRITICAL),
+    def classify(self) -> tuple[StringContext, Severity]:
+        """Context and severity of a literal at the current position."""
+        prev = self.recent[-1] if self.recent else None
+        frame = self.frames[-1]
+        positional = prev is not None and prev.value == "(" and frame.bracket == "("
+        named = prev is not None and prev is self.arg_colon and frame.arg is not None
+        keyword = prev.value if prev is not None and prev.kind == TOK_IDENT else None
 
-    # AlertDialog / Dialog title
-    (re.compile(r"title:\s*(?:const\s+)?Text\s*\(\s*$"),
-        StringContext.DIALOG_TITLE, Severity.CRITICAL),
+        prof = PROFILER
+        for i, rule in enumerate(self.rules.rules):
+            if prof is None:
+                hit = self._applies(i, rule, frame, positional, named, keyword)
+            else:
+                t0 = perf_counter()
+                hit = self._applies(i, rule, frame, positional, named, keyword)
+                prof.record("context", i, hit, perf_counter() - t0)
+            if hit:
+                return rule.context, rule.severity
 
-    # AlertDialog / Dialog content
-    (re.compile(r"content:\s*(?:const\s+)?Text\s*\(\s*$"),
-        StringContext.DIALOG_CONTENT, Severity.CRITICAL),
+        return StringContext.GENERIC, Severity.LOW
 
-    # AppBar title
-    (re.compile(r"AppBar\s*\(.*?title:\s*(?:const\s+)?Text\s*\(\s*$", re.DOTALL),
-        StringContext.APPBAR_TITLE, Severity.CRITICAL),
 
-    # Button child: const Text('...')
-    (re.compile(r"(?:ElevatedButton|TextButton|OutlinedButton|FilledButton)"
-                r".*?child:\s*(?:const\s+)?Text\s*\(\s*$", re.DOTALL),
-        StringContext.BUTTON_LABEL, Severity.CRITICAL),
-    # Button label: const Text('...')  (for .icon constructors)
-    (re.compile(r"label:\s*(?:const\s+)?Text\s*\(\s*$"),
-        StringContext.BUTTON_LABEL, Severity.CRITICAL),
+# ──────────────────────────────────────────────────────────────────────
+# Ruleset (tools/check_translations.toml, --rules)
+# ──────────────────────────────────────────────────────────────────────
 
-    # Tab text
-    (re.compile(r"Tab\s*\(.*?text:\s*$", re.DOTALL),
-        StringContext.TAB_TEXT, Severity.HIGH),
+# Bump when validation or the normalised form of a ruleset changes
+RULES_CACHE_VERSION = 1
+RULES_CACHE_ENTRIES = 16
+
+# Ruleset section -> (TOML table, key, whether entries are regexes)
+RULE_SECTIONS = {
+    "false_positive": ("false_positive", "patterns", True),
+    "ignored": ("ignored", "values", False),
+    "technical": ("technical", "patterns", True),
+    "non_ui": ("non_ui", "paths", False),
+    "skip_params": ("skip_params", "names", False),
+}
+CONTEXT_RULE_FIELDS = ("call", "arg", "outer_arg", "outer_call", "ancestor", "keyword")
+CONTEXT_RULE_PATTERNS = ("call", "outer_call", "ancestor")
 
-    # InputDecoration labelText
-    (re.compile(r"labelText:\s*$"), StringContext.INPUT_LABEL, Severity.HIGH),
 
-    # InputDecoration hintText
-    (re.compile(r"hintText:\s*$"), StringContext.INPUT_HINT, Severity.MEDIUM),
+def compile_ruleset(patterns: list[str]) -> re.Pattern:
+    """Fold a list of regex sources into a single precompiled alternation.
 
-    # Tooltip
-    (re.compile(r"tooltip:\s*$"), StringContext.TOOLTIP, Severity.MEDIUM),
+    A search/match with the alternation succeeds exactly when one of the
+    individual patterns would. The sources are wrapped in non-capturing
+    groups: capturing ones made a line search about ten times slower.
+    Profiler.first_match evaluates the rules one by one when the rule that
+    fired is needed.
+    """
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
 
-    # Validator return
-    (re.compile(r"return\s+$"), StringContext.VALIDATOR, Severity.HIGH),
 
-    # Generic Text widget
-    (re.compile(r"(?:const\s+)?Text\s*\(\s*$"), StringContext.TEXT_WIDGET, Severity.HIGH),
+def _check_pattern(pattern: str, where: str):
+    try:
+        re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"{where}: invalid regex {pattern!r}: {e}") from None
 
-    # child: Text(... used as generic button text
-    (re.compile(r"child:\s*(?:const\s+)?Text\s*\(\s*$"),
-        StringContext.BUTTON_LABEL, Severity.CRITICAL),
-]
+
+def validate_rules(doc: dict, source: str) -> dict:
+    """Check a parsed rules file and return the sections it defines in
+    normalised, JSON-serialisable form.
+
+    Raises ValueError naming the offending table or entry.
+    """
+    tables = {table for table, _, _ in RULE_SECTIONS.values()} | {"context"}
+    unknown = sorted(set(doc) - tables)
+    if unknown:
+        raise ValueError(f"{source}: unknown table(s) {', '.join(unknown)}")
+
+    rules = {}
+    for name, (table, key, is_regex) in RULE_SECTIONS.items():
+        if table not in doc:
+            continue
+        section = doc[table]
+        if not isinstance(section, dict) or set(section) != {key}:
+            raise ValueError(f"{source}: [{table}] must contain exactly the key {key!r}")
+        values = section[key]
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"{source}: {table}.{key} must be an array of strings")
+        if is_regex:
+            for i, value in enumerate(values):
+                _check_pattern(value, f"{source}: {table}.{key}[{i}]")
+        # Order matters for regexes (first match is reported) and is kept
+        # for paths; value sets are stored sorted
+        rules[name] = sorted(set(values)) if name in ("ignored", "skip_params") else values
+
+    if "context" in doc:
+        entries = doc["context"]
+        if not isinstance(entries, list) or not all(isinstance(r, dict) for r in entries):
+            raise ValueError(f"{source}: context must be an array of tables ([[context]])")
+        rules["context"] = []
+        for i, entry in enumerate(entries):
+            where = f"{source}: context[{i}]"
+            unknown = sorted(set(entry) - {"context", "severity", *CONTEXT_RULE_FIELDS})
+            if unknown:
+                raise ValueError(f"{where}: unknown field(s) {', '.join(unknown)}")
+            for attr, enum in (("context", StringContext), ("severity", Severity)):
+                value = entry.get(attr)
+                if not isinstance(value, str) or value not in enum.__members__:
+                    raise ValueError(f"{where}: {attr} must be one of "
+                                     f"{', '.join(enum.__members__)}")
+            for attr in CONTEXT_RULE_FIELDS:
+                value = entry.get(attr)
+                if value is not None and not (isinstance(value, str) and value):
+                    raise ValueError(f"{where}: {attr} must be a non-empty string")
+            for attr in CONTEXT_RULE_PATTERNS:
+                if entry.get(attr):
+                    _check_pattern(entry[attr], f"{where}.{attr}")
+            rules["context"].append({"context": entry["context"],
+                                     "severity": entry["severity"],
+                                     **{attr: entry.get(attr) for attr in CONTEXT_RULE_FIELDS}})
+    return rules
+
+
+class RulesError(Exception):
+    """A rules file that cannot be read, parsed or validated."""
+
+
+class Ruleset:
+    """A validated ruleset with its matchers compiled."""
+
+    def __init__(self, data: dict, digest: str):
+        self.data = data      # normalised form, as stored in the rules cache
+        self.digest = digest  # identifies the rule files it was built from
+        self.from_cache = False  # set by load_ruleset() on a rules cache hit
+        self.false_positive: list[str] = data["false_positive"]
+        self.technical: list[str] = data["technical"]
+        self.ignored = frozenset(data["ignored"])
+        self.non_ui: list[str] = data["non_ui"]
+        self.skip_params = frozenset(data["skip_params"])
+        self.context = [ContextRule(StringContext[r["context"]], Severity[r["severity"]],
+                                    **{attr: r[attr] for attr in CONTEXT_RULE_FIELDS})
+                        for r in data["context"]]
+        self.false_positive_re = compile_ruleset(self.false_positive)
+        self.technical_re = compile_ruleset(self.technical)
+        self.context_rules = _CompiledRules(self.context)
+
+
+def _read_rules_cache() -> dict:
+    try:
+        data = json.loads(RULES_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != RULES_CACHE_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_rules_cache(entries: dict):
+    """Write the rules cache atomically, keeping the most recent entries."""
+    keep = dict(list(entries.items())[-RULES_CACHE_ENTRIES:])
+    try:
+        RULES_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = RULES_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": RULES_CACHE_VERSION, "entries": keep}, f,
+                      ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, RULES_CACHE_FILE)
+    except OSError as e:
+        print(f"WARNING: could not write rules cache {RULES_CACHE_FILE}: {e}", file=sys.stderr)
+
+
+def load_ruleset(path: Optional[Path] = None) -> Ruleset:
+    """Load RULES_FILE, with every section defined in ``path`` (--rules)
+    replacing the default one.
+
+    A warm RULES_CACHE_FILE entry, keyed by the sha256 of the rule files,
+    spares parsing TOML and validating; the regexes are still compiled once
+    per process. Nothing is written here: cache_ruleset() stores a freshly
+    parsed ruleset. Raises RulesError on an unreadable or invalid rules
+    file, or when the cache is cold and there is no TOML parser.
+    """
+    sources = [RULES_FILE] if path is None else [RULES_FILE, path]
+    contents = []
+    h = hashlib.sha256(f"{RULES_CACHE_VERSION}".encode("utf-8"))
+    for source in sources:
+        try:
+            content = source.read_bytes()
+        except OSError as e:
+            raise RulesError(f"cannot read rules file {source}: {e}") from None
+        h.update(hashlib.sha256(content).digest())
+        contents.append((source, content))
+    digest = h.hexdigest()
+
+    entries = _read_rules_cache()
+    if digest in entries:
+        try:
+            rules = Ruleset(entries[digest], digest)
+        except (KeyError, TypeError, ValueError, re.error):
+            pass  # damaged cache entry: parse the files below
+        else:
+            rules.from_cache = True
+            return rules
+
+    if tomllib is None:
+        raise RulesError(f"reading {sources[-1]} needs Python 3.11+ or the tomli package")
+    data: dict = {}
+    for source, content in contents:
+        try:
+            doc = tomllib.loads(content.decode("utf-8"))
+        except ValueError as e:  # TOMLDecodeError / UnicodeDecodeError
+            raise RulesError(f"cannot parse rules file {source}: {e}") from None
+        try:
+            data.update(validate_rules(doc, str(source)))
+        except ValueError as e:
+            raise RulesError(f"invalid rules: {e}") from None
+    missing = sorted(set(RULE_SECTIONS) - set(data)) + ([] if "context" in data else ["context"])
+    if missing:
+        raise RulesError(f"{RULES_FILE} is missing section(s) {', '.join(missing)}")
+    return Ruleset(data, digest)
+
+
+def cache_ruleset(rules: Ruleset):
+    """Store a parsed ruleset in RULES_CACHE_FILE for the next start."""
+    if rules.from_cache:
+        return
+    entries = _read_rules_cache()
+    entries.pop(rules.digest, None)
+    entries[rules.digest] = rules.data
+    _write_rules_cache(entries)
+
+
+def set_ruleset(rules: Ruleset):
+    """Make ``rules`` the ruleset every check of this process uses."""
+    global RULES
+    RULES = rules
+    is_ignored_value.cache_clear()
+
+
+# A broken rules file must not make importing this module exit: main()
+# (and the bench/stress scripts) report RULES_ERROR instead.
+RULES: Optional[Ruleset] = None
+RULES_ERROR: Optional[RulesError] = None
+try:
+    RULES = load_ruleset()
+except RulesError as e:
+    RULES_ERROR = e
 
 
 # ──────────────────────────────────────────────────────────────────────
 # Core scanning logic
 # ──────────────────────────────────────────────────────────────────────
 
-# Match single- and double-quoted Dart string literals (non-interpolated or
-# simple interpolation). We deliberately keep it simple — triple-quotes and
-# raw strings are rare in UI code.
-STRING_RE = re.compile(
-    r"""(?:const\s+)?"""               # optional const keyword
-    r"""(?:"""
-    r"""'([^'\\]*(?:\\.[^'\\]*)*)'"""  # single-quoted
-    r"""|"""
-    r'''"([^"\\]*(?:\\.[^"\\]*)*)"'''  # double-quoted
-    r""")"""
-)
-
-
 def is_false_positive_line(line: str) -> bool:
     """Return True if the whole line is clearly not user-facing."""
-    stripped = line.strip()
-    for pat in FALSE_POSITIVE_PATTERNS:
-        if re.search(pat, stripped):
-            return True
-    return False
+    if PROFILER is not None:
+        return PROFILER.first_match("false_positive", line.strip())
+    return RULES.false_positive_re.search(line.strip()) is not None
 
 
+@functools.lru_cache(maxsize=8192)
 def is_ignored_value(s: str) -> bool:
-    """Return True if the string value itself is technical / uninteresting."""
-    if s in IGNORED_STRING_VALUES:
+    """Return True if the string value itself is technical / uninteresting.
+
+    Cached by value: the same literals ('Cancel', 'OK', ...) recur across
+    many files.
+    """
+    if s in RULES.ignored:
         return True
     # Very short strings (single char) are usually not user-facing words
     if len(s) <= 1:
         return True
-    for pat in TECHNICAL_PATTERNS:
-        if re.match(pat, s):
-            return True
-    return False
-
+    if PROFILER is not None:
+        return PROFILER.first_match("technical", s)
+    return RULES.technical_re.match(s) is not None
 
-def is_localized_call(line: str, match_start: int) -> bool:
-    """Check if the string is already inside an AppLocalizations / l10n call."""
-    prefix = line[:match_start]
-    if "l10n." in prefix or "AppLocalizations" in prefix:
-        return True
-    # Also check for the pattern where the string IS the l10n getter
-    if re.search(r"l10n\.\w+", line):
-        return True
-    return False
 
+def localized_from(line: str) -> int:
+    """Column from which literals on ``line`` count as already inside an
+    AppLocalizations / l10n call (past the end of the line if none do).
 
-def detect_context(lines: list[str], line_idx: int, col: int) -> tuple[StringContext, Severity]:
-    """Look at surrounding code to determine what kind of UI element this is."""
-    # Build a context window: current line up to the match, plus a few previous lines
-    current_prefix = lines[line_idx][:col]
-    # Combine up to 5 previous lines for multi-line pattern matching
-    window_lines = []
-    for i in range(max(0, line_idx - 5), line_idx):
-        window_lines.append(lines[i])
-    window_lines.append(current_prefix)
-    window = "\n".join(window_lines)
-
-    for pattern, ctx, sev in CONTEXT_RULES:
-        if pattern.search(window):
-            return ctx, sev
+    Computed once per line, so a long line with many literals is not
+    searched again for each of them.
+    """
+    # The string IS the l10n getter: the whole line is localized
+    if re.search(r"l10n\.\w+", line):
+        return 0
+    ends = [i + len(marker) for marker in ("l10n.", "AppLocalizations")
+            if (i := line.find(marker)) >= 0]
+    return min(ends, default=len(line) + 1)
 
-    # Fallback: if inside a Text() widget on the same line
-    if re.search(r"Text\s*\(\s*$", current_prefix):
-        return StringContext.TEXT_WIDGET, Severity.HIGH
 
-    return StringContext.GENERIC, Severity.LOW
+# How far before a literal the end-anchored checks in scan_source() look;
+# bounds their cost on very long lines
+PREFIX_WINDOW = 200
 
 
 def suggest_key(s: str) -> str:
@@ -395,163 +1457,1611 @@ def suggest_key(s: str) -> str:
     return key
 
 
-# Directories where strings are almost never user-facing
-NON_UI_DIR_SEGMENTS = {"data", "domain", "repositories", "models"}
-
-# Files (by directory layer) where strings are rarely user-facing
-NON_UI_FILE_PATTERNS = [
-    r"/data/",
-    r"/domain/",
-    r"/repositories/",
-    r"/models/",
-    r"core/database/",
-    r"core/encryption/",
-    r"core/log/",
-    r"core/settings/",
-    r"core/utils/",
-    r"core/authentication/",
-]
-
-
 def is_non_ui_file(rel_path: str) -> bool:
     """Check if the file is in a non-UI layer (data, domain, utils, etc.)."""
-    for pat in NON_UI_FILE_PATTERNS:
+    for pat in RULES.non_ui:
         if pat in rel_path:
             return True
     return False
 
 
-def scan_file(filepath: Path, arb: dict[str, str], reverse_arb: dict[str, str]) -> FileReport:
-    """Scan a single Dart file for hardcoded strings."""
-    rel_path = str(filepath.relative_to(PROJECT_ROOT))
-    report = FileReport(path=rel_path)
+def map_file(f) -> Optional[mmap.mmap]:
+    """Memory-map an open file read-only; None if it is empty."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def scan_file(filepath: Path, arb_index: ArbIndex) -> FileReport:
+    """Scan a single Dart file for hardcoded strings.
 
+    The file is memory-mapped rather than read, so even a huge file costs
+    no more memory than the findings in it.
+    """
+    rel_path = str(filepath.relative_to(PROJECT_ROOT))
+    prof = PROFILER
     try:
-        content = filepath.read_text(encoding="utf-8")
-    except (UnicodeDecodeError, PermissionError):
+        with open(filepath, "rb") as f:
+            buf = map_file(f) if prof is None else prof.timed("read", map_file, f)
+            if buf is None:
+                return FileReport(path=rel_path)
+            with buf:
+                return scan_source(buf, rel_path, arb_index)
+    except PermissionError:
+        return FileReport(path=rel_path)
+
+
+def scan_source(content, rel_path: str, arb_index: ArbIndex) -> FileReport:
+    """Scan Dart source; ``rel_path`` is its path relative to the project.
+
+    ``content`` is text, or the UTF-8 encoded source as bytes or an mmap.
+    Token values are decoded (see tokenize_dart), but of the source lines
+    only those holding a literal are; invalid UTF-8 is replaced rather than
+    failing the file. A file with no quote and no l10n marker is not
+    tokenized at all.
+
+    A file still being scanned after FILE_TIME_BUDGET seconds is reported
+    as skipped, without findings. The deadline is checked between tokens,
+    so it cannot interrupt a single runaway regex.
+    """
+    report = FileReport(path=rel_path)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    if not may_contain_strings(content):
         return report
+    prof = PROFILER
+    deadline = perf_counter() + FILE_TIME_BUDGET if FILE_TIME_BUDGET > 0 else None
+    countdown = BUDGET_CHECK_TOKENS
 
     # For non-UI files, only report if it looks like there's a UI element
     is_non_ui = is_non_ui_file(rel_path)
 
-    lines = content.splitlines()
+    # The file is tokenized once; literal offsets are mapped back to
+    # (line, column) by a cursor that only moves forward. Per-line checks
+    # are done once for the line the cursor is on.
+    cursor = LineCursor(content)
+    line_idx = -1
+
+    tracker = ContextTracker()
+    recent = tracker.recent
+    for tok in tokenize_dart(content):
+        if deadline is not None:
+            countdown -= 1
+            if not countdown:
+                if perf_counter() > deadline:
+                    return FileReport(path=rel_path, skipped=SKIPPED_TOO_SLOW)
+                countdown = BUDGET_CHECK_TOKENS
+        kind = tok.kind
+        if kind != TOK_STRING:
+            if kind == TOK_PUNCT:
+                if tok.value in TRACKED_PUNCT:
+                    tracker.feed(tok)
+                    continue
+            elif kind == TOK_IDENT:
+                # Count localized string usages (l10n.key, AppLocalizations...key)
+                if recent and recent[-1].value == "." and follows_localized_accessor(recent):
+                    report.localized_strings += 1
+                    if tok.value not in APP_LOCALIZATIONS_MEMBERS:
+                        usages = report.key_usages
+                        usages[tok.value] = usages.get(tok.value, 0) + 1
+            elif kind == TOK_COMMENT:
+                continue
+            # All that feed() does with any other token
+            recent.append(tok)
+            continue
 
-    for line_idx, line in enumerate(lines):
+        # Detect context and severity from the enclosing calls
+        if prof is None:
+            ctx, severity = tracker.classify()
+        else:
+            ctx, severity = prof.timed("context", tracker.classify)
+        tracker.feed(tok)
+
+        raw = tok.value
+        if cursor.seek(tok.start) != line_idx:
+            line_idx = cursor.index
+            line = cursor.text
+            # Skip lines that are clearly non-UI
+            line_skipped = is_false_positive_line(line)
+            line_localized_from = None
+            anchor = None
+        if line_skipped:
+            continue
         line_no = line_idx + 1
+        col = cursor.column(tok.start)
+        report.total_strings += 1
+
+        # Filter out ignored / technical values
+        if is_ignored_value(raw):
+            continue
 
-        # Skip comment-only lines
-        stripped = line.strip()
-        if stripped.startswith("//") or stripped.startswith("///"):
+        # Skip if it's inside a localization call
+        if line_localized_from is None:
+            line_localized_from = localized_from(line)
+        if col >= line_localized_from:
             continue
 
-        # Count localized string usages on this line
-        l10n_count = len(re.findall(r"\bl10n\.\w+", line))
-        l10n_count += len(re.findall(r"AppLocalizations\.of\(context\)!\.\w+", line))
-        report.localized_strings += l10n_count
+        # Skip strings that are purely interpolated (start with $)
+        if raw.startswith("$") or raw.startswith("{"):
+            continue
 
-        # Skip lines that are clearly non-UI
-        if is_false_positive_line(line):
+        # Skip map key access patterns like ['key']
+        if col > 0 and line[col - 1:col] == "[":
             continue
 
-        # Find all string literals on this line
-        for match in STRING_RE.finditer(line):
-            raw = match.group(1) if match.group(1) is not None else match.group(2)
-            if raw is None:
+        # Skip named parameter string values that are clearly identifiers
+        # e.g.  tableName: 'notes'
+        prefix = line[max(0, col - PREFIX_WINDOW):col]
+        param_match = re.search(r"(\w+):\s*$", prefix)
+        if param_match:
+            param_name = param_match.group(1)
+            if param_name in RULES.skip_params:
                 continue
 
-            col = match.start()
-            report.total_strings += 1
+        # Skip internal status variable assignments: _status = '...'
+        if re.search(r"_\w*[Ss]tatus\s*=\s*$", prefix):
+            continue
 
-            # Filter out ignored / technical values
-            if is_ignored_value(raw):
-                continue
+        # Skip replaceAll / RegExp patterns
+        if re.search(r"replaceAll\s*\(\s*(RegExp\s*\()?\s*$", prefix):
+            continue
 
-            # Skip if it's inside a localization call
-            if is_localized_call(line, col):
-                continue
+        # Skip strings that contain mostly interpolation
+        interp_count = len(re.findall(r'\$\{?\w+', raw))
+        word_count = len(re.findall(r'[a-zA-Z]{2,}', raw))
+        if interp_count > 0 and word_count <= interp_count:
+            continue
 
-            # Skip strings that are purely interpolated (start with $)
-            if raw.startswith("$") or raw.startswith("{"):
+        # In non-UI files, skip GENERIC context strings (likely internal)
+        # but keep explicitly detected UI contexts (could be data passed to UI)
+        if is_non_ui and ctx == StringContext.GENERIC:
+            # Exception: keep strings that contain natural language (multiple words)
+            if len(raw.split()) < 3:
                 continue
 
-            # Skip map key access patterns like ['key']
-            if col > 0 and line[col - 1:col] == "[":
+        # Skip GENERIC/LOW if the string looks like a format/template
+        if severity == Severity.LOW and ctx == StringContext.GENERIC:
+            # Only keep it if it looks like real words (3+ alpha chars)
+            if not re.search(r"[a-zA-Z]{3,}", raw):
                 continue
 
-            # Skip named parameter string values that are clearly identifiers
-            # e.g.  tableName: 'notes'
-            param_match = re.search(r"(\w+):\s*$", line[:col])
-            if param_match:
-                param_name = param_match.group(1)
-                if param_name in {
-                    "tableName", "primaryKey", "columnName", "key",
-                    "fontFamily", "package", "name", "routeName",
-                    "heroTag", "restorationId", "semanticsLabel",
-                    "debugLabel", "initialRoute", "allowedExtensions",
-                    "dialogTitle", "lockParentWindow",
-                }:
-                    continue
+        entry = HardcodedString(
+            file=rel_path,
+            line=line_no,
+            column=col + 1,
+            raw_string=sys.intern(raw),
+            context=ctx,
+            severity=severity,
+            anchor=anchor or line_anchor(line),
+        )
+        anchor = entry.anchor
+        if prof is None:
+            match_arb(entry, arb_index)
+        else:
+            prof.timed("arb_match", match_arb, entry, arb_index)
+        report.hardcoded.append(entry)
 
-            # Skip internal status variable assignments: _status = '...'
-            if re.search(r"_\w*[Ss]tatus\s*=\s*$", line[:col]):
-                continue
+    return report
 
-            # Skip replaceAll / RegExp patterns
-            if re.search(r"replaceAll\s*\(\s*(RegExp\s*\()?\s*$", line[:col]):
-                continue
 
-            # Skip strings that contain mostly interpolation
-            interp_count = len(re.findall(r'\$\{?\w+', raw))
-            word_count = len(re.findall(r'[a-zA-Z]{2,}', raw))
-            if interp_count > 0 and word_count <= interp_count:
+def match_arb(entry: HardcodedString, arb_index: ArbIndex) -> HardcodedString:
+    """Fill in the ARB-derived fields of a finding.
+
+    Kept apart from scanning so that an ARB change only needs this step
+    to be redone for existing findings.
+    """
+    # Check if an existing ARB key matches, exactly or as a template
+    keys = arb_index.matches(entry.raw_string)
+    entry.existing_key = keys[0] if keys else None
+    entry.other_keys = keys[1:]
+    entry.suggested_key = entry.existing_key or sys.intern(suggest_key(entry.raw_string))
+    entry.similar_keys = []
+    return entry
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Incremental scan cache
+# ──────────────────────────────────────────────────────────────────────
+
+CACHE_VERSION = 8
+
+
+def ruleset_fingerprint(arb_path: Optional[Path]) -> str:
+    """Hash everything besides the file itself that influences a FileReport.
+
+    Covers the rule tables, the ARB contents (unless ``arb_path`` is None)
+    and the checker's own source, so editing any of them invalidates every
+    cached entry.
+    """
+    h = hashlib.sha256()
+    h.update(f"{CACHE_VERSION}:{RULES.digest}".encode("utf-8"))
+    for path in (arb_path, Path(__file__).resolve()):
+        if path is None:
+            continue
+        try:
+            h.update(path.read_bytes())
+        except OSError:
+            h.update(b"<missing>")
+    return h.hexdigest()
+
+
+def report_to_dict(report: FileReport) -> dict:
+    """Cache form of a report, with each finding as a row
+    [line, column, string, context, severity, existing_key, suggested_key, anchor,
+    other_keys].
+
+    The file of a finding is the report's path, and similar keys are
+    attached after scanning, so neither is stored.
+    """
+    return {
+        "path": report.path,
+        "total_strings": report.total_strings,
+        "localized_strings": report.localized_strings,
+        "hardcoded": [[e.line, e.column, e.raw_string, e.context.value, e.severity.value,
+                       e.existing_key, e.suggested_key, e.anchor, e.other_keys]
+                      for e in report.hardcoded],
+        "key_usages": report.key_usages,
+    }
+
+
+def report_from_dict(data: dict) -> FileReport:
+    path = sys.intern(data["path"])
+    hardcoded = [HardcodedString(path, line, column, sys.intern(raw), StringContext(ctx),
+                                 Severity(sev), existing_key, other_keys,
+                                 suggested_key and sys.intern(suggested_key), anchor=anchor)
+                 for line, column, raw, ctx, sev, existing_key, suggested_key, anchor, other_keys
+                 in data["hardcoded"]]
+    return FileReport(path=path,
+                      total_strings=data["total_strings"],
+                      localized_strings=data["localized_strings"],
+                      hardcoded=hardcoded,
+                      key_usages=data["key_usages"])
+
+
+class ScanCache:
+    """On-disk FileReport cache keyed by path, mtime, size and content hash.
+
+    An entry is reused when mtime and size are unchanged. If only the mtime
+    moved (checkout, touch) the content hash decides. The whole cache is
+    dropped when the ruleset fingerprint differs.
+    """
+
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: dict[str, dict] = {}
+        self.locales: Optional[dict] = None  # {"digest": ..., "coverage": ...}
+        self.generated: dict[str, list] = {}  # path -> [mtime_ns, size, is generated]
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("fingerprint") == fingerprint:
+            self.entries = data.get("files", {})
+            self.locales = data.get("locales")
+            self.generated = data.get("generated", {})
+
+    @staticmethod
+    def _digest(filepath: Path) -> Optional[str]:
+        try:
+            return hashlib.sha256(filepath.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def lookup(self, filepath: Path) -> Optional[FileReport]:
+        key = str(filepath)
+        entry = self.entries.get(key)
+        try:
+            st = filepath.stat()
+        except OSError:
+            entry = None
+        if entry is None or entry["size"] != st.st_size:
+            self.misses += 1
+            return None
+        if entry["mtime_ns"] != st.st_mtime_ns:
+            if self._digest(filepath) != entry["sha256"]:
+                self.misses += 1
+                return None
+            entry["mtime_ns"] = st.st_mtime_ns
+            self._dirty = True
+        self.hits += 1
+        return report_from_dict(entry["report"])
+
+    def file_key(self, filepath: Path) -> Optional[dict]:
+        """Cache key of a file as it is now; take it BEFORE scanning.
+
+        Stat first, then hash, then scan: a save at any point in between
+        leaves a key that the next lookup() rejects, never an old report
+        under the new file's key.
+        """
+        try:
+            st = filepath.stat()
+        except OSError:
+            return None
+        digest = self._digest(filepath)
+        if digest is None:
+            return None
+        return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+
+    def stored_key(self, filepath: Path) -> Optional[dict]:
+        """Key under which the report of ``filepath`` was stored, if any."""
+        entry = self.entries.get(str(filepath))
+        if entry is None:
+            return None
+        return {"mtime_ns": entry["mtime_ns"], "size": entry["size"], "sha256": entry["sha256"]}
+
+    def store(self, filepath: Path, key: Optional[dict], report: FileReport):
+        """Store ``report`` under ``key`` from file_key() (None: do nothing)."""
+        if key is None:
+            return
+        self.entries[str(filepath)] = {**key, "report": report_to_dict(report)}
+        self._dirty = True
+
+    def lookup_locales(self, digest: str) -> Optional[dict]:
+        if self.locales is not None and self.locales["digest"] == digest:
+            return self.locales["coverage"]
+        return None
+
+    def store_locales(self, digest: str, coverage: dict):
+        self.locales = {"digest": digest, "coverage": coverage}
+        self._dirty = True
+
+    def lookup_generated(self, filepath: Path, st: os.stat_result) -> Optional[bool]:
+        entry = self.generated.get(str(filepath))
+        if entry is None or entry[:2] != [st.st_mtime_ns, st.st_size]:
+            return None
+        return entry[2]
+
+    def store_generated(self, filepath: Path, st: os.stat_result, generated: bool):
+        self.generated[str(filepath)] = [st.st_mtime_ns, st.st_size, generated]
+        self._dirty = True
+
+    def save(self):
+        """Write the cache atomically, dropping entries for deleted files."""
+        stale = [k for k in self.entries if not os.path.exists(k)]
+        for k in stale:
+            del self.entries[k]
+        stale_generated = [k for k in self.generated if not os.path.exists(k)]
+        for k in stale_generated:
+            del self.generated[k]
+        if not (self._dirty or stale or stale_generated):
+            return
+        data = {"fingerprint": self.fingerprint, "files": self.entries,
+                "locales": self.locales, "generated": self.generated}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"WARNING: could not write scan cache {self.path}: {e}", file=sys.stderr)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Generated files
+# ──────────────────────────────────────────────────────────────────────
+
+def is_generated_name(name: str) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in GENERATED_FILE_GLOBS)
+
+
+def has_generated_header(head: bytes) -> bool:
+    """True if the start of a file carries a generated-code comment."""
+    return GENERATED_HEADER_RE.search(head[:GENERATED_SNIFF_BYTES]) is not None
+
+
+def split_generated(files: list[Path],
+                    cache: Optional[ScanCache] = None) -> tuple[list[Path], dict]:
+    """Separate generated files from ``files``.
+
+    Returns the remaining files and ``{"files": n, "bytes": size}`` of the
+    generated ones. Only the first GENERATED_SNIFF_BYTES of a file are read,
+    and not even those when the name decides or ``cache`` still holds the
+    verdict for the file's mtime and size.
+    """
+    kept = []
+    skipped = {"files": 0, "bytes": 0}
+    for path in files:
+        try:
+            st = path.stat()
+        except OSError:
+            kept.append(path)  # reported as unreadable by the scan
+            continue
+        generated = is_generated_name(path.name)
+        if not generated:
+            cached = cache.lookup_generated(path, st) if cache is not None else None
+            if cached is None:
+                try:
+                    with open(path, "rb") as f:
+                        generated = has_generated_header(f.read(GENERATED_SNIFF_BYTES))
+                except OSError:
+                    pass
+                if cache is not None:
+                    cache.store_generated(path, st, generated)
+            else:
+                generated = cached
+        if generated:
+            skipped["files"] += 1
+            skipped["bytes"] += st.st_size
+        else:
+            kept.append(path)
+    return kept, skipped
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Partial scans — changed files / explicit file lists
+# ──────────────────────────────────────────────────────────────────────
+
+# Inclusive (first, last) line ranges; None means the whole file
+LineRanges = Optional[list[tuple[int, int]]]
+
+HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def is_scannable_rel_path(rel_path: str) -> bool:
+    """Apply the collect_dart_files() exclusions to a project-relative path."""
+    *dirs, name = rel_path.split("/")
+    return (name.endswith(".dart") and name not in SKIP_FILES
+            and not any(part in SKIP_DIRS for part in dirs))
+
+
+def is_scannable_dart_file(path: Path) -> bool:
+    """Apply the collect_dart_files() exclusions to a single path."""
+    try:
+        rel = path.resolve().relative_to(PROJECT_ROOT)
+    except ValueError:
+        return False
+    return is_scannable_rel_path(rel.as_posix())
+
+
+def _git(*args: str) -> str:
+    try:
+        proc = subprocess.run(["git", "-C", str(PROJECT_ROOT), *args],
+                              capture_output=True, text=True, encoding="utf-8")
+    except FileNotFoundError:
+        print("ERROR: git executable not found", file=sys.stderr)
+        sys.exit(2)
+    if proc.returncode != 0:
+        print(f"ERROR: git {' '.join(args)} failed:\n{proc.stderr.strip()}", file=sys.stderr)
+        sys.exit(2)
+    return proc.stdout
+
+
+def git_changed_lines(rev: str) -> dict[Path, LineRanges]:
+    """Dart files under lib/ changed since ``rev`` with their changed lines.
+
+    Compares the working tree (staged and unstaged edits) against ``rev``
+    using ``git diff -U0``. Untracked files count as changed in full.
+    Deleted files and pure deletions contribute no ranges.
+    """
+    changed: dict[Path, LineRanges] = {}
+    diff = _git("-c", "core.quotePath=false", "diff", "--relative", "-U0",
+                "--no-color", "--no-ext-diff", rev, "--", "lib")
+    current: Optional[list[tuple[int, int]]] = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:]
+            if target == "/dev/null":
+                current = None
                 continue
+            path = PROJECT_ROOT / target[2:] if target.startswith("b/") else PROJECT_ROOT / target
+            current = changed.setdefault(path, [])
+        elif line.startswith("@@") and current is not None:
+            m = HUNK_HEADER_RE.match(line)
+            if m:
+                start = int(m.group(1))
+                count = int(m.group(2)) if m.group(2) is not None else 1
+                if count > 0:
+                    current.append((start, start + count - 1))
+    untracked = _git("-c", "core.quotePath=false", "ls-files", "--others",
+                     "--exclude-standard", "--", "lib")
+    for rel in untracked.splitlines():
+        changed[PROJECT_ROOT / rel] = None
+    return {p: r for p, r in changed.items() if is_scannable_dart_file(p) and p.exists()}
+
+
+def explicit_files(paths: list[str]) -> dict[Path, LineRanges]:
+    """Resolve --files arguments, warning about anything that cannot be scanned."""
+    files: dict[Path, LineRanges] = {}
+    for name in paths:
+        path = Path(name).resolve()
+        if not path.is_file():
+            print(f"WARNING: {name}: no such file", file=sys.stderr)
+        elif not is_scannable_dart_file(path):
+            print(f"WARNING: {name}: not a scannable Dart file under {PROJECT_ROOT}",
+                  file=sys.stderr)
+        else:
+            files[path] = None
+    return files
+
+
+def restrict_to_lines(report: FileReport, ranges: LineRanges) -> FileReport:
+    """Drop findings outside ``ranges`` (in place)."""
+    if ranges is not None:
+        report.hardcoded = [e for e in report.hardcoded
+                            if any(first <= e.line <= last for first, last in ranges)]
+    return report
 
-            # Detect context and severity
-            ctx, severity = detect_context(lines, line_idx, col)
 
-            # In non-UI files, skip GENERIC context strings (likely internal)
-            # but keep explicitly detected UI contexts (could be data passed to UI)
-            if is_non_ui and ctx == StringContext.GENERIC:
-                # Exception: keep strings that contain natural language (multiple words)
-                if len(raw.split()) < 3:
-                    continue
+# ──────────────────────────────────────────────────────────────────────
+# History mode (--history)
+# ──────────────────────────────────────────────────────────────────────
 
-            # Skip GENERIC/LOW if the string looks like a format/template
-            if severity == Severity.LOW and ctx == StringContext.GENERIC:
-                # Only keep it if it looks like real words (3+ alpha chars)
-                if not re.search(r"[a-zA-Z]{3,}", raw):
+HISTORY_DB = PROJECT_ROOT / ".dart_tool" / "check_translations_history.sqlite"
+HISTORY_SCHEMA_VERSION = 1
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commits (
+    sha          TEXT PRIMARY KEY,
+    committed_at INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    commit_sha TEXT NOT NULL REFERENCES commits (sha),
+    module     TEXT NOT NULL,
+    files      INTEGER NOT NULL,
+    strings    INTEGER NOT NULL,
+    localized  INTEGER NOT NULL,
+    hardcoded  INTEGER NOT NULL,
+    critical   INTEGER NOT NULL,
+    high       INTEGER NOT NULL,
+    medium     INTEGER NOT NULL,
+    low        INTEGER NOT NULL,
+    PRIMARY KEY (commit_sha, module)
+);
+CREATE INDEX IF NOT EXISTS coverage_module ON coverage (module, commit_sha);
+CREATE INDEX IF NOT EXISTS commits_time ON commits (committed_at);
+CREATE TABLE IF NOT EXISTS blobs (
+    blob      TEXT NOT NULL,
+    path      TEXT NOT NULL,
+    strings   INTEGER NOT NULL,
+    localized INTEGER NOT NULL,
+    hardcoded INTEGER NOT NULL,
+    critical  INTEGER NOT NULL,
+    high      INTEGER NOT NULL,
+    medium    INTEGER NOT NULL,
+    low       INTEGER NOT NULL,
+    PRIMARY KEY (blob, path)
+);
+CREATE VIEW IF NOT EXISTS coverage_over_time AS
+    SELECT c.committed_at, c.sha, v.module, v.localized, v.hardcoded,
+           ROUND(100.0 * v.localized / NULLIF(v.localized + v.hardcoded, 0), 1) AS coverage_pct
+    FROM coverage v JOIN commits c ON c.sha = v.commit_sha;
+"""
+
+# Per-blob counters, in the column order of the blobs table
+BLOB_COUNTERS = ("strings", "localized", "hardcoded", "critical", "high", "medium", "low")
+_ZERO_BLOB = "0" * 40
+
+
+def history_module(rel_path: str) -> str:
+    """Feature module (lib/features/<name>) or top-level lib/ directory of a file."""
+    parts = rel_path.split("/")
+    if len(parts) > 3 and parts[1] == "features":
+        return "/".join(parts[:3])
+    return "/".join(parts[:2]) if len(parts) > 2 else parts[0]
+
+
+class GitBlobReader:
+    """One long-lived ``git cat-file --batch`` process for reading blobs."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(["git", "-C", str(PROJECT_ROOT), "cat-file", "--batch"],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, sha: str) -> Optional[bytes]:
+        self.proc.stdin.write(sha.encode("ascii") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:  # "<sha> missing"
+            return None
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def _history_path(repo_path: str, prefix: str) -> Optional[str]:
+    """Project-relative path of a scannable lib/ Dart file, else None."""
+    if not repo_path.startswith(prefix):
+        return None
+    rel = repo_path[len(prefix):]
+    return rel if rel.startswith("lib/") and is_scannable_rel_path(rel) else None
+
+
+def git_history(rev_range: str, prefix: str) -> Iterator[tuple[str, int, list[tuple[str, str]]]]:
+    """(sha, commit time, [(path, blob or None if deleted)]) for each first-parent
+    commit of ``rev_range``, oldest first.
+
+    The first commit lists its whole lib/ tree; later ones only what changed.
+    Everything comes from two git processes, however long the range.
+    """
+    log = _git("log", "--first-parent", "--reverse", "--diff-merges=first-parent",
+               "--raw", "-r", "--no-abbrev", "--no-renames", "-z",
+               "--format=%x01%H %ct", rev_range)
+    first = True
+    for record in log.split("\x01")[1:]:
+        fields = record.split("\0")
+        sha, timestamp = fields[0].split()
+        changes = []
+        if first:
+            for entry in _git("ls-tree", "-r", "-z", "--full-tree", sha).split("\0"):
+                meta, _, path = entry.partition("\t")
+                rel = _history_path(path, prefix)
+                if rel is not None and meta.split()[1] == "blob":
+                    changes.append((rel, meta.split()[2]))
+            first = False
+        else:
+            for meta, path in zip(fields[1::2], fields[2::2]):
+                rel = _history_path(path, prefix)
+                if rel is None:
                     continue
+                _, new_mode, _, new_sha, _ = meta.strip().split()
+                deleted = new_sha == _ZERO_BLOB or not new_mode.startswith("100")
+                changes.append((rel, None if deleted else new_sha))
+        yield sha, int(timestamp), changes
 
-            # Check if an existing ARB key matches
-            norm_val = re.sub(r"\s+", " ", raw.strip().lower())
-            existing_key = reverse_arb.get(norm_val)
 
-            # Also try partial matching for parameterised strings
-            if existing_key is None:
-                # Check if the raw string appears as a substring of an ARB value
-                for arb_key, arb_val in arb.items():
-                    if arb_key.startswith("@@"):
+def blob_counts(content: Optional[bytes], rel_path: str,
+                arb_index: ArbIndex) -> Optional[tuple[int, ...]]:
+    """BLOB_COUNTERS of a blob, or None if it went over FILE_TIME_BUDGET."""
+    report = FileReport(path=rel_path)
+    if content is not None and not (is_generated_name(PurePosixPath(rel_path).name)
+                                    or has_generated_header(content)):
+        report = scan_source(content, rel_path, arb_index)
+    if report.skipped:
+        return None
+    severities = [e.severity for e in report.hardcoded]
+    return (report.total_strings, report.localized_strings, len(report.hardcoded),
+            *(severities.count(sev) for sev in Severity))
+
+
+def run_history(rev_range: str, db_path: Path, arb_index: ArbIndex) -> dict:
+    """Backfill per-commit, per-module coverage for ``rev_range`` into SQLite.
+
+    Results are cached per (blob, path) in the database, so re-running over
+    an overlapping range only scans blobs it has not seen. Module counts are
+    updated incrementally from each commit's changed files. A blob that
+    goes over FILE_TIME_BUDGET counts as empty for this run and is not
+    stored, so a later run scans it again.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(HISTORY_SCHEMA)
+    # Blob results depend on the rules but not on the ARB values
+    fingerprint = f"{HISTORY_SCHEMA_VERSION}:{ruleset_fingerprint(None)}"
+    row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+    if row is None or row[0] != fingerprint:
+        conn.executescript("DELETE FROM coverage; DELETE FROM commits; DELETE FROM blobs;")
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+
+    prefix = _git("rev-parse", "--show-prefix").strip()
+    reader = GitBlobReader()
+    tree: dict[str, tuple[int, ...]] = {}        # path -> counts at the current commit
+    modules: dict[str, list[int]] = {}          # module -> [files, *BLOB_COUNTERS]
+    stats = {"commits": 0, "blobs_scanned": 0, "blobs_cached": 0, "blobs_skipped": 0}
+    placeholders = ", ".join("?" * len(BLOB_COUNTERS))
+    try:
+        with conn:
+            for sha, timestamp, changes in git_history(rev_range, prefix):
+                for rel_path, blob in changes:
+                    old = tree.pop(rel_path, None)
+                    module = modules.setdefault(history_module(rel_path), [0] * 8)
+                    if old is not None:
+                        module[0] -= 1
+                        for i, n in enumerate(old, 1):
+                            module[i] -= n
+                    if blob is None:
                         continue
-                    arb_norm = re.sub(r"\s+", " ", arb_val.strip().lower())
-                    if norm_val == arb_norm:
-                        existing_key = arb_key
-                        break
+                    counts = conn.execute(
+                        f"SELECT {', '.join(BLOB_COUNTERS)} FROM blobs WHERE blob = ? AND path = ?",
+                        (blob, rel_path)).fetchone()
+                    if counts is None:
+                        counts = blob_counts(reader.read(blob), rel_path, arb_index)
+                        if counts is None:
+                            counts = (0,) * len(BLOB_COUNTERS)
+                            stats["blobs_skipped"] += 1
+                        else:
+                            conn.execute(f"INSERT INTO blobs VALUES (?, ?, {placeholders})",
+                                         (blob, rel_path, *counts))
+                            stats["blobs_scanned"] += 1
+                    else:
+                        stats["blobs_cached"] += 1
+                    tree[rel_path] = tuple(counts)
+                    module[0] += 1
+                    for i, n in enumerate(counts, 1):
+                        module[i] += n
+                conn.execute("INSERT OR REPLACE INTO commits VALUES (?, ?)", (sha, timestamp))
+                conn.execute("DELETE FROM coverage WHERE commit_sha = ?", (sha,))
+                conn.executemany(
+                    f"INSERT INTO coverage VALUES (?, ?, ?, {placeholders})",
+                    [(sha, name, *counts) for name, counts in sorted(modules.items())
+                     if counts[0] > 0])
+                stats["commits"] += 1
+    finally:
+        reader.close()
+        conn.close()
+    return stats
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Baseline (--baseline / --write-baseline)
+# ──────────────────────────────────────────────────────────────────────
+
+BASELINE_FILE = PROJECT_ROOT / "tools" / "check_translations.baseline.json"
+BASELINE_VERSION = 1
+
+
+def line_anchor(line: str) -> str:
+    """Short hash of a source line, ignoring indentation and spacing."""
+    normalized = _WHITESPACE_RE.sub(" ", line.strip())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def finding_fingerprint(entry: HardcodedString) -> str:
+    """Line-number independent identity of a finding.
+
+    Built from the file, the context, the normalised string and the anchor
+    of the line it is on, so edits elsewhere in the file leave it intact.
+    """
+    key = "\0".join((entry.file, entry.context.name,
+                     normalize_value(entry.raw_string), entry.anchor))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:20]
+
+
+def read_baseline(path: Path) -> list[dict]:
+    """Entries of a baseline file; exits with status 2 if it is unusable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            findings = json.load(f)["findings"]
+        if not all(isinstance(e.get("fingerprint"), str) and isinstance(e.get("count"), int)
+                   for e in findings):
+            raise ValueError("malformed finding entry")
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        print(f"ERROR: cannot read baseline {path}: {e}", file=sys.stderr)
+        sys.exit(2)
+    return findings
+
+
+class Baseline:
+    """Known findings as a multiset of fingerprints.
+
+    Each occurrence in the baseline suppresses one matching finding, so a
+    string duplicated on identical lines is only covered as often as it
+    was when the baseline was written.
+    """
+
+    def __init__(self, counts: dict[str, int]):
+        self.remaining = dict(counts)
+        self.suppressed = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Baseline":
+        return cls({e["fingerprint"]: e["count"] for e in read_baseline(path)})
+
+    def filter(self, report: FileReport) -> FileReport:
+        """Drop findings covered by the baseline (in place)."""
+        new = []
+        for entry in report.hardcoded:
+            fp = finding_fingerprint(entry)
+            if self.remaining.get(fp, 0) > 0:
+                self.remaining[fp] -= 1
+                self.suppressed += 1
+            else:
+                new.append(entry)
+        report.hardcoded = new
+        return report
+
+
+def write_baseline(path: Path, reports: list[FileReport], partial: bool) -> int:
+    """Write every finding of ``reports`` as the new baseline.
+
+    After a partial scan, entries for files that were not scanned are
+    carried over from the existing baseline. Returns the number of findings
+    written.
+    """
+    entries: dict[str, dict] = {}
+    if partial and path.exists():
+        scanned = {r.path for r in reports}
+        for e in read_baseline(path):
+            if e["file"] not in scanned:
+                entries[e["fingerprint"]] = e
+    for report in reports:
+        for entry in report.hardcoded:
+            fp = finding_fingerprint(entry)
+            if fp in entries:
+                entries[fp]["count"] += 1
+            else:
+                entries[fp] = {"fingerprint": fp, "file": entry.file,
+                               "context": entry.context.name,
+                               "string": entry.raw_string, "count": 1}
+    findings = sorted(entries.values(), key=lambda e: (e["file"], e["string"], e["fingerprint"]))
+    data = {"version": BASELINE_VERSION, "findings": findings}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return sum(e["count"] for e in findings)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# ARB patch (--emit-arb-patch)
+# ──────────────────────────────────────────────────────────────────────
+
+ARB_PATCH_VERSION = 1
+ARB_KEY_MAX = 40    # same limit as suggest_key()
+
+# One piece of a Dart literal's source text (UTF-8): an escape, the opening
+# ``${`` of an interpolation or $name
+DART_STRING_PART_RE = re.compile(
+    rb"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|[\x00-\x7f]|[\xc0-\xff][\x80-\xbf]*)"
+    rb"|(\$\{)|\$([A-Za-z_]\w*)")
+DART_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v"}
+
+# Keys become getters of AppLocalizations and placeholders become parameters,
+# so neither may be a Dart reserved word
+DART_RESERVED_WORDS = frozenset("""
+    assert break case catch class const continue default do else enum extends
+    false final finally for if in is new null rethrow return super switch this
+    throw true try var void while with
+""".split())
+
+# Getters that say nothing about the value: ${items.length} is named after
+# items
+GENERIC_MEMBERS = frozenset("""
+    length first last single isEmpty isNotEmpty keys values entries
+    runtimeType hashCode
+""".split())
+_EXPR_STRING_RE = re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"")
+_MEMBER_TAIL_RE = re.compile(r"\??\.\s*([A-Za-z_]\w*)$")
+
+
+def _unescape_dart(escape: str) -> str:
+    if escape[0] in "ux":
+        return chr(int(escape[1:].strip("{}"), 16))
+    return DART_ESCAPES.get(escape, escape)
+
+
+def _value_names(code: str) -> list[str]:
+    """Identifiers of ``code`` that can name a value (no types, no keywords)."""
+    return [name for name in re.findall(r"[A-Za-z_]\w*", code)
+            if name not in DART_RESERVED_WORDS and not name.lstrip("_")[:1].isupper()]
+
+
+def _placeholder_name(expression: str) -> str:
+    """Placeholder for an interpolated expression.
+
+    Named after the value it formats: the argument of an outer call
+    (``formatter.format(date)``), else the receiver left once trailing calls,
+    index operators and GENERIC_MEMBERS are dropped (``files.join(', ')``,
+    ``price.toStringAsFixed(2)``, ``items.length``), else its last name.
+    """
+    # Blank out string literals, keeping offsets
+    code = _EXPR_STRING_RE.sub(lambda m: " " * len(m.group()), expression)
+    opener_of = {}   # end of a closing bracket -> offset of its opener
+    stack = []
+    for i, c in enumerate(code):
+        if c in "([":
+            stack.append(i)
+        elif c in ")]" and stack:
+            opener_of[i + 1] = stack.pop()
+    end = len(code)
+    outermost = True
+    while True:
+        head = code[:end].rstrip().rstrip("!").rstrip()
+        start = opener_of.get(len(head))
+        if start is not None:
+            before = code[:start].rstrip()
+            if not before:
+                # A parenthesized expression, e.g. (a ?? b).toString()
+                return _placeholder_name(expression[start + 1:len(head) - 1])
+            if not (before[-1].isalnum() or before[-1] in "_)]"):
+                break        # an operand, e.g. size / (1024 * 1024)
+            if outermost and code[start] == "(" and _value_names(code[start + 1:len(head) - 1]):
+                return _placeholder_name(expression[start + 1:len(head) - 1])
+            end = len(before)
+            tail = _MEMBER_TAIL_RE.search(before)
+            if tail is not None and before[:tail.start()].strip():
+                end = tail.start()   # a method call: name it after the receiver
+        else:
+            tail = _MEMBER_TAIL_RE.search(head)
+            if tail is None or tail.group(1) not in GENERIC_MEMBERS or tail.start() == 0:
+                break
+            end = tail.start()
+        outermost = False
+    names = _value_names(code[:end]) or _value_names(code)
+    name = names[-1].lstrip("_") if names else ""
+    return name if name and name.isascii() else "value"
+
+
+def arb_message(raw: str) -> tuple[str, list[str]]:
+    """ARB message for a Dart literal and the names of its placeholders.
+
+    Escapes are resolved and every interpolation becomes a ``{placeholder}``
+    named after the expression; the same expression reuses its placeholder.
+    """
+    src = raw.encode("utf-8")
+    out, names, by_expr = [], [], {}
+    pos = 0
+    while True:
+        m = DART_STRING_PART_RE.search(src, pos)
+        if m is None:
+            break
+        out.append(src[pos:m.start()].decode("utf-8"))
+        pos = m.end()
+        if m.group(1) is not None:
+            out.append(_unescape_dart(m.group(1).decode("utf-8")))
+            continue
+        if m.group(2) is not None:
+            end = _interpolation_end(src, pos)
+            if end < 0:
+                out.append(src[m.start():].decode("utf-8"))
+                pos = len(src)
+                break
+            expr = src[pos:end].decode("utf-8").strip()
+            pos = end + 1
+        else:
+            expr = m.group(3).decode("utf-8")
+        if expr not in by_expr:
+            base = name = _placeholder_name(expr)
+            n = 1
+            while name in names or name in DART_RESERVED_WORDS:
+                n += 1
+                name = f"{base}{n}"
+            by_expr[expr] = name
+            names.append(name)
+        out.append("{" + by_expr[expr] + "}")
+    out.append(src[pos:].decode("utf-8"))
+    return "".join(out), names
+
+
+def arb_group_value(message: str) -> str:
+    """Grouping key of a message: normalised, with placeholders as slots."""
+    return normalize_value(ARB_PLACEHOLDER_RE.sub(TEMPLATE_SLOT, message))
+
+
+def new_arb_key(message: str, taken: set[str]) -> str:
+    """A key for ``message`` that is a valid getter name and not in ``taken``.
+
+    Based on suggest_key() of the message text; clashes, including two
+    messages truncated to the same prefix, get a numeric suffix.
+    """
+    # Keys are ASCII identifiers: 'Über uns' -> uberUns
+    text = unicodedata.normalize("NFKD", ARB_PLACEHOLDER_RE.sub(" ", message))
+    base = re.sub(r"[^A-Za-z0-9]", "", suggest_key(text)) or "untranslated"
+    if not base[0].isalpha():
+        base = "text" + base
+    base = base[:ARB_KEY_MAX]
+    key, n = base, 1
+    while key in taken or key in DART_RESERVED_WORDS:
+        n += 1
+        key = base[:ARB_KEY_MAX - len(str(n))] + str(n)
+    return key
+
+
+def arb_patch_sources_path(path: Path) -> Path:
+    """Sidecar of an ARB patch that maps its keys to source locations."""
+    return path.with_name(path.stem + ".sources.json")
+
+
+def build_arb_patch(reports: Iterable[FileReport], arb_keys: Iterable[str],
+                    severity_filter: Optional[str] = None) -> list[dict]:
+    """Group findings without an ARB key by message and give each group a key.
 
-            entry = HardcodedString(
-                file=rel_path,
-                line=line_no,
-                column=col + 1,
-                raw_string=raw,
-                context=ctx,
-                severity=severity,
-                existing_key=existing_key,
-                suggested_key=existing_key or suggest_key(raw),
-            )
-            report.hardcoded.append(entry)
+    Findings are grouped by normalised value, with interpolations as slots,
+    so 'Cancel' in thirty files becomes one entry. The most frequent
+    spelling is the message; larger groups pick their keys first. Returns
+    the groups ordered by key.
+    """
+    groups: dict[str, list] = {}
+    for report in reports:
+        for entry in filter_entries(report.hardcoded, severity_filter):
+            if entry.existing_key:
+                continue
+            message, names = arb_message(entry.raw_string)
+            groups.setdefault(arb_group_value(message), []).append((entry, message, names))
+
+    taken = set(arb_keys)
+    patch = []
+    for value, members in sorted(groups.items(), key=lambda g: (-len(g[1]), g[0])):
+        members.sort(key=lambda m: (m[0].file, m[0].line, m[0].column))
+        spellings: dict[str, int] = {}
+        for _, message, _ in members:
+            spellings[message] = spellings.get(message, 0) + 1
+        message = max(spellings, key=spellings.get)  # first seen wins ties
+        names = next(n for _, m, n in members if m == message)
+        key = new_arb_key(message, taken)
+        taken.add(key)
+        patch.append({
+            "key": key,
+            "message": message,
+            "placeholders": names,
+            "occurrences": [{"file": e.file, "line": e.line, "column": e.column,
+                             "string": e.raw_string, "context": e.context.value,
+                             "severity": e.severity.value} for e, _, _ in members],
+        })
+    patch.sort(key=lambda g: g["key"])
+    return patch
+
+
+def write_arb_patch(path: Path, reports: Iterable[FileReport], arb_keys: Iterable[str],
+                    severity_filter: Optional[str] = None) -> tuple[int, int]:
+    """Write an ARB fragment with one entry per group of findings, plus its
+    sources sidecar (see arb_patch_sources_path).
+
+    The fragment can be merged into app_en.arb as is; interpolated messages
+    get ``@key`` placeholder metadata in the style of the existing entries.
+    Returns (keys written, findings covered).
+    """
+    patch = build_arb_patch(reports, arb_keys, severity_filter)
+    arb: dict[str, object] = {}
+    for group in patch:
+        arb[group["key"]] = group["message"]
+        if group["placeholders"]:
+            arb["@" + group["key"]] = {
+                "placeholders": {name: {"type": "String"} for name in group["placeholders"]}
+            }
+    sources = {
+        "version": ARB_PATCH_VERSION,
+        "groups": [{"key": g["key"], "message": g["message"], "count": len(g["occurrences"]),
+                    "occurrences": g["occurrences"]} for g in patch],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(arb, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    arb_patch_sources_path(path).write_text(
+        json.dumps(sources, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return len(patch), sum(len(g["occurrences"]) for g in patch)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Sharding (--shard / --merge)
+# ──────────────────────────────────────────────────────────────────────
 
+def parse_shard(value: str) -> tuple[int, int]:
+    """``i/N`` with 1 <= i <= N."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got {value!r}")
+    return index, count
+
+
+def shard_files(files: list[Path], index: int, count: int) -> list[Path]:
+    """Files of shard ``index`` (1-based) of ``count``, balanced by size.
+
+    Greedy longest-processing-time assignment: largest file first, each to
+    the currently lightest shard. Ties are broken by project-relative path
+    and shard number, so every runner computes the same partition from the
+    same checkout. The shard's files keep their order in ``files``.
+    """
+    loads = [(0, i) for i in range(count)]
+    chosen = set()
+    for size, rel_path, path in sorted((-_file_size(f), f.relative_to(PROJECT_ROOT).as_posix(), f)
+                                       for f in files):
+        load, shard = heapq.heappop(loads)
+        if shard == index - 1:
+            chosen.add(path)
+        heapq.heappush(loads, (load - size, shard))
+    return [f for f in files if f in chosen]
+
+
+def _load_shard_report(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        if "shard" not in report["summary"]:
+            raise ValueError("no shard in summary")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"ERROR: {path} is not a JSON report written with --shard: {e}", file=sys.stderr)
+        sys.exit(2)
     return report
 
 
+def merge_shard_reports(paths: list[str]) -> dict:
+    """Combine the JSON reports of all shards into the single-run JSON report.
+
+    Shards must all be present exactly once and share a scope. Summary
+    counters are summed; key usage is re-derived from the summed counts.
+    """
+    shards = [_load_shard_report(p) for p in paths]
+    count = shards[0]["summary"]["shard"]["count"]
+    indices = sorted(s["summary"]["shard"]["index"] for s in shards)
+    if indices != list(range(1, count + 1)) or any(
+            s["summary"]["shard"]["count"] != count for s in shards):
+        print(f"ERROR: expected shards 1..{count} exactly once, got {indices}", file=sys.stderr)
+        sys.exit(2)
+    scopes = {s["summary"]["scope"] for s in shards}
+    if len(scopes) != 1:
+        print(f"ERROR: shards were scanned with different scopes: {sorted(scopes)}",
+              file=sys.stderr)
+        sys.exit(2)
+    scope = scopes.pop()
+    partial = scope != "full scan of lib/"
+
+    files = sorted((f for s in shards for f in s["files"]),
+                   key=lambda f: PurePosixPath(f["path"]).parts)
+    summary = {
+        "partial": partial,
+        "scope": scope,
+        "files_scanned": sum(s["summary"]["files_scanned"] for s in shards),
+        "files_with_issues": sum(s["summary"]["files_with_issues"] for s in shards),
+        "total_localized": sum(s["summary"]["total_localized"] for s in shards),
+        "total_hardcoded": sum(s["summary"]["total_hardcoded"] for s in shards),
+        "with_existing_key": sum(s["summary"]["with_existing_key"] for s in shards),
+        "by_severity": {sev.value: sum(s["summary"]["by_severity"][sev.value] for s in shards)
+                        for sev in Severity},
+    }
+    summary["estimated_coverage"] = coverage_pct(
+        summary["total_localized"], summary["total_localized"] + summary["total_hardcoded"])
+    summary["skipped"] = sorted((f for s in shards for f in s["summary"]["skipped"]),
+                                key=lambda f: PurePosixPath(f["path"]).parts)
+    if "generated_skipped" in shards[0]["summary"]:
+        # Generated files are set aside before sharding, so all shards agree
+        summary["generated_skipped"] = shards[0]["summary"]["generated_skipped"]
+    output = {"files": files, "summary": summary}
+
+    if all("key_usage" in s for s in shards):
+        usage_counts: dict[str, int] = {}
+        undefined: dict[str, dict] = {}
+        for s in shards:
+            for key, n in s["key_usage"]["usage_counts"].items():
+                usage_counts[key] = usage_counts.get(key, 0) + n
+            for key, info in s["key_usage"]["undefined"].items():
+                merged = undefined.setdefault(key, {"references": 0, "files": []})
+                merged["references"] += info["references"]
+                merged["files"] = sorted(set(merged["files"]) | set(info["files"]))
+        output["key_usage"] = {
+            "keys_defined": len(usage_counts),
+            "keys_referenced": sum(1 for n in usage_counts.values() if n),
+            "references": sum(usage_counts.values()),
+            "unused": None if partial else [k for k, n in usage_counts.items() if not n],
+            "undefined": dict(sorted(undefined.items())),
+            "usage_counts": usage_counts,
+        }
+    if "locale_coverage" in shards[0]:
+        # Locale coverage does not depend on the files scanned
+        output["locale_coverage"] = shards[0]["locale_coverage"]
+    return output
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Profiling (--profile)
+# ──────────────────────────────────────────────────────────────────────
+
+# Phases in report order; read, context and arb_match are part of scan.
+PROFILE_PHASES = {
+    "arb_load": "ARB load",
+    "locales": "Locale coverage",
+    "walk": "File walk",
+    "scan": "Scan (total)",
+    "read": "  read",
+    "context": "  context detection",
+    "arb_match": "  ARB matching",
+    "similar": "Similar-key scoring",
+    "render": "Rendering",
+}
+
+
+@dataclass
+class RuleStats:
+    rule: str
+    evaluations: int = 0
+    hits: int = 0
+    seconds: float = 0.0
+
+
+def describe_context_rule(rule: ContextRule) -> str:
+    fields = ("call", "arg", "outer_arg", "outer_call", "ancestor", "keyword")
+    where = " ".join(f"{f}={getattr(rule, f)}" for f in fields if getattr(rule, f))
+    return f"{rule.context.name} {where}"
+
+
+class Profiler:
+    """Phase timers, per-rule counters and per-file timings for --profile.
+
+    Rules are evaluated one at a time in declaration order, stopping at the
+    first hit, so ``hits`` is how often a rule decided the outcome: a rule
+    with no hits can be removed without changing any result. Profiling
+    runs serially and without the scan cache; value-cached checks are
+    counted once per distinct value, as in a normal run.
+    """
+
+    def __init__(self):
+        self.phases = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self.rules = {
+            "false_positive": [RuleStats(p) for p in RULES.false_positive],
+            "technical": [RuleStats(p) for p in RULES.technical],
+            "context": [RuleStats(describe_context_rule(r)) for r in RULES.context],
+        }
+        self._patterns = {
+            "false_positive": [re.compile(p).search for p in RULES.false_positive],
+            "technical": [re.compile(p).match for p in RULES.technical],
+        }
+        self.files: list[tuple[float, str]] = []
+        # Start cold so the counters cover every evaluation of this run
+        is_ignored_value.cache_clear()
+        RULES.context_rules.callee_bits.cache_clear()
+
+    def timed(self, phase: str, fn, *args, **kwargs):
+        t0 = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.phases[phase] += perf_counter() - t0
+
+    def record(self, group: str, index: int, hit: bool, seconds: float):
+        stats = self.rules[group][index]
+        stats.evaluations += 1
+        stats.hits += hit
+        stats.seconds += seconds
+
+    def charge(self, group: str, index: int, seconds: float):
+        self.rules[group][index].seconds += seconds
+
+    def first_match(self, group: str, text: str) -> bool:
+        """Evaluate a pattern group rule by rule; True on the first hit."""
+        for i, matcher in enumerate(self._patterns[group]):
+            t0 = perf_counter()
+            hit = matcher(text) is not None
+            self.record(group, i, hit, perf_counter() - t0)
+            if hit:
+                return True
+        return False
+
+    def scan_file(self, filepath: Path, arb_index: ArbIndex) -> FileReport:
+        t0 = perf_counter()
+        report = scan_file(filepath, arb_index)
+        elapsed = perf_counter() - t0
+        self.phases["scan"] += elapsed
+        self.files.append((elapsed, str(filepath.relative_to(PROJECT_ROOT))))
+        return report
+
+    def to_dict(self, top: int) -> dict:
+        return {
+            "phases": {name: round(secs, 6) for name, secs in self.phases.items()},
+            "files_scanned": len(self.files),
+            "rules": {group: [{"index": i, **asdict(s), "seconds": round(s.seconds, 6)}
+                              for i, s in enumerate(stats)]
+                      for group, stats in self.rules.items()},
+            "slowest_files": [{"path": path, "seconds": round(secs, 6)}
+                              for secs, path in sorted(self.files, reverse=True)[:top]],
+        }
+
+    def print_table(self, top: int, out=sys.stderr):
+        def w(line: str = ""):
+            print(line, file=out)
+
+        w("=" * 80)
+        w("  PROFILE")
+        w("=" * 80)
+        w()
+        for name, label in PROFILE_PHASES.items():
+            w(f"  {label:<24} {self.phases[name] * 1000:>10.1f} ms")
+        for group, stats in self.rules.items():
+            w()
+            w(f"  {group} rules (by cumulative time)")
+            w(f"  {'#':>3} {'evals':>8} {'hits':>7} {'ms':>9}  rule")
+            ranked = sorted(enumerate(stats), key=lambda e: -e[1].seconds)
+            for i, s in ranked:
+                rule = s.rule if len(s.rule) <= 48 else s.rule[:45] + "..."
+                dead = "  (never hit)" if not s.hits else ""
+                w(f"  {i:>3} {s.evaluations:>8} {s.hits:>7} {s.seconds * 1000:>9.2f}  {rule}{dead}")
+        w()
+        w(f"  Slowest files (of {len(self.files)})")
+        for secs, path in sorted(self.files, reverse=True)[:top]:
+            w(f"  {secs * 1000:>9.2f} ms  {path}")
+        w()
+        w("=" * 80)
+
+
+# Set by main() for --profile; the hot paths check it before recording.
+PROFILER: Optional[Profiler] = None
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Server mode (--serve)
+# ──────────────────────────────────────────────────────────────────────
+
+# JSON-RPC 2.0 error codes
+RPC_PARSE_ERROR = -32700
+RPC_INVALID_REQUEST = -32600
+RPC_METHOD_NOT_FOUND = -32601
+RPC_INVALID_PARAMS = -32602
+RPC_INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class ScanServer:
+    """JSON-RPC 2.0 over stdio, one JSON message per line.
+
+    Keeps the ARB index, the n-gram index and per-file reports warm between
+    requests. Methods (params in parentheses):
+
+    scanFile    (path, severity?)           report of the file on disk; reused
+                                            while its mtime and size are unchanged
+    scanBuffer  (path, content, severity?)  report of unsaved editor contents
+    reloadArb   ()                          re-read app_en.arb, drop stored reports
+    shutdown    ()                          reply, then stop serving
+
+    Reports have the shape of a ``files`` entry of the JSON report. Files
+    the CLI scan leaves out (SKIP_DIRS, SKIP_FILES, generated code) get no
+    findings and a ``skipped`` reason instead. The optional ``severity`` is
+    CRITICAL/HIGH/MEDIUM/LOW, or "NO_LOW".
+    """
+
+    def __init__(self, similar_top: int = SIMILAR_TOP_K,
+                 similar_threshold: float = SIMILARITY_THRESHOLD):
+        self.similar_top = similar_top
+        self.similar_threshold = similar_threshold
+        self.reports: dict[Path, tuple[int, int, FileReport]] = {}
+        self.running = True
+        self.methods = {
+            "scanFile": self.scan_file,
+            "scanBuffer": self.scan_buffer,
+            "reloadArb": self.reload_arb,
+            "shutdown": self.shutdown,
+        }
+        self.reload_arb({})
+
+    def reload_arb(self, params: dict) -> dict:
+        arb = load_arb_strings(ARB_FILE)
+        self.arb_index = build_arb_index(arb)
+        self.ngrams = NgramIndex(arb) if self.similar_top > 0 else None
+        self.reports.clear()
+        return {"keys": len(arb)}
+
+    def shutdown(self, params: dict) -> None:
+        self.running = False
+        return None
+
+    @staticmethod
+    def _path(params: dict) -> tuple[Path, str]:
+        raw = params.get("path")
+        if not isinstance(raw, str) or not raw:
+            raise RpcError(RPC_INVALID_PARAMS, "'path' must be a non-empty string")
+        path = Path(raw)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        path = path.resolve()
+        try:
+            return path, str(path.relative_to(PROJECT_ROOT))
+        except ValueError:
+            raise RpcError(RPC_INVALID_PARAMS, f"{raw} is outside {PROJECT_ROOT}") from None
+
+    @staticmethod
+    def _severity_filter(params: dict) -> Optional[str]:
+        severity = params.get("severity")
+        if severity is None:
+            return None
+        if severity == "NO_LOW":
+            return "__NO_LOW__"
+        if severity not in Severity.__members__:
+            raise RpcError(RPC_INVALID_PARAMS, f"unknown severity {severity!r}")
+        return severity
+
+    def _result(self, report: FileReport, params: dict) -> dict:
+        result = file_to_json(report, filter_entries(report.hardcoded,
+                                                     self._severity_filter(params)))
+        if report.skipped:
+            result["skipped"] = report.skipped
+        return result
+
+    def _finish(self, report: FileReport) -> FileReport:
+        if self.ngrams is not None:
+            self.ngrams.attach([report], self.similar_top, self.similar_threshold)
+        return report
+
+    def scan_file(self, params: dict) -> dict:
+        path, rel_path = self._path(params)
+        try:
+            st = path.stat()
+        except OSError as e:
+            raise RpcError(RPC_INVALID_PARAMS, f"cannot read {rel_path}: {e.strerror}") from None
+        stored = self.reports.get(path)
+        if stored is not None and stored[:2] == (st.st_mtime_ns, st.st_size):
+            report = stored[2]
+        else:
+            if not is_scannable_dart_file(path):
+                report = FileReport(path=rel_path, skipped=SKIPPED_EXCLUDED)
+            elif not split_generated([path])[0]:
+                report = FileReport(path=rel_path, skipped=SKIPPED_GENERATED)
+            else:
+                report = self._finish(scan_file(path, self.arb_index))
+            self.reports[path] = (st.st_mtime_ns, st.st_size, report)
+        return self._result(report, params)
+
+    def scan_buffer(self, params: dict) -> dict:
+        _, rel_path = self._path(params)
+        content = params.get("content")
+        if not isinstance(content, str):
+            raise RpcError(RPC_INVALID_PARAMS, "'content' must be a string")
+        if not is_scannable_rel_path(rel_path):
+            report = FileReport(path=rel_path, skipped=SKIPPED_EXCLUDED)
+        elif (is_generated_name(rel_path.rsplit("/", 1)[-1])
+              or has_generated_header(content[:GENERATED_SNIFF_BYTES].encode("utf-8"))):
+            report = FileReport(path=rel_path, skipped=SKIPPED_GENERATED)
+        else:
+            report = self._finish(scan_source(content, rel_path, self.arb_index))
+        return self._result(report, params)
+
+    def handle(self, message: str) -> Optional[dict]:
+        """Response to one request line; None for notifications."""
+        request_id = None
+        notification = False
+        try:
+            try:
+                request = json.loads(message)
+            except ValueError as e:
+                raise RpcError(RPC_PARSE_ERROR, f"invalid JSON: {e}") from None
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise RpcError(RPC_INVALID_REQUEST, "expected a JSON-RPC request object")
+            request_id = request.get("id")
+            notification = "id" not in request
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise RpcError(RPC_METHOD_NOT_FOUND, f"unknown method {request['method']!r}")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise RpcError(RPC_INVALID_PARAMS, "params must be an object")
+            result = method(params)
+            if notification:
+                return None
+            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RpcError as e:
+            error = {"code": e.code, "message": e.message}
+        except Exception as e:  # keep serving; the editor gets the error
+            error = {"code": RPC_INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}
+        if notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+    def serve(self, stdin=sys.stdin, stdout=sys.stdout):
+        for line in stdin:
+            if not line.strip():
+                continue
+            response = self.handle(line)
+            if response is not None:
+                stdout.write(json.dumps(response, ensure_ascii=False) + "\n")
+                stdout.flush()
+            if not self.running:
+                break
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Watch mode (--watch)
+# ──────────────────────────────────────────────────────────────────────
+
+WATCH_DEBOUNCE = 0.5  # seconds without further changes before rescanning
+
+Snapshot = dict[Path, tuple[int, int]]  # path -> (mtime_ns, size)
+
+
+def watch_snapshot(cache: Optional[ScanCache] = None) -> Snapshot:
+    snapshot = {}
+    files, _ = split_generated(collect_dart_files(LIB_DIR), cache)
+    for path in files + [ARB_FILE]:
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        snapshot[path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def print_watch_summary(reports: list[FileReport], severity_filter: Optional[str],
+                        changes: list[str]):
+    totals = StreamTotals()
+    for report in reports:
+        totals.add(report, filter_entries(report.hardcoded, severity_filter))
+    total_ui = totals.total_localized + totals.total_hardcoded
+    coverage = f"{totals.total_localized / total_ui * 100:.1f}%" if total_ui else "n/a"
+    by_severity = "  ".join(f"{sev}: {n}" for sev, n in totals.severity_counts.items())
+    print(f"[{datetime.now():%H:%M:%S}] {totals.files_scanned} files, "
+          f"{totals.files_with_issues} with issues, {totals.total_hardcoded} hardcoded "
+          f"({totals.with_existing_key} with an ARB key), coverage {coverage}")
+    print(f"           {by_severity}")
+    for change in changes:
+        print(f"           {change}")
+    sys.stdout.flush()
+
+
+def watch(arb_index: ArbIndex, severity_filter: Optional[str], jobs: int = 1,
+          cache: Optional[ScanCache] = None, similar_top: int = SIMILAR_TOP_K,
+          similar_threshold: float = SIMILARITY_THRESHOLD, interval: float = 1.0):
+    """Poll lib/ and app_en.arb, keeping the report up to date until Ctrl-C.
+
+    Changed Dart files are rescanned; an ARB change only redoes the ARB
+    matching of the findings already known. Bursts of saves are collected
+    until nothing has changed for WATCH_DEBOUNCE seconds.
+    """
+    arb = load_arb_strings(ARB_FILE)
+    ngrams = NgramIndex(arb) if similar_top > 0 else None
+
+    def attach(reports: list[FileReport]):
+        if ngrams is not None:
+            ngrams.attach(reports, similar_top, similar_threshold)
+
+    snapshot = watch_snapshot(cache)
+    files = [p for p in snapshot if p != ARB_FILE]
+    reports = dict(zip(files, iter_scan_files(files, arb_index, jobs, cache)))
+    attach(list(reports.values()))
+    print_watch_summary(list(reports.values()), severity_filter, ["initial scan"])
+
+    try:
+        while True:
+            sleep(interval)
+            current = watch_snapshot(cache)
+            if current == snapshot:
+                continue
+            # Debounce: wait for the burst of saves to settle
+            while True:
+                sleep(WATCH_DEBOUNCE)
+                settled = watch_snapshot(cache)
+                if settled == current:
+                    break
+                current = settled
+
+            changed = [p for p in current if p != ARB_FILE and current[p] != snapshot.get(p)]
+            removed = [p for p in snapshot if p != ARB_FILE and p not in current]
+            arb_changed = current.get(ARB_FILE) != snapshot.get(ARB_FILE)
+            snapshot = current
+            notes = []
+
+            if arb_changed:
+                arb = load_arb_strings(ARB_FILE)
+                arb_index = build_arb_index(arb)
+                ngrams = NgramIndex(arb) if similar_top > 0 else None
+                old_cache = cache
+                if cache is not None:
+                    cache = ScanCache(CACHE_FILE, ruleset_fingerprint(ARB_FILE))
+                for path, report in reports.items():
+                    if path in changed:
+                        continue
+                    for entry in report.hardcoded:
+                        match_arb(entry, arb_index)
+                    if cache is not None:
+                        # Same file contents as when scanned: keep its key
+                        cache.store(path, old_cache.stored_key(path), report)
+                notes.append(f"{ARB_FILE.name} changed: re-matched {len(reports)} files")
+
+            for path in removed:
+                del reports[path]
+                notes.append(f"removed {path.relative_to(PROJECT_ROOT)}")
+            if changed:
+                rescanned = list(iter_scan_files(changed, arb_index, jobs, cache))
+                for path, report in zip(changed, rescanned):
+                    reports[path] = report
+                    notes.append(f"rescanned {report.path}: {len(report.hardcoded)} hardcoded")
+            elif cache is not None:
+                cache.save()
+
+            # Keep the walk order so the summary does not depend on history
+            reports = {p: reports[p] for p in current if p in reports}
+            attach(list(reports.values()) if arb_changed
+                   else [reports[p] for p in changed])
+            print_watch_summary(list(reports.values()), severity_filter, notes)
+    except KeyboardInterrupt:
+        if cache is not None:
+            cache.save()
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Main driver
 # ──────────────────────────────────────────────────────────────────────
@@ -568,13 +3078,310 @@ def collect_dart_files(lib_dir: Path) -> list[Path]:
     return sorted(files)
 
 
-def print_text_report(reports: list[FileReport], severity_filter: Optional[str] = None):
-    """Pretty-print the report to stdout."""
-    total_hardcoded = 0
-    total_localized = 0
-    total_with_existing_key = 0
-    files_with_issues = 0
-    severity_counts = {s: 0 for s in Severity}
+def parse_jobs(value: str) -> int:
+    """argparse type for --jobs: a positive integer or 'auto' (all CPUs)."""
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer or 'auto', got {value!r}")
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("--jobs must be at least 1")
+    return jobs
+
+
+# Per-worker state for parallel scans. The ARB index and the ruleset are
+# installed once per worker process by the pool initializer instead of being
+# pickled with every file; the ruleset travels in its validated form and is
+# compiled in the worker.
+_worker_arb_index: Optional[ArbIndex] = None
+
+
+def _init_worker(arb_index: ArbIndex, rules: dict, digest: str, budget: float):
+    global _worker_arb_index, FILE_TIME_BUDGET
+    _worker_arb_index = arb_index
+    FILE_TIME_BUDGET = budget
+    if RULES is None or digest != RULES.digest:
+        set_ruleset(Ruleset(rules, digest))
+
+
+def _scan_in_worker(filepath: Path) -> FileReport:
+    return scan_file(filepath, _worker_arb_index)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def iter_scan_files(files: list[Path], arb_index: ArbIndex, jobs: int = 1,
+                    cache: Optional[ScanCache] = None) -> Iterator[FileReport]:
+    """Scan files serially or in a process pool, yielding reports in input order.
+
+    Each report is yielded as soon as it and all reports before it are
+    done, so output can be streamed while later files are still scanning.
+    Files whose cache entry is still valid are not read or scanned at all.
+    """
+    cached = [cache.lookup(f) if cache is not None else None for f in files]
+    pending = [i for i, report in enumerate(cached) if report is None]
+    keys: dict[int, Optional[dict]] = {}
+
+    def take_key(i: int):
+        # Before the scan reads the file, see ScanCache.file_key
+        if cache is not None:
+            keys[i] = cache.file_key(files[i])
+
+    def finish(i: int, report: FileReport) -> FileReport:
+        # A file skipped for time may well finish next run: never cache that
+        if cache is not None and cached[i] is None and not report.skipped:
+            cache.store(files[i], keys.pop(i, None), report)
+        return report
+
+    if jobs <= 1 or len(pending) < 2:
+        scan = scan_file if PROFILER is None else PROFILER.scan_file
+        for i, f in enumerate(files):
+            if cached[i] is not None:
+                yield cached[i]
+                continue
+            take_key(i)
+            yield finish(i, scan(f, arb_index))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending)),
+                                 initializer=_init_worker,
+                                 initargs=(arb_index, RULES.data, RULES.digest,
+                                           FILE_TIME_BUDGET)) as pool:
+            # Largest files first so a single big file does not end up as the
+            # tail that keeps the whole pool waiting.
+            futures = {}
+            for i in sorted(pending, key=lambda i: (-_file_size(files[i]), i)):
+                take_key(i)
+                futures[i] = pool.submit(_scan_in_worker, files[i])
+            for i in range(len(files)):
+                yield finish(i, cached[i] or futures[i].result())
+
+    if cache is not None:
+        cache.save()
+
+
+def scan_files(files: list[Path], arb_index: ArbIndex, jobs: int = 1,
+               cache: Optional[ScanCache] = None) -> list[FileReport]:
+    """Scan files serially or in a process pool, preserving input order."""
+    return list(iter_scan_files(files, arb_index, jobs, cache))
+
+
+def filter_entries(entries: list[HardcodedString],
+                   severity_filter: Optional[str]) -> list[HardcodedString]:
+    if severity_filter == "__NO_LOW__":
+        return [e for e in entries if e.severity != Severity.LOW]
+    if severity_filter:
+        return [e for e in entries if e.severity.value == severity_filter]
+    return entries
+
+
+def finding_to_json(entry: HardcodedString) -> dict:
+    return {
+        "line": entry.line,
+        "column": entry.column,
+        "string": entry.raw_string,
+        "context": entry.context.value,
+        "severity": entry.severity.value,
+        "existing_key": entry.existing_key,
+        "other_keys": entry.other_keys,
+        "suggested_key": entry.suggested_key,
+        "similar_keys": [{"key": key, "score": score} for key, score in entry.similar_keys],
+        "fingerprint": finding_fingerprint(entry),
+    }
+
+
+def file_to_json(report: FileReport, entries: list[HardcodedString]) -> dict:
+    return {
+        "path": report.path,
+        "localized_usages": report.localized_strings,
+        "hardcoded": [finding_to_json(e) for e in entries],
+    }
+
+
+class StreamTotals:
+    """Summary counters accumulated while reports stream past.
+
+    Every printer feeds each report through ``add`` as it goes, so the
+    summary never needs a second pass over the findings.
+    """
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.files_with_issues = 0
+        self.total_localized = 0
+        self.total_hardcoded = 0
+        self.with_existing_key = 0
+        self.severity_counts = {s.value: 0 for s in Severity}
+        self.skipped: list[dict] = []
+
+    def add(self, report: FileReport, entries: list[HardcodedString]) -> list[HardcodedString]:
+        """Count a file and its (already filtered) findings; returns ``entries``."""
+        self.files_scanned += 1
+        if report.skipped:
+            self.skipped.append({"path": report.path, "reason": report.skipped})
+        if entries:
+            self.files_with_issues += 1
+            self.total_localized += report.localized_strings
+            self.total_hardcoded += len(entries)
+            counts = self.severity_counts
+            for e in entries:
+                counts[e.severity.value] += 1
+                if e.existing_key:
+                    self.with_existing_key += 1
+        return entries
+
+    def summary(self, scope: Optional[str], shard: Optional[tuple[int, int]] = None,
+                generated: Optional[dict] = None) -> dict:
+        total_ui = self.total_localized + self.total_hardcoded
+        summary = {
+            "partial": scope is not None or shard is not None,
+            "scope": scope or "full scan of lib/",
+            "files_scanned": self.files_scanned,
+            "files_with_issues": self.files_with_issues,
+            "total_localized": self.total_localized,
+            "total_hardcoded": self.total_hardcoded,
+            "with_existing_key": self.with_existing_key,
+            "by_severity": self.severity_counts,
+            "estimated_coverage": coverage_pct(self.total_localized, total_ui),
+            "skipped": self.skipped,
+        }
+        if generated is not None:
+            summary["generated_skipped"] = generated
+        if shard is not None:
+            summary["shard"] = {"index": shard[0], "count": shard[1]}
+        return summary
+
+
+def coverage_pct(localized: int, total_ui: int) -> Optional[float]:
+    """The text report's coverage estimate, rounded as it is printed."""
+    return round(localized / total_ui * 100, 1) if total_ui else None
+
+
+class KeyUsageIndex:
+    """Inverted index of l10n key references, merged from per-file usages."""
+
+    def __init__(self, arb_keys: Iterable[str]):
+        self.counts = dict.fromkeys(sorted(arb_keys), 0)
+        self.undefined: dict[str, dict[str, int]] = {}  # key -> {file: references}
+
+    def add(self, report: FileReport):
+        for key, n in report.key_usages.items():
+            if key in self.counts:
+                self.counts[key] += n
+            else:
+                self.undefined.setdefault(key, {})[report.path] = n
+
+    def summary(self, scope: Optional[str], shard: Optional[tuple[int, int]] = None) -> dict:
+        return {
+            "keys_defined": len(self.counts),
+            "keys_referenced": sum(1 for n in self.counts.values() if n),
+            "references": sum(self.counts.values()),
+            # A key unused in a partial scan may be used elsewhere
+            "unused": (None if scope or shard
+                       else [k for k, n in self.counts.items() if not n]),
+            "undefined": {key: {"references": sum(files.values()), "files": sorted(files)}
+                          for key, files in sorted(self.undefined.items())},
+            "usage_counts": self.counts,
+        }
+
+
+def print_key_usage(usage: dict, top: Optional[int] = None):
+    """Text section for a KeyUsageIndex summary.
+
+    Lists the unused keys and the ``top`` (default KEY_USAGE_TOP) most
+    referenced ones; 0 lists the reference count of every key.
+    """
+    if top is None:
+        top = KEY_USAGE_TOP
+    print("=" * 80)
+    print("  ARB KEY USAGE")
+    print("=" * 80)
+    print()
+    print(f"  Keys defined:             {usage['keys_defined']}")
+    print(f"  Keys referenced:          {usage['keys_referenced']} "
+          f"({usage['references']} references)")
+    print()
+    if usage["unused"] is None:
+        print("  Unused keys:              n/a (partial scan)")
+    else:
+        print(f"  Unused keys:              {len(usage['unused'])}")
+        for key in usage["unused"]:
+            print(f"    {key}")
+    print()
+    print(f"  Referenced but undefined: {len(usage['undefined'])}")
+    for key, info in usage["undefined"].items():
+        print(f"    {key}  ({info['references']}x in {', '.join(info['files'])})")
+    print()
+    ranked = sorted(usage["usage_counts"].items(), key=lambda kv: (-kv[1], kv[0]))
+    if top:
+        ranked = [kv for kv in ranked[:top] if kv[1]]
+    if ranked:
+        print("  References per key:" if not top else "  Most referenced keys:")
+        for key, n in ranked:
+            print(f"    {n:>4}  {key}")
+        print()
+    print("=" * 80)
+
+
+def print_locale_coverage(coverage: dict):
+    """Text section for locale_coverage()."""
+    print("=" * 80)
+    print("  LOCALE COVERAGE")
+    print("=" * 80)
+    print()
+    if not coverage["locales"]:
+        print("  No translations found next to the template ARB file.")
+        print()
+        print("=" * 80)
+        return
+    print(f"  Template: {coverage['template']} ({coverage['keys']} keys)")
+    print()
+    print(f"  {'locale':<8} {'translated':>10} {'missing':>8} {'same as ' + coverage['template']:>11} "
+          f"{'placeholders':>12} {'extra':>6}")
+    for locale, info in coverage["locales"].items():
+        pct = info["translated"] / coverage["keys"] * 100 if coverage["keys"] else 100.0
+        print(f"  {locale:<8} {info['translated']:>4} {pct:>4.0f}% {len(info['missing']):>8} "
+              f"{len(info['identical']):>11} {len(info['placeholder_mismatch']):>12} "
+              f"{len(info['extra']):>6}")
+    for locale, info in coverage["locales"].items():
+        if not (info["missing"] or info["identical"] or info["placeholder_mismatch"]
+                or info["extra"]):
+            continue
+        print()
+        print(f"  {locale}:")
+        if info["missing"]:
+            print(f"    Missing:       {', '.join(info['missing'])}")
+        if info["identical"]:
+            print(f"    Same as {coverage['template']}:    {', '.join(info['identical'])}")
+        for m in info["placeholder_mismatch"]:
+            print(f"    Placeholders:  {m['key']} expects {{{', '.join(m['expected'])}}}, "
+                  f"has {{{', '.join(m['found'])}}}")
+        if info["extra"]:
+            print(f"    Not in {coverage['template']}:     {', '.join(info['extra'])}")
+    print()
+    print("=" * 80)
+
+
+def print_text_report(reports: list[FileReport], severity_filter: Optional[str] = None,
+                      scope: Optional[str] = None, arb_keys: Optional[Iterable[str]] = None,
+                      locales: Optional[dict] = None,
+                      shard: Optional[tuple[int, int]] = None,
+                      generated: Optional[dict] = None):
+    """Pretty-print the report to stdout.
+
+    ``scope`` describes a partial scan; None means the whole of lib/.
+    ``arb_keys`` adds the key usage section, ``locales`` the locale
+    coverage section. ``generated`` counts the generated files left out
+    (see split_generated()).
+    """
+    totals = StreamTotals()
+    key_index = KeyUsageIndex(arb_keys) if arb_keys is not None else None
 
     print("=" * 80)
     print("  TRANSLATION COVERAGE REPORT — SimpleDiary")
@@ -582,17 +3389,12 @@ def print_text_report(reports: list[FileReport], severity_filter: Optional[str]
     print()
 
     for report in reports:
-        entries = report.hardcoded
-        if severity_filter == "__NO_LOW__":
-            entries = [e for e in entries if e.severity != Severity.LOW]
-        elif severity_filter:
-            entries = [e for e in entries if e.severity.value == severity_filter]
+        if key_index is not None:
+            key_index.add(report)
+        entries = totals.add(report, filter_entries(report.hardcoded, severity_filter))
         if not entries:
             continue
 
-        files_with_issues += 1
-        total_localized += report.localized_strings
-
         print(f"{'─' * 80}")
         print(f"  FILE: {report.path}")
         print(f"  Localized usages: {report.localized_strings} | "
@@ -600,14 +3402,11 @@ def print_text_report(reports: list[FileReport], severity_filter: Optional[str]
         print(f"{'─' * 80}")
 
         for entry in entries:
-            total_hardcoded += 1
-            severity_counts[entry.severity] += 1
-            if entry.existing_key:
-                total_with_existing_key += 1
-
             key_info = ""
             if entry.existing_key:
                 key_info = f"  -> USE EXISTING: l10n.{entry.existing_key}"
+                if entry.other_keys:
+                    key_info += f" (same value: {', '.join(entry.other_keys)})"
             elif entry.suggested_key:
                 key_info = f"  -> SUGGESTED KEY: {entry.suggested_key}"
 
@@ -628,6 +3427,9 @@ def print_text_report(reports: list[FileReport], severity_filter: Optional[str]
             print(f"       \"{display_str}\"")
             if key_info:
                 print(f"       {key_info}")
+            if entry.similar_keys and not entry.existing_key:
+                similar = ", ".join(f"{key} ({score:.2f})" for key, score in entry.similar_keys)
+                print(f"         ~ SIMILAR EXISTING: {similar}")
             print()
 
     # ── Summary ──
@@ -636,92 +3438,217 @@ def print_text_report(reports: list[FileReport], severity_filter: Optional[str]
     print("  SUMMARY")
     print("=" * 80)
     print()
-    print(f"  Files scanned:            {len(reports)}")
-    print(f"  Files with issues:        {files_with_issues}")
-    print(f"  Total localized usages:   {total_localized}")
-    print(f"  Total hardcoded strings:  {total_hardcoded}")
-    print(f"  Already have ARB key:     {total_with_existing_key} "
+    if scope:
+        print(f"  Scope:                    PARTIAL — {scope}")
+    if shard:
+        print(f"  Shard:                    {shard[0]}/{shard[1]} (merge all shards "
+              f"with --merge)")
+    print(f"  Files scanned:            {totals.files_scanned}")
+    if generated is not None:
+        print(f"  Generated files skipped:  {generated['files']} "
+              f"({generated['bytes'] / 1024:.1f} KiB)")
+    for skipped in totals.skipped:
+        print(f"  Skipped ({skipped['reason']}):".ljust(28) + skipped["path"])
+    print(f"  Files with issues:        {totals.files_with_issues}")
+    print(f"  Total localized usages:   {totals.total_localized}")
+    print(f"  Total hardcoded strings:  {totals.total_hardcoded}")
+    print(f"  Already have ARB key:     {totals.with_existing_key} "
           f"(translation exists but not used!)")
     print()
     print("  By severity:")
-    for sev in Severity:
-        bar = "█" * severity_counts[sev]
-        print(f"    {sev.value:>8}: {severity_counts[sev]:>3}  {bar}")
+    for sev, count in totals.severity_counts.items():
+        print(f"    {sev:>8}: {count:>3}  {'█' * count}")
     print()
 
-    if total_with_existing_key > 0:
-        print(f"  ⚠  {total_with_existing_key} strings already have translations "
+    if totals.with_existing_key > 0:
+        print(f"  ⚠  {totals.with_existing_key} strings already have translations "
               f"in app_en.arb but are not using them!")
         print(f"     These are quick wins — just replace with the l10n call.")
         print()
 
     # Coverage estimate
-    total_ui_strings = total_localized + total_hardcoded
+    total_ui_strings = totals.total_localized + totals.total_hardcoded
     if total_ui_strings > 0:
-        pct = (total_localized / total_ui_strings) * 100
+        pct = (totals.total_localized / total_ui_strings) * 100
         print(f"  Estimated coverage: {pct:.1f}% "
-              f"({total_localized}/{total_ui_strings} UI strings localized)")
+              f"({totals.total_localized}/{total_ui_strings} UI strings localized)")
     print()
     print("=" * 80)
 
-    return total_hardcoded
+    if key_index is not None:
+        print()
+        print_key_usage(key_index.summary(scope, shard))
+    if locales is not None:
+        print()
+        print_locale_coverage(locales)
+
+    return totals.total_hardcoded
 
 
-def print_json_report(reports: list[FileReport], severity_filter: Optional[str] = None):
+def print_json_report(reports: list[FileReport], severity_filter: Optional[str] = None,
+                      scope: Optional[str] = None, arb_keys: Optional[Iterable[str]] = None,
+                      locales: Optional[dict] = None,
+                      shard: Optional[tuple[int, int]] = None,
+                      generated: Optional[dict] = None):
     """Output machine-readable JSON."""
     output = {"files": [], "summary": {}}
-    total_hardcoded = 0
-    total_localized = 0
-    severity_counts = {s.value: 0 for s in Severity}
+    totals = StreamTotals()
+    key_index = KeyUsageIndex(arb_keys) if arb_keys is not None else None
 
     for report in reports:
-        entries = report.hardcoded
-        if severity_filter == "__NO_LOW__":
-            entries = [e for e in entries if e.severity != Severity.LOW]
-        elif severity_filter:
-            entries = [e for e in entries if e.severity.value == severity_filter]
+        if key_index is not None:
+            key_index.add(report)
+        entries = totals.add(report, filter_entries(report.hardcoded, severity_filter))
         if not entries:
             continue
+        output["files"].append(file_to_json(report, entries))
 
-        total_localized += report.localized_strings
-        file_entry = {
-            "path": report.path,
-            "localized_usages": report.localized_strings,
-            "hardcoded": [],
-        }
-        for entry in entries:
-            total_hardcoded += 1
-            severity_counts[entry.severity.value] += 1
-            file_entry["hardcoded"].append({
-                "line": entry.line,
-                "column": entry.column,
-                "string": entry.raw_string,
-                "context": entry.context.value,
-                "severity": entry.severity.value,
-                "existing_key": entry.existing_key,
-                "suggested_key": entry.suggested_key,
-            })
-        output["files"].append(file_entry)
-
-    output["summary"] = {
-        "files_scanned": len(reports),
-        "files_with_issues": len(output["files"]),
-        "total_localized": total_localized,
-        "total_hardcoded": total_hardcoded,
-        "by_severity": severity_counts,
-    }
+    output["summary"] = totals.summary(scope, shard, generated)
+    if key_index is not None:
+        output["key_usage"] = key_index.summary(scope, shard)
+    if locales is not None:
+        output["locale_coverage"] = locales
     print(json.dumps(output, indent=2, ensure_ascii=False))
-    return total_hardcoded
+    return totals.total_hardcoded
+
+
+def print_ndjson_report(reports: Iterable[FileReport], severity_filter: Optional[str] = None,
+                        scope: Optional[str] = None, arb_keys: Optional[Iterable[str]] = None,
+                        locales: Optional[dict] = None,
+                        shard: Optional[tuple[int, int]] = None,
+                        generated: Optional[dict] = None):
+    """Stream one JSON object per line: a record per finding as each file
+    finishes, then ``key_usage`` and ``locale_coverage`` records (with
+    ``arb_keys`` / ``locales``) and a trailing ``{"type": "summary", ...}``."""
+    totals = StreamTotals()
+    key_index = KeyUsageIndex(arb_keys) if arb_keys is not None else None
+    out = sys.stdout
+    for report in reports:
+        if key_index is not None:
+            key_index.add(report)
+        entries = totals.add(report, filter_entries(report.hardcoded, severity_filter))
+        for entry in entries:
+            record = {"type": "finding", "path": report.path, **finding_to_json(entry)}
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if entries:
+            out.flush()
+    if key_index is not None:
+        out.write(json.dumps({"type": "key_usage", **key_index.summary(scope, shard)},
+                             ensure_ascii=False) + "\n")
+    if locales is not None:
+        out.write(json.dumps({"type": "locale_coverage", **locales}, ensure_ascii=False) + "\n")
+    out.write(json.dumps({"type": "summary", **totals.summary(scope, shard, generated)},
+                         ensure_ascii=False) + "\n")
+    out.flush()
+    return totals.total_hardcoded
+
+
+SARIF_LEVELS = {
+    Severity.CRITICAL: "error",
+    Severity.HIGH: "warning",
+    Severity.MEDIUM: "note",
+    Severity.LOW: "note",
+}
+
+
+def sarif_rule_id(ctx: StringContext) -> str:
+    return "hardcoded-string/" + ctx.name.lower().replace("_", "-")
+
+
+def print_sarif_report(reports: Iterable[FileReport], severity_filter: Optional[str] = None,
+                       scope: Optional[str] = None, arb_keys: Optional[Iterable[str]] = None,
+                       locales: Optional[dict] = None,
+                       shard: Optional[tuple[int, int]] = None,
+                       generated: Optional[dict] = None):
+    """Write a SARIF 2.1.0 log incrementally, one result at a time.
+
+    The rule table is static, so it is written up front; the summary (and
+    key usage / locale coverage, when given) goes into the run's
+    ``properties`` after the results.
+    """
+    out = sys.stdout
+    rules = [{
+        "id": sarif_rule_id(ctx),
+        "name": ctx.name.title().replace("_", ""),
+        "shortDescription": {"text": f"Hardcoded string in {ctx.value}"},
+    } for ctx in StringContext]
+    tool = {"driver": {
+        "name": "check_translations",
+        "informationUri": "https://github.com/ChrisMoa/SimpleDiary",
+        "rules": rules,
+    }}
+    rule_index = {ctx: i for i, ctx in enumerate(StringContext)}
+
+    out.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", '
+              '"version": "2.1.0", "runs": [{"tool": ')
+    out.write(json.dumps(tool, ensure_ascii=False))
+    out.write(', "results": [')
+    totals = StreamTotals()
+    key_index = KeyUsageIndex(arb_keys) if arb_keys is not None else None
+    first = True
+    for report in reports:
+        if key_index is not None:
+            key_index.add(report)
+        entries = totals.add(report, filter_entries(report.hardcoded, severity_filter))
+        for entry in entries:
+            if entry.existing_key:
+                hint = f"use existing key l10n.{entry.existing_key}"
+            else:
+                hint = f"suggested key: {entry.suggested_key}"
+            result = {
+                "ruleId": sarif_rule_id(entry.context),
+                "ruleIndex": rule_index[entry.context],
+                "level": SARIF_LEVELS[entry.severity],
+                "message": {"text": f"Hardcoded {entry.context.value.lower()} "
+                                    f"\"{entry.raw_string}\" ({hint})"},
+                "locations": [{"physicalLocation": {
+                    "artifactLocation": {"uri": report.path, "uriBaseId": "%SRCROOT%"},
+                    "region": {"startLine": entry.line, "startColumn": entry.column},
+                }}],
+                "partialFingerprints": {"hardcodedString/v1": finding_fingerprint(entry)},
+                "properties": {"severity": entry.severity.value, **finding_to_json(entry)},
+            }
+            out.write(("\n" if first else ",\n") + json.dumps(result, ensure_ascii=False))
+            first = False
+        if entries:
+            out.flush()
+    out.write('\n], "properties": {"summary": ')
+    out.write(json.dumps(totals.summary(scope, shard, generated), ensure_ascii=False))
+    if key_index is not None:
+        out.write(', "keyUsage": ')
+        out.write(json.dumps(key_index.summary(scope, shard), ensure_ascii=False))
+    if locales is not None:
+        out.write(', "localeCoverage": ')
+        out.write(json.dumps(locales, ensure_ascii=False))
+    out.write("}}]}\n")
+    out.flush()
+    return totals.total_hardcoded
+
+
+REPORT_FORMATS = {
+    "text": print_text_report,
+    "json": print_json_report,
+    "ndjson": print_ndjson_report,
+    "sarif": print_sarif_report,
+}
+
+# Formats whose printers consume reports lazily as they are scanned
+STREAMING_FORMATS = {"ndjson", "sarif"}
 
 
 def main():
+    global FILE_TIME_BUDGET, KEY_USAGE_TOP
     parser = argparse.ArgumentParser(
         description="Check Flutter/Dart files for hardcoded UI strings "
                     "that should be localized."
     )
     parser.add_argument(
-        "--json", action="store_true",
-        help="Output in JSON format"
+        "--format", choices=sorted(REPORT_FORMATS), default="text",
+        help="Output format; ndjson and sarif are streamed while files are scanned"
+    )
+    parser.add_argument(
+        "--json", action="store_const", dest="format", const="json",
+        help="Output in JSON format (same as --format json)"
     )
     parser.add_argument(
         "--severity", choices=["CRITICAL", "HIGH", "MEDIUM", "LOW"],
@@ -731,31 +3658,262 @@ def main():
         "--no-low", action="store_true",
         help="Exclude LOW severity results (reduce noise)"
     )
+    parser.add_argument(
+        "--jobs", type=parse_jobs, default=1, metavar="N",
+        help="Scan files in N worker processes ('auto' = one per CPU)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Do not read or write the incremental scan cache "
+             f"({CACHE_FILE.relative_to(PROJECT_ROOT)}), and do not write the "
+             f"rules cache ({RULES_CACHE_FILE.relative_to(PROJECT_ROOT)})"
+    )
+    parser.add_argument(
+        "--key-usage", action="store_true",
+        help=f"List the reference count of every ARB key in the text report, "
+             f"not just the unused and the {KEY_USAGE_TOP} most referenced ones"
+    )
+    parser.add_argument(
+        "--file-budget", type=float, default=FILE_TIME_BUDGET, metavar="SECONDS",
+        help=f"Give up on a file that takes longer than this to scan and report "
+             f"it as skipped (default: {FILE_TIME_BUDGET:g}; 0 = no limit)"
+    )
+    parser.add_argument(
+        "--rules", type=Path, metavar="FILE",
+        help=f"TOML rules whose sections replace those of "
+             f"{RULES_FILE.relative_to(PROJECT_ROOT)}"
+    )
+    partial = parser.add_mutually_exclusive_group()
+    partial.add_argument(
+        "--changed-since", metavar="REV",
+        help="Only scan Dart files changed since git revision REV "
+             "(working tree vs REV, plus untracked files)"
+    )
+    partial.add_argument(
+        "--files", nargs="+", metavar="PATH",
+        help="Only scan the given Dart files"
+    )
+    parser.add_argument(
+        "--changed-lines-only", action="store_true",
+        help="With --changed-since, only report findings on changed lines"
+    )
+    parser.add_argument(
+        "--similar-top", type=int, default=SIMILAR_TOP_K, metavar="K",
+        help=f"Suggest up to K existing ARB keys with a similar value "
+             f"(default: {SIMILAR_TOP_K}; 0 disables)"
+    )
+    parser.add_argument(
+        "--similar-threshold", type=float, default=SIMILARITY_THRESHOLD, metavar="SCORE",
+        help=f"Minimum n-gram similarity (0-1) for --similar-top "
+             f"(default: {SIMILARITY_THRESHOLD})"
+    )
+    parser.add_argument(
+        "--shard", type=parse_shard, metavar="i/N",
+        help="Only scan shard i of N (1-based), balanced by file size; combine "
+             "the shards' --json reports with --merge"
+    )
+    parser.add_argument(
+        "--merge", nargs="+", metavar="REPORT",
+        help="Merge the JSON reports of all --shard runs into one JSON report and exit"
+    )
+    parser.add_argument(
+        "--history", metavar="RANGE",
+        help="Record per-commit, per-module coverage for the first-parent commits "
+             "of a git revision range (e.g. v1.0..HEAD) in an SQLite database"
+    )
+    parser.add_argument(
+        "--history-db", type=Path, default=HISTORY_DB, metavar="FILE",
+        help=f"Database for --history (default: {HISTORY_DB.relative_to(PROJECT_ROOT)})"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, metavar="FILE",
+        help="Suppress findings recorded in this baseline file; the exit code "
+             "only reflects new findings"
+    )
+    parser.add_argument(
+        "--write-baseline", action="store_true",
+        help=f"Record all current findings as the baseline (--baseline FILE, default "
+             f"{BASELINE_FILE.relative_to(PROJECT_ROOT)}) and exit; with --changed-since, "
+             f"--files or --shard only the entries of the scanned files are replaced"
+    )
+    parser.add_argument(
+        "--emit-arb-patch", type=Path, metavar="FILE",
+        help="Write an ARB fragment with one new key per distinct hardcoded string "
+             "(and FILE's .sources.json mapping keys to findings) and exit"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running: rescan changed files under lib/ (and re-match on "
+             "app_en.arb changes), printing an updated summary each time"
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=1.0, metavar="SECONDS",
+        help="How often --watch checks for changes (default: 1.0)"
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Answer JSON-RPC scan requests on stdin/stdout, one per line, "
+             "keeping rules, ARB and results in memory (see ScanServer)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Print phase timings, per-rule counters and the slowest files to "
+             "stderr (scans serially, without the cache)"
+    )
+    parser.add_argument(
+        "--profile-json", metavar="FILE",
+        help="Also write the profile as JSON to FILE (implies --profile)"
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=10, metavar="N",
+        help="Number of slowest files to list in the profile (default: 10)"
+    )
     args = parser.parse_args()
-
-    # Load ARB translations
-    arb = load_arb_strings(ARB_FILE)
-    reverse_arb = build_reverse_arb(arb)
-
-    # Collect and scan files
-    dart_files = collect_dart_files(LIB_DIR)
-    reports = []
-    for f in dart_files:
-        report = scan_file(f, arb, reverse_arb)
-        reports.append(report)
+    if args.write_baseline and args.changed_lines_only:
+        parser.error("--write-baseline needs whole files; drop --changed-lines-only")
+    if args.write_baseline and args.emit_arb_patch:
+        parser.error("--write-baseline and --emit-arb-patch cannot be combined")
+    if args.watch and (args.changed_since or args.files):
+        parser.error("--watch always covers all of lib/; "
+                     "it cannot be combined with --changed-since or --files")
 
     severity_filter = args.severity
     if args.no_low and not severity_filter:
         # Filter to exclude LOW by passing a special value
         severity_filter = "__NO_LOW__"
 
-    # Output
-    if args.json:
-        count = print_json_report(reports, severity_filter)
+    if args.merge:
+        output = merge_shard_reports(args.merge)
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+        sys.exit(1 if output["summary"]["total_hardcoded"] > 0 else 0)
+
+    if args.profile or args.profile_json:
+        args.no_cache = True
+    try:
+        if args.rules:
+            set_ruleset(load_ruleset(args.rules))
+        elif RULES is None:
+            raise RULES_ERROR
+    except RulesError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+    if not args.no_cache:
+        cache_ruleset(RULES)
+    FILE_TIME_BUDGET = args.file_budget
+    if args.key_usage:
+        KEY_USAGE_TOP = 0
+
+    if args.serve:
+        ScanServer(args.similar_top, args.similar_threshold).serve()
+        return
+
+    global PROFILER
+    if args.profile or args.profile_json:
+        PROFILER = Profiler()
+        args.jobs = 1
+    prof = PROFILER
+
+    # Load ARB translations
+    def load_arb():
+        arb = load_arb_strings(ARB_FILE)
+        return arb, build_arb_index(arb)
+
+    arb, arb_index = load_arb() if prof is None else prof.timed("arb_load", load_arb)
+
+    if args.history:
+        stats = run_history(args.history, args.history_db, arb_index)
+        print(f"{stats['commits']} commit(s) recorded in {args.history_db}: "
+              f"{stats['blobs_scanned']} blob(s) scanned, {stats['blobs_cached']} reused")
+        if stats["blobs_skipped"]:
+            print(f"WARNING: {stats['blobs_skipped']} blob(s) took longer than --file-budget "
+                  f"and were counted as empty; they are not stored and will be rescanned",
+                  file=sys.stderr)
+        return
+
+    # Collect and scan files
+    cache = None if args.no_cache else ScanCache(CACHE_FILE, ruleset_fingerprint(ARB_FILE))
+    if args.watch:
+        watch(arb_index, severity_filter, args.jobs, cache,
+              args.similar_top, args.similar_threshold, args.poll_interval)
+        return
+    if prof is None:
+        locales = load_locale_coverage(cache)
+    else:
+        locales = prof.timed("locales", load_locale_coverage, cache)
+    scope = None
+    walk_start = perf_counter()
+    if args.changed_since:
+        changed = git_changed_lines(args.changed_since)
+        scope = f"{len(changed)} Dart file(s) changed since {args.changed_since}"
+        if args.changed_lines_only:
+            scope += ", changed lines only"
+    elif args.files:
+        changed = explicit_files(args.files)
+        scope = f"{len(changed)} file(s) given with --files"
+    if scope is not None:
+        dart_files = sorted(changed)
     else:
-        count = print_text_report(reports, severity_filter)
+        dart_files = collect_dart_files(LIB_DIR)
+    # Before sharding, so that shards split hand-written code only; every
+    # shard reports the same generated files
+    dart_files, generated = split_generated(dart_files, cache)
+    if args.shard:
+        dart_files = shard_files(dart_files, *args.shard)
+    if prof is not None:
+        prof.phases["walk"] += perf_counter() - walk_start
+    reports = iter_scan_files(dart_files, arb_index, jobs=args.jobs, cache=cache)
+    if args.changed_since and args.changed_lines_only:
+        reports = (restrict_to_lines(report, changed[f])
+                   for f, report in zip(dart_files, reports))
+    if args.write_baseline:
+        path = args.baseline or BASELINE_FILE
+        # A shard only sees its own files: keep the entries of the others
+        n = write_baseline(path, list(reports), partial=scope is not None or bool(args.shard))
+        print(f"Wrote {n} finding(s) to baseline {path}", file=sys.stderr)
+        return
+    baseline = Baseline.load(args.baseline) if args.baseline else None
+    if baseline is not None:
+        reports = (baseline.filter(report) for report in reports)
+    if args.emit_arb_patch:
+        keys, n = write_arb_patch(args.emit_arb_patch, reports, arb_index.keys, severity_filter)
+        print(f"Wrote {keys} key(s) for {n} finding(s) to ARB patch {args.emit_arb_patch} "
+              f"(sources: {arb_patch_sources_path(args.emit_arb_patch)})", file=sys.stderr)
+        return
+    if args.format not in STREAMING_FORMATS or prof is not None:
+        # Profiling materialises streamed formats too, so that rendering
+        # is timed on its own rather than interleaved with scanning.
+        reports = list(reports)
+
+    # Near-duplicate ARB keys: one batch for the whole run, or per file
+    # while streaming
+    if args.similar_top > 0:
+        ngrams = NgramIndex(arb)
+        k, threshold = args.similar_top, args.similar_threshold
+        if isinstance(reports, list):
+            if prof is None:
+                ngrams.attach(reports, k, threshold)
+            else:
+                prof.timed("similar", ngrams.attach, reports, k, threshold)
+        else:
+            reports = (ngrams.attach([report], k, threshold)[0] for report in reports)
 
-    # Exit code: non-zero if any hardcoded strings found
+    # Output
+    if prof is None:
+        count = REPORT_FORMATS[args.format](reports, severity_filter, scope,
+                                            arb_index.keys, locales, args.shard, generated)
+    else:
+        count = prof.timed("render", REPORT_FORMATS[args.format], reports, severity_filter,
+                           scope, arb_index.keys, locales, args.shard, generated)
+        prof.print_table(args.profile_top)
+        if args.profile_json:
+            Path(args.profile_json).write_text(
+                json.dumps(prof.to_dict(args.profile_top), indent=2, ensure_ascii=False) + "\n",
+                encoding="utf-8")
+    if baseline is not None:
+        print(f"{baseline.suppressed} known finding(s) suppressed by baseline {args.baseline}",
+              file=sys.stderr)
+
+    # Exit code: non-zero if any (new) hardcoded strings found
     sys.exit(1 if count > 0 else 0)
 
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Pathological-input stress check for check_translations.py
+
+Generates adversarial Dart sources (very long lines, minified code, huge
+literals, deep or unbalanced nesting, unterminated strings, ...) at
+doubling sizes and times scan_source() on each. Scan time must grow
+linearly with input size: for every case the fitted growth exponent
+(log time ratio / log size ratio between the smallest and largest size)
+has to stay below --max-exponent, so any rule or lexer path that
+backtracks quadratically on long input fails the run.
+
+Finally a file is scanned with a tiny --file-budget to check that it is
+reported as skipped rather than scanned to the end.
+
+Usage:
+    python3 tools/stress_check_translations.py
+    python3 tools/stress_check_translations.py --cases minified,long_identifier
+    python3 tools/stress_check_translations.py --base-size 20000 --steps 4 --json
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import check_translations as ct  # noqa: E402
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Configuration
+# ──────────────────────────────────────────────────────────────────────
+
+BASE_SIZE = 16_000      # bytes of the smallest input per case
+STEPS = 4               # sizes BASE_SIZE * 2**0 .. 2**(STEPS - 1)
+REPEATS = 3             # best-of timing per size, each from cold caches
+MAX_EXPONENT = 1.3      # 1.0 is linear, 2.0 quadratic
+
+REL_PATH = "lib/features/stress/presentation/pages/stress_page.dart"
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Adversarial inputs
+# ──────────────────────────────────────────────────────────────────────
+
+def _repeat(unit: str, size: int) -> str:
+    return unit * max(1, size // len(unit))
+
+
+# Each case maps a target size in bytes to Dart source of about that size
+CASES = {
+    # Minified / generated code: every statement on one line
+    "minified": lambda n: _repeat("Text('Hello world again'); ", n),
+    # Many literals in one list literal on a single line
+    "literal_list": lambda n: "final a = [" + _repeat("'some words here', ", n) + "];",
+    # A huge identifier right before a literal (end-anchored prefix checks)
+    "long_identifier": lambda n: "foo(" + "a" * n + " 'Hello world');",
+    # A huge literal that almost looks like an identifier (technical rules)
+    "identifier_literal": lambda n: "Text('a" + "A" * n + "!');",
+    # Many '[' without a ']' on the line of a literal (false-positive rules)
+    "open_brackets": lambda n: "x = " + "[" * n + " 'Hello world';",
+    # Closing brackets that match nothing on the context stack
+    "unbalanced_close": lambda n: "Text(" * (n // 10) + "]" * (n // 2) + "'Hello world'",
+    # Deeply nested calls around one literal
+    "deep_nesting": lambda n: "Text(" * (n // 10) + "'Hello world'" + ")" * (n // 10),
+    # One huge string constant
+    "huge_literal": lambda n: "Text('" + _repeat("word ", n) + "');",
+    # A long string made of interpolations
+    "interpolations": lambda n: "Text('" + _repeat("${a.b} ", n) + "');",
+    # Nested interpolation with strings inside
+    "nested_interpolation": lambda n: "Text('" + _repeat("${f('x ${g(\"y\")} z')} ", n) + "');",
+    # Unterminated single-line strings
+    "unterminated": lambda n: _repeat("x = 'never closed\n", n),
+    # Adjacent literals separated by long whitespace / comment runs
+    "adjacent": lambda n: "Text('a' " + " " * (n // 2) + _repeat("// c\n", n // 2) + "'b');",
+    # Unclosed nested block comments
+    "block_comments": lambda n: _repeat("/* ", n) + "Text('Hello world');",
+    # Long lines of localized lookups mixed with literals
+    "localized_line": lambda n: _repeat("l10n.someKey, 'Hello world', ", n),
+    # Many lines, each a typical widget (baseline for comparison)
+    "typical": lambda n: _repeat("    Text('Save your entry'),\n", n),
+}
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Measurement
+# ──────────────────────────────────────────────────────────────────────
+
+def clear_caches():
+    """Forget cached rule verdicts, so a repeat costs what a first scan does."""
+    ct.is_ignored_value.cache_clear()
+    ct.RULES.context_rules.callee_bits.cache_clear()
+
+
+def time_scan(source: bytes, arb_index: ct.ArbIndex) -> float:
+    best = math.inf
+    for _ in range(REPEATS):
+        clear_caches()
+        t0 = time.perf_counter()
+        ct.scan_source(source, REL_PATH, arb_index)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_case(name: str, base_size: int, steps: int, arb_index: ct.ArbIndex) -> dict:
+    sizes, times = [], []
+    for step in range(steps):
+        source = CASES[name](base_size * 2 ** step).encode("utf-8")
+        sizes.append(len(source))
+        times.append(time_scan(source, arb_index))
+    # Floor tiny timings so timer noise cannot fake a steep curve
+    t_first, t_last = max(times[0], 1e-4), max(times[-1], 1e-4)
+    exponent = math.log(t_last / t_first) / math.log(sizes[-1] / sizes[0])
+    return {"case": name, "sizes": sizes, "seconds": [round(t, 5) for t in times],
+            "exponent": round(exponent, 2)}
+
+
+def check_budget(arb_index: ct.ArbIndex) -> bool:
+    """A file over budget must come back as skipped, without findings."""
+    saved = ct.FILE_TIME_BUDGET
+    ct.FILE_TIME_BUDGET = 1e-6
+    try:
+        report = ct.scan_source(CASES["typical"](200_000).encode("utf-8"), REL_PATH, arb_index)
+    finally:
+        ct.FILE_TIME_BUDGET = saved
+    return report.skipped == ct.SKIPPED_TOO_SLOW and not report.hardcoded
+
+
+def print_table(results: list[dict], max_exponent: float):
+    header = f"{'case':<22} {'bytes':>9} {'first s':>9} {'last s':>9} {'exponent':>9}"
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        verdict = "" if r["exponent"] <= max_exponent else "  SUPERLINEAR"
+        print(f"{r['case']:<22} {r['sizes'][-1]:>9} {r['seconds'][0]:>9.4f} "
+              f"{r['seconds'][-1]:>9.4f} {r['exponent']:>9.2f}{verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that check_translations.py scans "
+                                                 "adversarial input in linear time.")
+    parser.add_argument("--cases", help=f"Comma-separated cases (default: all of "
+                                        f"{', '.join(CASES)})")
+    parser.add_argument("--base-size", type=int, default=BASE_SIZE,
+                        help=f"Bytes of the smallest input (default: {BASE_SIZE})")
+    parser.add_argument("--steps", type=int, default=STEPS,
+                        help=f"Number of doublings of the input size (default: {STEPS})")
+    parser.add_argument("--max-exponent", type=float, default=MAX_EXPONENT,
+                        help=f"Largest allowed growth exponent (default: {MAX_EXPONENT})")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+    if ct.RULES is None:
+        print(f"ERROR: {ct.RULES_ERROR}", file=sys.stderr)
+        sys.exit(2)
+
+    names = [c.strip() for c in args.cases.split(",")] if args.cases else list(CASES)
+    unknown = [c for c in names if c not in CASES]
+    if unknown:
+        print(f"ERROR: unknown case(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
+    if args.steps < 2:
+        print("ERROR: --steps must be at least 2", file=sys.stderr)
+        sys.exit(2)
+
+    arb_index = ct.build_arb_index(ct.load_arb_strings(ct.ARB_FILE))
+    # Measure the real cost: the budget would cut the slow cases short
+    ct.FILE_TIME_BUDGET = 0
+    results = [run_case(name, args.base_size, args.steps, arb_index) for name in names]
+    budget_ok = check_budget(arb_index)
+
+    if args.json:
+        print(json.dumps({"results": results, "budget_ok": budget_ok}, indent=2))
+    else:
+        print_table(results, args.max_exponent)
+        print()
+        print(f"Budget: over-budget file {'reported as skipped' if budget_ok else 'NOT skipped'}")
+
+    failed = [r["case"] for r in results if r["exponent"] > args.max_exponent]
+    if failed:
+        print(f"\nSUPERLINEAR (exponent > {args.max_exponent}): {', '.join(failed)}",
+              file=sys.stderr)
+    if failed or not budget_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
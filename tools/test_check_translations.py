@@ -0,0 +1,1075 @@
+#!/usr/bin/env python3
+"""
+Regression tests for check_translations.py
+
+Standard library only, so they run wherever the checker itself does.
+
+Usage:
+    python3 -m unittest tools/test_check_translations.py
+    python3 -m pytest tools/test_check_translations.py
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import check_translations as ct  # noqa: E402
+import stress_check_translations as stress  # noqa: E402
+
+
+def tokens(src: str) -> list[tuple[str, str]]:
+    return [(t.kind, t.value) for t in ct.tokenize_dart(src.encode("utf-8"))]
+
+
+def strings(src: str) -> list[str]:
+    return [value for kind, value in tokens(src) if kind == ct.TOK_STRING]
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Dart lexer
+# ──────────────────────────────────────────────────────────────────────
+
+class TokenizeDartTest(unittest.TestCase):
+
+    def test_raw_string_has_no_escapes_or_interpolation(self):
+        self.assertEqual(tokens(r"Text(r'C:\dir $name ${x}');"), [
+            ("ident", "Text"), ("punct", "("), ("string", r"C:\dir $name ${x}"),
+            ("punct", ")"), ("punct", ";"),
+        ])
+
+    def test_raw_string_ends_at_quote_after_backslash(self):
+        self.assertEqual(strings(r"a(r'ends\' + 'b');"), ["ends\\", "b"])
+
+    def test_raw_prefix_is_not_an_identifier(self):
+        self.assertEqual(tokens('r"x" + rr'), [
+            ("string", "x"), ("punct", "+"), ("ident", "rr"),
+        ])
+
+    def test_nested_interpolation(self):
+        # Tokens of an interpolated expression follow the string holding them
+        self.assertEqual(tokens("""x = 'a ${f('b ${g("c")}')} d';"""), [
+            ("ident", "x"), ("punct", "="),
+            ("string", """a ${f('b ${g("c")}')} d"""),
+            ("ident", "f"), ("punct", "("),
+            ("string", 'b ${g("c")}'),
+            ("ident", "g"), ("punct", "("), ("string", "c"), ("punct", ")"),
+            ("punct", ")"),
+            ("punct", ";"),
+        ])
+
+    def test_braces_inside_interpolation(self):
+        self.assertEqual(tokens("x = '${ {1: 2}[1] } tail';")[2:], [
+            ("string", "${ {1: 2}[1] } tail"),
+            ("punct", "{"), ("number", "1"), ("punct", ":"), ("number", "2"),
+            ("punct", "}"), ("punct", "["), ("number", "1"), ("punct", "]"),
+            ("punct", ";"),
+        ])
+
+    def test_triple_quoted_string(self):
+        src = "x = '''It's \"quoted\" '' here\nline2 ${a} ''';\ny = \"\"\"two\nlines\"\"\";"
+        self.assertEqual(tokens(src), [
+            ("ident", "x"), ("punct", "="),
+            ("string", "It's \"quoted\" '' here\nline2 ${a} "),
+            ("ident", "a"), ("punct", ";"),
+            ("ident", "y"), ("punct", "="), ("string", "two\nlines"), ("punct", ";"),
+        ])
+
+    def test_adjacent_strings_are_joined(self):
+        self.assertEqual(strings("x = 'one ' 'two' // c\n r\"three\";"), ["one twothree"])
+
+    def test_unterminated_string_is_dropped(self):
+        self.assertEqual(tokens("x = 'open\ny = 2;"), [
+            ("ident", "x"), ("punct", "="),
+            ("ident", "y"), ("punct", "="), ("number", "2"), ("punct", ";"),
+        ])
+
+    def test_quotes_in_comments_are_ignored(self):
+        src = "/* it's /* nested */ still */ a; // don't\nb('ok');"
+        self.assertEqual(strings(src), ["ok"])
+        self.assertEqual([k for k, _ in tokens(src)].count(ct.TOK_COMMENT), 2)
+
+    def test_offsets_are_bytes_of_the_source(self):
+        src = "x = 'Grüße'; y = 'ok';"
+        toks = list(ct.tokenize_dart(src.encode("utf-8")))
+        ok = [t for t in toks if t.value == "ok"][0]
+        self.assertEqual(src.encode("utf-8")[ok.start:ok.end], b"'ok'")
+
+
+class ScanSourceLexerTest(unittest.TestCase):
+    """The lexer cases as they surface in findings."""
+
+    def scan(self, src: str) -> list[tuple[int, int, str]]:
+        report = ct.scan_source(src, "lib/features/x/presentation/page.dart",
+                                ct.build_arb_index({}))
+        return [(e.line, e.column, e.raw_string) for e in report.hardcoded]
+
+    def test_line_cursor_matches_splitlines(self):
+        text = "a = 'Grüße';\r\nb\rc\u2028d\x0ce = '€';\n\nlast"
+        src = text.encode("utf-8")
+        expected = []  # (line index, line, column) per character; None on a break
+        for index, line in enumerate(text.splitlines(keepends=True)):
+            content = line.splitlines()[0]
+            expected += [(index, content, col) for col in range(len(content))]
+            expected += [None] * (len(line) - len(content))
+        cursor = ct.LineCursor(src)
+        offset = 0
+        for ch, want in zip(text, expected):
+            if want is not None:
+                self.assertEqual((cursor.seek(offset), cursor.text, cursor.column(offset)), want)
+            offset += len(ch.encode("utf-8"))
+        self.assertEqual((cursor.seek(0), cursor.text), (0, "a = 'Grüße';"))
+
+    def test_positions_after_triple_quoted_string(self):
+        src = "final a = '''one\ntwo''';\nWidget b() => Text('Hello world');\n"
+        self.assertEqual(self.scan(src)[-1], (3, 20, "Hello world"))
+
+    def test_raw_string_finding(self):
+        self.assertEqual(self.scan("Widget b() => Text(r'Raw text here');\n"),
+                         [(1, 20, "Raw text here")])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Context classification
+# ──────────────────────────────────────────────────────────────────────
+
+class ContextTrackerTest(unittest.TestCase):
+
+    def contexts(self, src: str) -> dict[str, tuple[str, str]]:
+        report = ct.scan_source(src, "lib/features/x/presentation/page.dart",
+                                ct.build_arb_index({}))
+        return {e.raw_string: (e.context.name, e.severity.name) for e in report.hardcoded}
+
+    def test_multiline_dialog_title_and_content(self):
+        src = """Future<void> ask(BuildContext context) => showDialog<bool>(
+  context: context,
+  builder: (context) => AlertDialog(
+    title: const Text(
+      'Delete this entry',
+    ),
+    content: Text(
+      'This cannot be undone',
+      textAlign: TextAlign.center,
+    ),
+    actions: [],
+  ),
+);
+"""
+        self.assertEqual(self.contexts(src), {
+            "Delete this entry": ("DIALOG_TITLE", "CRITICAL"),
+            "This cannot be undone": ("DIALOG_CONTENT", "CRITICAL"),
+        })
+
+    def test_snackbar_ancestor(self):
+        src = """void done(BuildContext context) {
+  ScaffoldMessenger.of(context).showSnackBar(
+    SnackBar(
+      content: Row(children: [Icon(Icons.check), Text('Entry saved')]),
+      action: SnackBarAction(label: 'Undo changes', onPressed: () {}),
+    ),
+  );
+}
+"""
+        self.assertEqual(self.contexts(src), {
+            "Entry saved": ("SNACKBAR", "CRITICAL"),
+            "Undo changes": ("SNACKBAR_ACTION", "CRITICAL"),
+        })
+
+    def test_elevated_button_icon_label(self):
+        src = """Widget b() => ElevatedButton.icon(
+  onPressed: save,
+  icon: const Icon(Icons.save),
+  label: const Text('Save entry'),
+);
+Widget c() => TextButton(onPressed: save, child: const Text('Keep editing'));
+"""
+        self.assertEqual(self.contexts(src), {
+            "Save entry": ("BUTTON_LABEL", "CRITICAL"),
+            "Keep editing": ("BUTTON_LABEL", "CRITICAL"),
+        })
+
+    def test_validator_return(self):
+        src = """Widget f() => TextFormField(
+  decoration: InputDecoration(labelText: 'Your name', hintText: 'First and last'),
+  validator: (value) {
+    if (value == null || value.isEmpty) {
+      return 'Please enter a name';
+    }
+    return null;
+  },
+);
+"""
+        self.assertEqual(self.contexts(src), {
+            "Your name": ("INPUT_LABEL", "HIGH"),
+            "First and last": ("INPUT_HINT", "MEDIUM"),
+            "Please enter a name": ("VALIDATOR", "HIGH"),
+        })
+
+    def test_unbalanced_brackets(self):
+        # A stray closer is ignored; a missing one is recovered from at the
+        # next matching closer further out
+        src = """Widget a() => Column(children: [Text('First line here')]));
+Widget b() => AlertDialog(title: Text('Broken title', ), content: Text('Body text here');
+Widget c() => Text('Last line here');
+"""
+        self.assertEqual(self.contexts(src), {
+            "First line here": ("TEXT_WIDGET", "HIGH"),
+            "Broken title": ("DIALOG_TITLE", "CRITICAL"),
+            "Body text here": ("DIALOG_CONTENT", "CRITICAL"),
+            "Last line here": ("TEXT_WIDGET", "HIGH"),
+        })
+
+    def test_tracker_stack_after_unbalanced_input(self):
+        tracker = ct.ContextTracker()
+        for tok in ct.tokenize_dart(b"a(b[c{)] } ) ]"):
+            tracker.feed(tok)
+        self.assertEqual([f.bracket for f in tracker.frames], [""])
+        self.assertEqual(tracker.open_counts, {"(": 0, "[": 0, "{": 0})
+
+
+# ──────────────────────────────────────────────────────────────────────
+# ARB matching
+# ──────────────────────────────────────────────────────────────────────
+
+class ArbIndexTest(unittest.TestCase):
+
+    ARB = {
+        "dontForget": "Don't forget to write about your day",
+        "lateGreeting": "Hello {name}, it's late",
+        "tabbed": "Name:\tvalue",
+    }
+
+    def test_exact_and_template_lookup(self):
+        index = ct.build_arb_index({"save": "Save", "saveError": "Error saving settings: {error}"})
+        self.assertEqual(index.lookup("  save "), "save")
+        self.assertEqual(index.lookup("Error saving settings: $e"), "saveError")
+        self.assertEqual(index.lookup("Error saving settings: ${e.message}"), "saveError")
+        self.assertIsNone(index.lookup("Error saving: $e"))
+
+    def test_collisions_keep_every_key(self):
+        index = ct.build_arb_index({
+            "weekNumber": "Week {number}",
+            "weekLabel": "Week {weekNumber}",
+            "confirmDeleteCategory": 'Delete "{title}"?',
+            "confirmDeleteTemplate": 'Delete "{title}"?',
+            "drawerSettings": "Settings",
+            "settingsTitle": "Settings",
+            "weekPlain": "Week $weekNumber",
+        })
+        # Exact beats template; equal values keep ARB order
+        self.assertEqual(index.matches("Week $weekNumber"), ["weekPlain"])
+        self.assertEqual(index.matches("Settings"), ["drawerSettings", "settingsTitle"])
+        # Placeholder names decide between templates, then ARB order
+        self.assertEqual(index.matches("Week ${week.weekNumber}"), ["weekLabel", "weekNumber"])
+        self.assertEqual(index.matches("Week $n"), ["weekNumber", "weekLabel"])
+        self.assertEqual(index.matches('Delete "${category.title}"?'),
+                         ["confirmDeleteCategory", "confirmDeleteTemplate"])
+
+    def test_finding_reports_the_other_keys(self):
+        index = ct.build_arb_index({"drawerSettings": "Settings", "settingsTitle": "Settings"})
+        report = ct.scan_source("Widget b() => Text('Settings');\n",
+                                "lib/features/x/presentation/page.dart", index)
+        entry = report.hardcoded[0]
+        self.assertEqual((entry.existing_key, entry.other_keys),
+                         ("drawerSettings", ["settingsTitle"]))
+        self.assertEqual(ct.report_from_dict(ct.report_to_dict(report)).hardcoded[0].other_keys,
+                         ["settingsTitle"])
+
+    def test_escaped_literals_match_unescaped_values(self):
+        index = ct.build_arb_index(self.ARB)
+        self.assertEqual(index.lookup(r"Don\'t forget to write about your day"), "dontForget")
+        self.assertEqual(index.lookup(r"Hello ${user.name}, it\'s late"), "lateGreeting")
+        self.assertEqual(index.lookup(r"Name:\tvalue"), "tabbed")
+        self.assertIsNone(index.lookup(r"Don\'t forget"))
+
+    def test_escaped_backslash_stays_a_backslash(self):
+        # Dart '\\t' is a backslash and a "t", not a tab
+        self.assertIsNone(ct.build_arb_index(self.ARB).lookup(r"Name:\\tvalue"))
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Locale coverage
+# ──────────────────────────────────────────────────────────────────────
+
+class LocaleCoverageTest(unittest.TestCase):
+
+    ARBS = {
+        "app_en.arb": {"@@locale": "en", "save": "Save", "ok": "OK",
+                       "greeting": "Hello {name}", "@greeting": {"placeholders": {"name": {}}},
+                       "items": "{count, plural, =1{One item} other{{count} items}}"},
+        "app_de.arb": {"save": "Speichern", "ok": "OK", "greeting": "Hallo {nom}",
+                       "items": "{count, plural, =1{Ein Eintrag} other{{count} Einträge}}"},
+        "app_fr.arb": {"save": "Save", "greeting": "Bonjour {name}", "unused": "x"},
+    }
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        (root / "lib/l10n").mkdir(parents=True)
+        for name, arb in self.ARBS.items():
+            (root / "lib/l10n" / name).write_text(json.dumps(arb), encoding="utf-8")
+        patcher = mock.patch.object(ct, "PROJECT_ROOT", root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_placeholders_of_plural_messages(self):
+        self.assertEqual(ct.arb_placeholders(self.ARBS["app_en.arb"]["items"]), {"count"})
+        self.assertEqual(ct.arb_placeholders("{a} and {b, select, x{{c}} other{}}"),
+                         {"a", "b", "c"})
+
+    def test_coverage_per_locale(self):
+        files = ct.locale_arb_files({"arb-dir": "lib/l10n", "template-arb-file": "app_en.arb"})
+        self.assertEqual(list(files), ["en", "de", "fr"])
+        coverage = ct.locale_coverage(ct.build_locale_table(files))
+        self.assertEqual((coverage["template"], coverage["keys"]), ("en", 4))
+        self.assertEqual(coverage["locales"]["de"], {
+            "translated": 4, "missing": [], "identical": ["ok"],
+            "placeholder_mismatch": [{"key": "greeting", "expected": ["name"], "found": ["nom"]}],
+            "extra": [],
+        })
+        self.assertEqual(coverage["locales"]["fr"], {
+            "translated": 2, "missing": ["ok", "items"], "identical": ["save"],
+            "placeholder_mismatch": [], "extra": ["unused"],
+        })
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Similar keys
+# ──────────────────────────────────────────────────────────────────────
+    def test_template_match_with_braces_in_interpolation(self):
+        index = ct.build_arb_index({"allowed": "Allowed: {list}", "done": "Done"})
+        self.assertEqual(index.lookup("Allowed: ${f('}')}"), "allowed")
+        self.assertEqual(index.lookup("Allowed: ${ {'a': 1}['a'] }"), "allowed")
+        self.assertEqual(index.lookup("Allowed: $list"), "allowed")
+        self.assertIsNone(index.lookup("Allowed: ${open"))
+
+    def test_replace_interpolations(self):
+        self.assertEqual(ct.replace_interpolations("""a ${f('${g("}")}')} b $c d""", "#"),
+                         "a # b # d")
+        self.assertEqual(ct.replace_interpolations("${open $x", "#"), "${open #")
+
+
+class NgramIndexTest(unittest.TestCase):
+
+    ARB = {
+        "saveSettings": "Save Settings",
+        "drawerSettings": "Settings",
+        "settingsTitle": "Settings",
+        "settingsSavedSuccessfully": "Settings saved successfully",
+        "errorSavingSettings": "Error saving settings",
+        "themeSettings": "Theme settings",
+        "cancel": "Cancel",
+    }
+
+    def test_shared_common_word_does_not_win(self):
+        # The example of the request: the longer message with the rare word
+        # "saved" beats the short ones that only share "settings"
+        top = ct.NgramIndex(self.ARB).top_k(["Settings saved!"])[0]
+        self.assertEqual(top[0][0], "settingsSavedSuccessfully", top)
+
+    def test_example_against_app_arb(self):
+        index = ct.NgramIndex(ct.load_arb_strings(ct.ARB_FILE))
+        self.assertEqual(index.top_k(["Settings saved!"])[0][0][0], "settingsSavedSuccessfully")
+
+    def test_scores(self):
+        index = ct.NgramIndex(self.ARB)
+        self.assertEqual(index.top_k(["Cancel", "Nothing alike at all"]), [[("cancel", 1.0)], []])
+        self.assertEqual([key for key, _ in index.top_k(["Settings"], k=2)[0]],
+                         ["drawerSettings", "settingsTitle"])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Key usage
+# ──────────────────────────────────────────────────────────────────────
+
+class KeyUsageTest(unittest.TestCase):
+
+    def index(self) -> ct.KeyUsageIndex:
+        index = ct.KeyUsageIndex([f"key{i:02}" for i in range(15)])
+        index.add(ct.FileReport(path="lib/a.dart",
+                                key_usages={f"key{i:02}": i for i in range(12)}))
+        return index
+
+    def text(self, *args) -> str:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            ct.print_key_usage(self.index().summary(*args))
+        return out.getvalue()
+
+    def ranked(self, text: str, heading: str) -> list[str]:
+        lines = text.splitlines()
+        start = lines.index(heading) + 1
+        return lines[start:lines.index("", start)]
+
+    def test_text_lists_unused_and_most_referenced_keys(self):
+        text = self.text(None)
+        self.assertIn("  Unused keys:              4\n    key00\n    key12\n", text)
+        ranked = self.ranked(text, "  Most referenced keys:")
+        self.assertEqual(len(ranked), ct.KEY_USAGE_TOP)
+        self.assertEqual(ranked[:2], ["      11  key11", "      10  key10"])
+
+    def test_key_usage_lists_every_key(self):
+        # --key-usage
+        with mock.patch.object(ct, "KEY_USAGE_TOP", 0):
+            text = self.text("lib/a.dart")
+        self.assertIn("n/a (partial scan)", text)
+        counts = self.ranked(text, "  References per key:")
+        self.assertEqual(len(counts), 15)
+        self.assertEqual(counts[11:], ["       0  key00", "       0  key12",
+                                       "       0  key13", "       0  key14"])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Scan cache
+# ──────────────────────────────────────────────────────────────────────
+
+class ScanCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dart = Path(tmp.name) / "page.dart"
+        self.cache_path = Path(tmp.name) / "cache.json"
+        self.write("Widget a() => Text('Hello there');\n", mtime_ns=10**18)
+        self.fingerprint = ct.ruleset_fingerprint(None)
+        cache = ct.ScanCache(self.cache_path, self.fingerprint)
+        key = cache.file_key(self.dart)
+        cache.store(self.dart, key, ct.scan_source(self.dart.read_bytes(), "lib/page.dart",
+                                                   ct.build_arb_index({})))
+        cache.save()
+
+    def write(self, text: str, mtime_ns: int):
+        self.dart.write_text(text, encoding="utf-8")
+        os.utime(self.dart, ns=(mtime_ns, mtime_ns))
+
+    def lookup(self, fingerprint: Optional[str] = None) -> Optional[ct.FileReport]:
+        cache = ct.ScanCache(self.cache_path, fingerprint or self.fingerprint)
+        return cache.lookup(self.dart)
+
+    def test_unchanged_file_is_a_hit(self):
+        report = self.lookup()
+        self.assertEqual([e.raw_string for e in report.hardcoded], ["Hello there"])
+
+    def test_touched_file_is_a_hit_by_content(self):
+        os.utime(self.dart, ns=(2 * 10**18, 2 * 10**18))
+        self.assertIsNotNone(self.lookup())
+
+    def test_same_size_edit_with_new_mtime_is_a_miss(self):
+        self.write("Widget a() => Text('Hello where');\n", mtime_ns=2 * 10**18)
+        self.assertIsNone(self.lookup())
+
+    def test_size_change_is_a_miss(self):
+        self.write("Widget a() => Text('Hello there!');\n", mtime_ns=10**18)
+        self.assertIsNone(self.lookup())
+
+    def test_ruleset_change_drops_the_cache(self):
+        rules = ct.Ruleset(dict(ct.RULES.data, ignored=[*ct.RULES.data["ignored"], "Hello there"]),
+                           "changed")
+        with mock.patch.object(ct, "RULES", rules):
+            fingerprint = ct.ruleset_fingerprint(None)
+        self.assertNotEqual(fingerprint, self.fingerprint)
+        self.assertIsNone(self.lookup(fingerprint))
+        self.assertIsNotNone(self.lookup())
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Generated files
+# ──────────────────────────────────────────────────────────────────────
+
+class GeneratedFilesTest(unittest.TestCase):
+
+    FILES = {
+        "model.g.dart": "part of 'model.dart';\n",
+        "routes.dart": "// GENERATED CODE - DO NOT MODIFY BY HAND\nclass Routes {}\n",
+        "late_header.dart": "// x\n" * 200 + "// GENERATED CODE - DO NOT MODIFY BY HAND\n",
+        "page.dart": "// Shows the generated summary\nWidget a() => Text('Hi there');\n",
+    }
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        for name, text in self.FILES.items():
+            (self.dir / name).write_text(text, encoding="utf-8")
+        self.files = sorted(self.dir / name for name in self.FILES)
+
+    def test_split_by_name_and_header(self):
+        kept, skipped = ct.split_generated(self.files)
+        self.assertEqual([p.name for p in kept], ["late_header.dart", "page.dart"])
+        self.assertEqual(skipped, {"files": 2, "bytes": sum(
+            (self.dir / name).stat().st_size for name in ("model.g.dart", "routes.dart"))})
+
+    def test_cached_verdict_avoids_reading(self):
+        cache = ct.ScanCache(self.dir / "cache.json", "fingerprint")
+        expected = ct.split_generated(self.files, cache)
+        with mock.patch("builtins.open", side_effect=AssertionError("file was read")):
+            self.assertEqual(ct.split_generated(self.files, cache), expected)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Changed lines (--changed-since / --files)
+# ──────────────────────────────────────────────────────────────────────
+
+class GitRepoTestCase(unittest.TestCase):
+    """Runs with PROJECT_ROOT set to a fresh, empty git repository."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve()
+        patcher = mock.patch.object(ct, "PROJECT_ROOT", self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.git("init", "-q")
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(["git", "-C", str(self.root), "-c", "user.name=test",
+                               "-c", "user.email=test@example.com", *args],
+                              check=True, capture_output=True, text=True).stdout
+
+    def write(self, files: dict[str, str]):
+        for rel_path, text in files.items():
+            path = self.root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def commit(self, files: dict[str, str]):
+        self.write(files)
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "change")
+
+
+class ChangedLinesTest(GitRepoTestCase):
+
+    PAGE = "lib/features/a/presentation/page.dart"
+
+    def test_changed_lines_since_rev(self):
+        self.commit({self.PAGE: "Widget a() => Text('First line here');\n"
+                                "Widget b() => Text('Second line here');\n"
+                                "Widget c() => Text('Third line here');\n",
+                     "lib/old.dart": "// gone\n"})
+        (self.root / "lib/old.dart").unlink()
+        self.write({self.PAGE: "Widget a() => Text('First line here');\n"
+                               "Widget b() => Text('Second line, edited');\n"
+                               "Widget c() => Text('Third line here');\n",
+                    "lib/new.dart": "Widget n() => Text('Brand new text');\n",
+                    "lib/notes.txt": "not Dart\n"})
+        changed = ct.git_changed_lines("HEAD")
+        page = self.root / self.PAGE
+        self.assertEqual(changed, {page: [(2, 2)], self.root / "lib/new.dart": None})
+
+        report = ct.scan_source(page.read_bytes(), self.PAGE, ct.build_arb_index({}))
+        self.assertEqual(len(report.hardcoded), 3)
+        ct.restrict_to_lines(report, changed[page])
+        self.assertEqual([e.raw_string for e in report.hardcoded], ["Second line, edited"])
+
+    def test_explicit_files_skip_what_cannot_be_scanned(self):
+        self.write({self.PAGE: "Widget a() => Text('Hello there');\n",
+                    "lib/notes.txt": "not Dart\n"})
+        with mock.patch("sys.stderr", io.StringIO()) as err:
+            files = ct.explicit_files([str(self.root / self.PAGE), str(self.root / "lib/notes.txt"),
+                                       str(self.root / "lib/missing.dart")])
+        self.assertEqual(files, {self.root / self.PAGE: None})
+        self.assertIn("lib/missing.dart: no such file", err.getvalue())
+        self.assertIn("notes.txt: not a scannable Dart file", err.getvalue())
+
+
+# ──────────────────────────────────────────────────────────────────────
+# History (--history)
+# ──────────────────────────────────────────────────────────────────────
+
+class HistoryTest(GitRepoTestCase):
+
+    PAGE = "Widget a() => Text('Hello there');\n"
+    MAIN = "void main() => runApp(const App());\n"
+
+    def history(self) -> dict:
+        return ct.run_history("HEAD", self.root / "history.sqlite", ct.build_arb_index({}))
+
+    def test_blobs_are_scanned_once(self):
+        page = "lib/features/a/presentation/page.dart"
+        self.commit({page: self.PAGE, "lib/main.dart": self.MAIN})
+        self.commit({"lib/main.dart": self.MAIN + "// v2\n"})
+        self.commit({"lib/main.dart": self.MAIN})  # back to an earlier blob
+        self.assertEqual(self.history(), {"commits": 3, "blobs_scanned": 3,
+                                          "blobs_cached": 1, "blobs_skipped": 0})
+        # A second run over the same range scans nothing
+        self.assertEqual(self.history(), {"commits": 3, "blobs_scanned": 0,
+                                          "blobs_cached": 4, "blobs_skipped": 0})
+
+        conn = sqlite3.connect(self.root / "history.sqlite")
+        self.addCleanup(conn.close)
+        rows = conn.execute("SELECT module, files, hardcoded FROM coverage "
+                            "WHERE commit_sha = ? ORDER BY module",
+                            (self.git("rev-parse", "HEAD").strip(),)).fetchall()
+        self.assertEqual(rows, [("lib", 1, 0), ("lib/features/a", 1, 1)])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Baseline
+# ──────────────────────────────────────────────────────────────────────
+
+class BaselineTest(unittest.TestCase):
+
+    SRC = """Widget a() => Text('Welcome back');
+Widget b() => Column(children: [
+  Text('Nothing here yet'),
+  Text('Nothing here yet'),
+]);
+"""
+
+    def scan(self, src: str) -> ct.FileReport:
+        return ct.scan_source(src, "lib/features/x/presentation/page.dart",
+                              ct.build_arb_index({}))
+
+    def baseline(self) -> ct.Baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "baseline.json"
+            self.assertEqual(ct.write_baseline(path, [self.scan(self.SRC)], partial=False), 3)
+            return ct.Baseline.load(path)
+
+    def test_survives_line_shift_but_flags_new_string(self):
+        shifted = "import 'x.dart';\n\n// moved down\n" + self.SRC.replace(
+            "  Text('Nothing here yet'),\n]);",
+            "  Text('Nothing here yet'),\n  Text('Tap to add one'),\n]);")
+        baseline = self.baseline()
+        report = baseline.filter(self.scan(shifted))
+        self.assertEqual([(e.line, e.raw_string) for e in report.hardcoded],
+                         [(8, "Tap to add one")])
+        self.assertEqual(baseline.suppressed, 3)
+
+    def test_each_entry_covers_one_occurrence(self):
+        src = self.SRC.replace("]);", "  Text('Nothing here yet'),\n]);")
+        report = self.baseline().filter(self.scan(src))
+        self.assertEqual([e.raw_string for e in report.hardcoded], ["Nothing here yet"])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# ARB patch
+# ──────────────────────────────────────────────────────────────────────
+
+class ArbMessageTest(unittest.TestCase):
+
+    def test_placeholder_names(self):
+        for expression, name in (
+                ("widget.allowedExtensions.join(', ')", "allowedExtensions"),
+                ("price.toStringAsFixed(2)", "price"),
+                ("items.length", "items"),
+                ("items.where((e) => e.done).length", "items"),
+                ("widget.title", "title"),
+                ("formatter.format(from)", "from"),
+                ("Utils.toDate(selectedDate)", "selectedDate"),
+                ("(size / (1024 * 1024)).toStringAsFixed(1)", "size"),
+                ("salt != null ? 'present' : 'missing'", "salt"),
+                ("list[i]", "list"),
+                ("1 + 2", "value")):
+            self.assertEqual(ct._placeholder_name(expression), name, expression)
+
+    def test_interpolation_with_braces(self):
+        self.assertEqual(ct.arb_message("a ${ {'k': 1}['k'] } b ${f('}')} $c"),
+                         ("a {value} b {f} {c}", ["value", "f", "c"]))
+
+    def test_nested_interpolation(self):
+        self.assertEqual(ct.arb_message("""Hi ${names.map((n) => '${n.trim()}!').join(', ')}"""),
+                         ("Hi {names}", ["names"]))
+
+    def test_escapes_and_repeated_expressions(self):
+        self.assertEqual(ct.arb_message(r"\u{1F600} \$x ${a.b} and ${a.b} \ü"),
+                         ("\U0001F600 $x {b} and {b} ü", ["b"]))
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Findings and summary totals
+# ──────────────────────────────────────────────────────────────────────
+
+class FindingsTest(unittest.TestCase):
+
+    SRC = """Widget a() => Column(children: [
+  Text('Hello there'),
+  TextButton(onPressed: save, child: const Text('Save')),
+  Tooltip(tooltip: 'More options'),
+  Text(context.l10n.title),
+]);
+"""
+
+    def report(self) -> ct.FileReport:
+        return ct.scan_source(self.SRC, "lib/features/x/presentation/page.dart",
+                              ct.build_arb_index({"save": "Save"}))
+
+    def test_findings_are_slotted(self):
+        entry = self.report().hardcoded[0]
+        self.assertFalse(hasattr(entry, "__dict__"))
+        with self.assertRaises(AttributeError):
+            entry.note = "x"
+        # List defaults are still per instance
+        first, second = (ct.HardcodedString("a.dart", 1, 0, "x", ct.StringContext.GENERIC,
+                                            ct.Severity.LOW) for _ in range(2))
+        first.other_keys.append("k")
+        self.assertEqual(second.other_keys, [])
+
+    def test_cached_form_round_trips_and_shares_the_path(self):
+        report = self.report()
+        restored = ct.report_from_dict(json.loads(json.dumps(ct.report_to_dict(report))))
+        self.assertEqual(restored, report)
+        self.assertTrue(all(e.file is restored.path for e in restored.hardcoded))
+
+    def test_stream_totals(self):
+        totals = ct.StreamTotals()
+        report = self.report()
+        totals.add(report, report.hardcoded)
+        totals.add(ct.FileReport(path="lib/empty.dart"), [])
+        summary = totals.summary(None)
+        self.assertEqual(
+            {k: summary[k] for k in ("files_scanned", "files_with_issues", "total_localized",
+                                     "total_hardcoded", "with_existing_key")},
+            {"files_scanned": 2, "files_with_issues": 1, "total_localized": 1,
+             "total_hardcoded": 3, "with_existing_key": 1})
+        self.assertEqual(summary["by_severity"],
+                         {"CRITICAL": 1, "HIGH": 1, "MEDIUM": 1, "LOW": 0})
+        self.assertEqual(summary["estimated_coverage"], ct.coverage_pct(1, 4))
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Report formats
+# ──────────────────────────────────────────────────────────────────────
+
+class ReportFormatTest(unittest.TestCase):
+
+    SOURCES = {
+        "lib/features/a/presentation/a.dart": "Widget a() => Text('Hello there');\n",
+        "lib/features/b/presentation/b.dart": "Widget b() => const SizedBox();\n",
+        "lib/features/c/presentation/c.dart":
+            "Widget c() => TextButton(onPressed: f, child: Text('Keep going'));\n"
+            "Widget d() => Tooltip(message: 'x', tooltip: 'More options');\n",
+    }
+
+    def reports(self) -> Iterator[ct.FileReport]:
+        arb_index = ct.build_arb_index({})
+        for rel_path, src in self.SOURCES.items():
+            yield ct.scan_source(src, rel_path, arb_index)
+
+    def render(self, fmt: str, reports: Iterable[ct.FileReport]) -> str:
+        with redirect_stdout(io.StringIO()) as out:
+            total = ct.REPORT_FORMATS[fmt](reports, scope="test")
+        self.assertEqual(total, 3)
+        return out.getvalue()
+
+    def test_streamed_formats_match_json(self):
+        expected = json.loads(self.render("json", self.reports()))
+        findings = [{"path": f["path"], **finding}
+                    for f in expected["files"] for finding in f["hardcoded"]]
+
+        records = [json.loads(line) for line in self.render("ndjson", self.reports()).splitlines()]
+        self.assertEqual([r.pop("type") for r in records], ["finding"] * 3 + ["summary"])
+        self.assertEqual(records[:-1], findings)
+        self.assertEqual(records[-1], expected["summary"])
+
+        sarif = json.loads(self.render("sarif", self.reports()))["runs"][0]
+        self.assertEqual([{"path": r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"],
+                           **r["properties"]} for r in sarif["results"]], findings)
+        self.assertEqual(sarif["properties"]["summary"], expected["summary"])
+
+    def test_findings_are_written_before_later_files_are_scanned(self):
+        for fmt in sorted(ct.STREAMING_FORMATS):
+            with self.subTest(fmt=fmt):
+                written = []
+
+                def reports():
+                    for report in self.reports():
+                        written.append("Hello there" in out.getvalue())
+                        yield report
+
+                with redirect_stdout(io.StringIO()) as out:
+                    ct.REPORT_FORMATS[fmt](reports(), scope="test")
+                self.assertEqual(written, [False, True, True])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Sharding
+# ──────────────────────────────────────────────────────────────────────
+
+CHECKER = Path(ct.__file__)
+
+
+def run_checker(*args: str) -> dict:
+    result = subprocess.run([sys.executable, str(CHECKER), "--no-cache", *args],
+                            capture_output=True, text=True)
+    if result.returncode not in (0, 1):
+        raise AssertionError(result.stderr)
+    return json.loads(result.stdout)
+
+
+class ShardTest(unittest.TestCase):
+
+    def test_shards_partition_the_files(self):
+        files = ct.collect_dart_files(ct.LIB_DIR)
+        shards = [ct.shard_files(files, i, 3) for i in (1, 2, 3)]
+        self.assertEqual(sorted(f for shard in shards for f in shard), sorted(files))
+        self.assertTrue(all(shards))
+
+    def test_merged_shards_equal_a_single_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for i in (1, 2, 3):
+                path = Path(tmp) / f"shard{i}.json"
+                path.write_text(json.dumps(run_checker("--format", "json", "--shard", f"{i}/3")),
+                                encoding="utf-8")
+                paths.append(str(path))
+            merged = run_checker("--merge", *paths)
+        self.assertEqual(merged, run_checker("--format", "json"))
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Parallel scanning
+# ──────────────────────────────────────────────────────────────────────
+
+class ParallelScanTest(unittest.TestCase):
+
+    def test_parse_jobs(self):
+        self.assertEqual(ct.parse_jobs("3"), 3)
+        self.assertGreaterEqual(ct.parse_jobs("auto"), 1)
+        for value in ("0", "two"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                ct.parse_jobs(value)
+
+    def test_pool_reports_equal_serial_reports_in_order(self):
+        files = ct.collect_dart_files(ct.LIB_DIR)[:40]
+        arb_index = ct.build_arb_index(ct.load_arb_strings(ct.ARB_FILE))
+        serial = [ct.report_to_dict(r) for r in ct.scan_files(files, arb_index)]
+        parallel = [ct.report_to_dict(r) for r in ct.scan_files(files, arb_index, jobs=2)]
+        self.assertEqual(parallel, serial)
+        self.assertTrue(any(r["hardcoded"] for r in serial))
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Profiling
+# ──────────────────────────────────────────────────────────────────────
+
+class ProfilerTest(unittest.TestCase):
+
+    SRC = """Widget a() => Column(children: [
+  Text('Hello there'),
+  Text('https://example.com'),
+  Tooltip(tooltip: 'More options'),
+]);
+"""
+
+    def scan(self) -> list:
+        report = ct.scan_source(self.SRC, "lib/features/x/presentation/page.dart",
+                                ct.build_arb_index({}))
+        return ct.report_to_dict(report)["hardcoded"]
+
+    def test_profiling_does_not_change_findings(self):
+        plain = self.scan()
+        profiler = ct.Profiler()
+        with mock.patch.object(ct, "PROFILER", profiler):
+            self.assertEqual(self.scan(), plain)
+        ct.is_ignored_value.cache_clear()
+
+        stats = profiler.to_dict(top=5)["rules"]
+        context = {ct.RULES.context[r["index"]].context: r["hits"] for r in stats["context"]}
+        self.assertEqual(context[ct.StringContext.TEXT_WIDGET], 2)  # classified, then ignored
+        self.assertEqual(context[ct.StringContext.TOOLTIP], 1)
+        self.assertEqual(sum(r["hits"] for r in stats["technical"]), 1)  # the URL
+        for group in stats.values():
+            for r in group:
+                self.assertLessEqual(r["hits"], r["evaluations"])
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Watch mode
+# ──────────────────────────────────────────────────────────────────────
+
+class WatchTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve()
+        for name, value in (("PROJECT_ROOT", self.root), ("LIB_DIR", self.root / "lib"),
+                            ("ARB_FILE", self.root / "lib/l10n/app_en.arb"),
+                            ("WATCH_DEBOUNCE", 0)):
+            patcher = mock.patch.object(ct, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.write("lib/l10n/app_en.arb", json.dumps({"save": "Save"}))
+        self.write("lib/features/a/presentation/page.dart", "Widget a() => Text('Hello there');\n")
+        self.write("lib/old.dart", "Widget o() => Text('Old text here');\n")
+
+    def write(self, rel_path: str, text: str):
+        path = self.root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def test_rescans_changed_files_and_rematches_on_arb_change(self):
+        edits = [
+            lambda: (self.write("lib/features/a/presentation/page.dart",
+                                "Widget a() => Text('Hello there');\n"
+                                "Widget b() => Text('Welcome back');\n"),
+                     (self.root / "lib/old.dart").unlink()),
+            lambda: self.write("lib/l10n/app_en.arb",
+                               json.dumps({"save": "Save", "welcome": "Welcome back"})),
+        ]
+
+        def sleep(seconds: float):
+            if seconds:  # the poll interval, not the debounce
+                if not edits:
+                    raise KeyboardInterrupt
+                edits.pop(0)()
+
+        with mock.patch.object(ct, "sleep", sleep), redirect_stdout(io.StringIO()) as out:
+            ct.watch(ct.build_arb_index({"save": "Save"}), None)
+        summaries = [line.split("] ", 1)[1] for line in out.getvalue().splitlines()
+                     if line.startswith("[")]
+        self.assertEqual(summaries, [
+            "2 files, 2 with issues, 2 hardcoded (0 with an ARB key), coverage 0.0%",
+            "1 files, 1 with issues, 2 hardcoded (0 with an ARB key), coverage 0.0%",
+            "1 files, 1 with issues, 2 hardcoded (1 with an ARB key), coverage 0.0%",
+        ])
+        self.assertIn("removed lib/old.dart", out.getvalue())
+        self.assertIn("rescanned lib/features/a/presentation/page.dart: 2 hardcoded",
+                      out.getvalue())
+        self.assertIn("app_en.arb changed: re-matched 1 files", out.getvalue())
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Server (--serve)
+# ──────────────────────────────────────────────────────────────────────
+
+class ScanServerExclusionTest(unittest.TestCase):
+    """scanFile / scanBuffer leave out what the CLI scan leaves out."""
+
+    PAGE = "Widget b() => Text('Hello world');\n"
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name).resolve()
+        for rel, content in {
+            "lib/page.dart": self.PAGE,
+            "lib/l10n/app_localizations.dart": self.PAGE,
+            "lib/model.g.dart": self.PAGE,
+            "lib/model.dart": "// GENERATED CODE - DO NOT MODIFY BY HAND\n" + self.PAGE,
+        }.items():
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / rel).write_text(content, encoding="utf-8")
+        patcher = mock.patch.object(ct, "PROJECT_ROOT", self.root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = ct.ScanServer(similar_top=0)
+
+    def call(self, method: str, **params) -> dict:
+        response = self.server.handle(ct.json.dumps(
+            {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}))
+        self.assertNotIn("error", response)
+        return response["result"]
+
+    def test_scan_file(self):
+        result = self.call("scanFile", path="lib/page.dart")
+        self.assertEqual(len(result["hardcoded"]), 1)
+        self.assertNotIn("skipped", result)
+        for path, reason in (("lib/l10n/app_localizations.dart", ct.SKIPPED_EXCLUDED),
+                             ("lib/model.g.dart", ct.SKIPPED_GENERATED),
+                             ("lib/model.dart", ct.SKIPPED_GENERATED)):
+            result = self.call("scanFile", path=path)
+            self.assertEqual((result["hardcoded"], result.get("skipped")), ([], reason), path)
+
+    def test_scan_buffer(self):
+        self.assertEqual(len(self.call("scanBuffer", path="lib/page.dart",
+                                       content=self.PAGE)["hardcoded"]), 1)
+        for path, content, reason in (
+                ("lib/l10n/app_localizations.dart", self.PAGE, ct.SKIPPED_EXCLUDED),
+                ("lib/page.g.dart", self.PAGE, ct.SKIPPED_GENERATED),
+                ("lib/page.dart", "// GENERATED CODE - DO NOT MODIFY BY HAND\n" + self.PAGE,
+                 ct.SKIPPED_GENERATED)):
+            result = self.call("scanBuffer", path=path, content=content)
+            self.assertEqual((result["hardcoded"], result.get("skipped")), ([], reason), path)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Stress inputs
+# ──────────────────────────────────────────────────────────────────────
+
+class StressTest(unittest.TestCase):
+    """Adversarial inputs from stress_check_translations.py, scanned cold."""
+
+    def test_identifier_literal_is_linear(self):
+        # A backtracking technical rule is quadratic here, but only on a
+        # first scan: later ones hit the is_ignored_value() cache
+        result = stress.run_case("identifier_literal", 4000, 3, ct.build_arb_index({}))
+        self.assertLessEqual(result["exponent"], stress.MAX_EXPONENT, result)
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Ruleset
+# ──────────────────────────────────────────────────────────────────────
+
+class RulesetTest(unittest.TestCase):
+
+    def use_temporary_cache(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_file = Path(tmp.name) / "rules.cache"
+        patcher = mock.patch.object(ct, "RULES_CACHE_FILE", self.cache_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_loading_writes_nothing(self):
+        self.use_temporary_cache()
+        rules = ct.load_ruleset()
+        self.assertFalse(rules.from_cache)
+        self.assertFalse(self.cache_file.exists())
+        ct.cache_ruleset(rules)
+        self.assertTrue(ct.load_ruleset().from_cache)
+
+    def test_cold_cache_without_toml_parser_is_an_error(self):
+        self.use_temporary_cache()
+        with mock.patch.object(ct, "tomllib", None):
+            with self.assertRaisesRegex(ct.RulesError, "tomli"):
+                ct.load_ruleset()
+
+    def test_no_cache_writes_no_rules_cache(self):
+        argv = ["check_translations.py", "--no-cache", "--rules", str(ct.RULES_FILE),
+                "--files", "lib/main.dart"]
+        with mock.patch.object(sys, "argv", argv), \
+                mock.patch.object(ct, "_read_rules_cache", return_value={}), \
+                mock.patch.object(ct, "_write_rules_cache") as write, \
+                mock.patch.object(ct, "RULES", ct.RULES), \
+                redirect_stdout(io.StringIO()), self.assertRaises(SystemExit):
+            ct.main()
+        write.assert_not_called()
+
+    def test_combined_matchers_agree_with_each_pattern(self):
+        lines, literals = set(), set()
+        for path in ct.collect_dart_files(ct.LIB_DIR):
+            src = path.read_bytes()
+            lines.update(line.strip() for line in src.decode("utf-8").splitlines())
+            literals.update(t.value for t in ct.tokenize_dart(src) if t.kind == ct.TOK_STRING)
+        rules = ct.RULES
+        for line in lines:
+            self.assertEqual(rules.false_positive_re.search(line) is not None,
+                             any(re.search(p, line) for p in rules.false_positive), line)
+        for value in literals:
+            self.assertEqual(rules.technical_re.match(value) is not None,
+                             any(re.match(p, value) for p in rules.technical), value)
+
+    def test_broken_rules_raise_instead_of_exiting(self):
+        with self.assertRaises(ct.RulesError):
+            ct.load_ruleset(Path("/nonexistent/rules.toml"))
+
+
+if __name__ == "__main__":
+    unittest.main()